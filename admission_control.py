@@ -0,0 +1,183 @@
+"""Admission control based on the remaining capacity of a team."""
+
+from collections import OrderedDict, deque
+from typing import Generic, TypeVar
+
+from manage_robot_tasks import DEFAULT_COOLDOWN, RobotRecord
+from ordering_policies import OrderingPolicy
+from robot_task_manager import RobotTaskManager
+from utils import is_positive_int
+
+_T = TypeVar("_T")
+
+
+class CapacityTracker:
+    """Maintains the remaining capacity of a team and the robots in cooldown.
+
+    It is a RobotObserver, so the counters are updated in O(1) on every
+    change of a robot, instead of walking all the limits and records.
+    """
+
+    def __init__(self, manager: RobotTaskManager, cooldown=None) -> None:
+        """
+        Args:
+            manager (RobotTaskManager): The manager of the team, the tracker attaches itself to it.
+            cooldown (optional):
+                The cooldown used to count robots in cooldown, it must not be
+                increased later. Defaults to None, which means manager.cooldown.
+        """
+        self.manager = manager
+        self.cooldown = cooldown
+        self._capacities: dict[int, int] = {}
+        self._remaining_capacity = 0
+        # Assigned robots under their limit, ordered by last_assignment_index
+        self._last_assignment_indices: OrderedDict[int, int] = OrderedDict()
+        manager.attach(self)
+
+    def update(
+        self, robot_id: int, robot_record: RobotRecord | None, limit: int
+    ) -> None:
+        """Updates the counters for (robot_id), see RobotObserver."""
+        capacity = max(
+            limit - (robot_record.assignment_count if robot_record else 0), 0
+        )
+        self._remaining_capacity += capacity - self._capacities.get(
+            robot_id, 0
+        )
+        self._capacities[robot_id] = capacity
+
+        last_assignment_indices = self._last_assignment_indices
+        last_assignment_indices.pop(robot_id, None)
+        if robot_record is None or not capacity:
+            return
+        index = robot_record.last_assignment_index
+        if (
+            not last_assignment_indices
+            or next(reversed(last_assignment_indices.values())) <= index
+        ):
+            last_assignment_indices[robot_id] = index
+        elif next(iter(last_assignment_indices.values())) >= index:
+            last_assignment_indices[robot_id] = index
+            last_assignment_indices.move_to_end(robot_id, last=False)
+        else:
+            # Only limit changes and retractions get here, which are rare
+            last_assignment_indices[robot_id] = index
+            self._last_assignment_indices = OrderedDict(
+                sorted(last_assignment_indices.items(), key=lambda x: x[1])
+            )
+
+    def remove(self, robot_id: int) -> None:
+        """Removes (robot_id) from the counters, see RobotObserver."""
+        self._remaining_capacity -= self._capacities.pop(robot_id, 0)
+        self._last_assignment_indices.pop(robot_id, None)
+
+    @property
+    def remaining_capacity(self) -> int:
+        """The sum of (limit - assignment_count) over the robots of the team."""
+        return self._remaining_capacity
+
+    @property
+    def cooling_count(self) -> int:
+        """The number of robots under their limit that are in cooldown.
+
+        Robots whose cooldown ended are dropped as they are found, so this is
+        O(1) amortized.
+        """
+        cooldown = (
+            self.manager.cooldown if self.cooldown is None else self.cooldown
+        )
+        min_cooldown_index = self.manager.total_assignment_count - (
+            cooldown if is_positive_int(cooldown) else DEFAULT_COOLDOWN
+        )
+        last_assignment_indices = self._last_assignment_indices
+        while last_assignment_indices:
+            robot_id, index = next(iter(last_assignment_indices.items()))
+            if index >= min_cooldown_index:
+                break
+            del last_assignment_indices[robot_id]
+        return len(last_assignment_indices)
+
+
+class AdmissionController(Generic[_T]):
+    """A bounded queue of pending tasks that rejects new tasks once the
+    projected capacity of the team is exhausted.
+
+    The projected capacity is the remaining capacity minus the pending tasks,
+    since every pending task will take one assignment.
+    """
+
+    def __init__(
+        self,
+        manager: RobotTaskManager,
+        max_pending: int,
+        policy: OrderingPolicy | None = None,
+    ) -> None:
+        """
+        Args:
+            manager (RobotTaskManager): The manager of the team.
+            max_pending (int): The maximum number of pending tasks.
+            policy (OrderingPolicy | None, optional):
+                The policy that picks the robot for each task, it is attached
+                to (manager). Defaults to None, which means the first available robot.
+        """
+        if not is_positive_int(max_pending, nonzero=True):
+            raise ValueError("(max_pending) must be a positive integer")
+        self.manager = manager
+        self.max_pending = max_pending
+        self.policy = policy
+        self.capacity = CapacityTracker(manager)
+        if policy is not None:
+            manager.attach(policy)
+        self._pending: deque[_T] = deque()
+
+    @property
+    def pending_count(self) -> int:
+        """The number of tasks waiting for a robot."""
+        return len(self._pending)
+
+    @property
+    def projected_capacity(self) -> int:
+        """The remaining capacity once all the pending tasks are dispatched."""
+        return self.capacity.remaining_capacity - len(self._pending)
+
+    def offer(self, task: _T) -> bool:
+        """Adds (task) to the pending tasks, unless that would exceed
+        (max_pending) or the projected capacity.
+
+        Args:
+            task (_T): The task.
+
+        Returns:
+            bool: True if the task was accepted, False if the caller should back off.
+        """
+        if (
+            len(self._pending) >= self.max_pending
+            or self.projected_capacity <= 0
+        ):
+            return False
+        self._pending.append(task)
+        return True
+
+    def dispatch(self, cooldown=None) -> tuple[_T, int] | None:
+        """Assigns the oldest pending task to an available robot, and records
+        the assignment in the manager.
+
+        Args:
+            cooldown (optional): The cooldown. Defaults to None, which means manager.cooldown.
+
+        Returns:
+            tuple[_T, int] | None:
+                The task and its robot, or None if there is no pending task
+                or no robot is available right now.
+        """
+        if not self._pending:
+            return None
+        if self.policy is not None:
+            robot_id = self.manager.select(self.policy, cooldown)
+        else:
+            available = self.manager.available(cooldown)
+            robot_id = available[0] if available else None
+        if robot_id is None:
+            return None
+        self.manager.manage([robot_id], cooldown=cooldown)
+        return self._pending.popleft(), robot_id
@@ -0,0 +1,168 @@
+"""Indexed assignment history that answers point-in-time availability queries."""
+
+from array import array
+from bisect import bisect_left
+from typing import Iterable
+
+from manage_robot_tasks import (
+    DEFAULT_COOLDOWN,
+    MAX_UNIQUE_ROBOT_ID_COUNT,
+    MAX_UNIQUE_ROBOT_ID_MESSAGE,
+    RobotRecord,
+)
+from utils import count_unique_elements, is_positive_int
+
+
+class AssignmentHistory:
+    """Keeps the sorted assignment indices of every robot, so that the state
+    after any prefix of the history can be queried without replaying it.
+    """
+
+    def __init__(self, assignments: Iterable = ()) -> None:
+        """
+        Args:
+            assignments (Iterable, optional):
+                The initial robot IDs of the history. Defaults to ().
+        """
+        self._assignment_indices: dict[int, array] = {}
+        self._seen_elements: set = set()
+        self._first_seen_indices: list[int] = []
+        self._length = 0
+        self.record(assignments)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def record(self, assignments: Iterable) -> None:
+        """Appends (assignments) to the history.
+
+        Args:
+            assignments (Iterable): A list of robot IDs representing new tasks.
+
+        Raises:
+            ValueError: If the history would have MAX_UNIQUE_ROBOT_ID_COUNT
+                unique elements or more, in which case nothing is recorded.
+        """
+        assignments = list(assignments)
+        if (
+            len(self._seen_elements)
+            + count_unique_elements(
+                assignments,
+                limit=MAX_UNIQUE_ROBOT_ID_COUNT - len(self._seen_elements),
+                excluded=self._seen_elements,
+            )
+            >= MAX_UNIQUE_ROBOT_ID_COUNT
+        ):
+            raise ValueError(MAX_UNIQUE_ROBOT_ID_MESSAGE)
+
+        for i, robot_id in enumerate(assignments, self._length):
+            if robot_id not in self._seen_elements:
+                self._seen_elements.add(robot_id)
+                self._first_seen_indices.append(i)
+            if is_positive_int(robot_id):
+                if robot_id not in self._assignment_indices:
+                    self._assignment_indices[robot_id] = array("q")
+                self._assignment_indices[robot_id].append(i)
+        self._length += len(assignments)
+
+    def _check_index(self, index: int) -> None:
+        if not is_positive_int(index) or index > self._length:
+            raise IndexError(
+                f"(index) must be an integer between 0 and {self._length}"
+            )
+
+    def record_at(self, robot_id: int, index: int) -> RobotRecord | None:
+        """Returns the record of (robot_id) after the first (index) assignments.
+
+        Args:
+            robot_id (int): The robot ID.
+            index (int): The number of assignments of the history to consider.
+
+        Raises:
+            IndexError: If (index) is not between 0 and len(self).
+
+        Returns:
+            RobotRecord | None: The record, or None if the robot was not assigned yet.
+        """
+        self._check_index(index)
+        indices = self._assignment_indices.get(robot_id)
+        if not indices:
+            return None
+        assignment_count = bisect_left(indices, index)
+        if not assignment_count:
+            return None
+        return RobotRecord(
+            assignment_count, indices[0], indices[assignment_count - 1]
+        )
+
+    def records_at(self, index: int) -> dict[int, RobotRecord]:
+        """Returns the robot records after the first (index) assignments.
+
+        Args:
+            index (int): The number of assignments of the history to consider.
+
+        Raises:
+            IndexError: If (index) is not between 0 and len(self).
+
+        Returns:
+            dict[int, RobotRecord]:
+                The records of the robots that were assigned before (index).
+        """
+        self._check_index(index)
+        robot_records: dict[int, RobotRecord] = {}
+        for robot_id in self._assignment_indices:
+            robot_record = self.record_at(robot_id, index)
+            if robot_record is not None:
+                robot_records[robot_id] = robot_record
+        return robot_records
+
+    def available_at(
+        self, index: int, max_assignments: dict, cooldown=DEFAULT_COOLDOWN
+    ) -> list[int]:
+        """Returns the robots that could take on tasks after the first (index)
+        assignments, which is the same as calling
+        manage_robot_tasks(history[:index], max_assignments, cooldown).
+
+        Args:
+            index (int): The number of assignments of the history to consider.
+            max_assignments (dict):
+                A dictionary defining maximum allowable assignments per robot.
+            cooldown (optional): The cooldown. Defaults to DEFAULT_COOLDOWN.
+
+        Raises:
+            IndexError: If (index) is not between 0 and len(self).
+
+        Returns:
+            list[int]: The available robots, in the order of manage_robot_tasks.
+        """
+        self._check_index(index)
+        min_cooldown_index = index - (
+            cooldown if is_positive_int(cooldown) else DEFAULT_COOLDOWN
+        )
+        can_assign_extra_robots = (
+            bisect_left(self._first_seen_indices, index)
+            < MAX_UNIQUE_ROBOT_ID_COUNT - 1
+        )
+        extra_robot_ids: list[int] = []
+        result: list[tuple[int, int]] = []
+        for robot_id, limit in max_assignments.items():
+            if is_positive_int(robot_id) and is_positive_int(
+                limit, nonzero=True
+            ):
+                robot_record = self.record_at(robot_id, index)
+                if robot_record is not None:
+                    if (
+                        robot_record.assignment_count < limit
+                        and robot_record.last_assignment_index
+                        < min_cooldown_index
+                    ):
+                        result.append(
+                            (robot_record.first_assignment_index, robot_id)
+                        )
+                elif can_assign_extra_robots:
+                    extra_robot_ids.append(robot_id)
+
+        result.sort()
+        return [robot_id for _, robot_id in result] + (
+            extra_robot_ids if can_assign_extra_robots else []
+        )
@@ -0,0 +1,107 @@
+"""Readers and writers for assignment log files.
+
+A binary assignment log is a flat sequence of native-endian int32 robot IDs,
+one per assignment. Negative IDs are kept as they are, so they are treated as
+invalid entries that still count as assignments.
+"""
+
+import mmap
+from array import array
+from os import PathLike
+from typing import Final, Iterable
+
+from manage_robot_tasks import DEFAULT_COOLDOWN, Context, manage_robot_tasks
+
+
+LOG_ITEM_FORMAT: Final = "i"
+
+LOG_ITEM_SIZE = array(LOG_ITEM_FORMAT).itemsize
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def write_binary_log(
+    path: str | PathLike[str], assignments: Iterable[int]
+) -> None:
+    """Writes (assignments) to (path) as a binary assignment log.
+
+    Args:
+        path (str | PathLike[str]): The path of the log file, it is overwritten if it exists.
+        assignments (Iterable[int]): The robot IDs to write.
+    """
+    with open(path, "wb") as log_file:
+        array(LOG_ITEM_FORMAT, assignments).tofile(log_file)
+
+
+def replay_binary_log(
+    path: str | PathLike[str],
+    max_assignments: dict,
+    cooldown=DEFAULT_COOLDOWN,
+    *,
+    context: Context,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[int]:
+    """Replays a binary assignment log into (context) in chunks.
+
+    The file is memory-mapped and every chunk is passed to manage_robot_tasks
+    as a zero-copy view of the mapping, so the peak memory usage depends on
+    (chunk_size) rather than on the size of the log.
+
+    Args:
+        path (str | PathLike[str]): The path of the binary assignment log.
+        max_assignments (dict):
+            A dictionary defining maximum allowable assignments per robot.
+        cooldown (optional): Passed to manage_robot_tasks. Defaults to DEFAULT_COOLDOWN.
+        context (Context): The context to replay the log into, it is updated in place.
+        chunk_size (int, optional):
+            The number of robot IDs passed to manage_robot_tasks at once.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+    Raises:
+        ValueError: If the file size is not a multiple of LOG_ITEM_SIZE,
+            if (chunk_size) is not a positive integer, or if the number of
+            unique robot IDs reaches MAX_UNIQUE_ROBOT_ID_COUNT, in which case
+            (context) is not changed.
+
+    Returns:
+        list[int]: The robots that can take on tasks after the whole log is replayed.
+    """
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("(chunk_size) must be a positive integer")
+
+    with open(path, "rb") as log_file:
+        file_size = log_file.seek(0, 2)
+        if file_size % LOG_ITEM_SIZE:
+            raise ValueError(
+                f"The size of {path!r} is not a multiple of {LOG_ITEM_SIZE}"
+            )
+        if not file_size:  # Empty files cannot be memory-mapped
+            return manage_robot_tasks(
+                [], max_assignments, cooldown, context=context
+            )
+
+        with mmap.mmap(
+            log_file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapping, memoryview(mapping) as raw_view, raw_view.cast(
+            LOG_ITEM_FORMAT
+        ) as view:
+            # Replay into a shallow copy, which is enough since
+            # manage_robot_tasks replaces the items of its context, so that
+            # (context) is unchanged if a chunk raises.
+            replayed_context: Context = {}
+            replayed_context.update(context)
+            result: list[int] = []
+            for start in range(0, len(view), chunk_size):
+                with view[start : start + chunk_size] as chunk:
+                    result = manage_robot_tasks(
+                        chunk,
+                        max_assignments if start == 0 else {},
+                        cooldown,
+                        context=replayed_context,
+                    )
+        context["max_assignments"] = replayed_context["max_assignments"]
+        context["robot_records"] = replayed_context["robot_records"]
+        context["total_assignment_count"] = replayed_context[
+            "total_assignment_count"
+        ]
+        return result
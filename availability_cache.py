@@ -0,0 +1,105 @@
+"""LRU cache of availability results across teams."""
+
+import weakref
+from collections import OrderedDict
+from typing import Hashable, NamedTuple
+
+from robot_task_manager import RobotTaskManager
+
+
+DEFAULT_MAX_SIZE = 1024
+
+
+class CacheStats(NamedTuple):
+    """Represents the counters of an AvailabilityCache"""
+
+    hits: int
+    misses: int
+    evictions: int
+
+
+class AvailabilityCache:
+    """Caches the results of RobotTaskManager.available across teams.
+
+    Entries are keyed on the team and the cooldown, and hold a weak reference
+    to the manager they were computed from and its state and limits versions.
+    Any recorded assignment, retraction or limit change bumps these versions,
+    so the stale entry is recomputed on the next lookup. The versions of a
+    new manager start from 0 again, e.g. when a TeamRegistry reloads a team,
+    so entries of another manager are never hits. The least recently used entries
+    are evicted once there are more than (max_size) of them.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """
+        Args:
+            max_size (int, optional):
+                The maximum number of cached results. Defaults to DEFAULT_MAX_SIZE.
+        """
+        if not isinstance(max_size, int) or max_size <= 0:
+            raise ValueError("(max_size) must be a positive integer")
+        self.max_size = max_size
+        self._entries: OrderedDict[
+            tuple[Hashable, Hashable],
+            tuple[weakref.ref[RobotTaskManager], tuple[int, int], list[int]],
+        ] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        """The hit, miss and eviction counts so far."""
+        return CacheStats(self._hits, self._misses, self._evictions)
+
+    def available(
+        self, team: Hashable, manager: RobotTaskManager, cooldown=None
+    ) -> list[int]:
+        """Returns manager.available(cooldown), from the cache if it is still valid.
+
+        Args:
+            team (Hashable): The key that identifies (manager) in the cache.
+            manager (RobotTaskManager): The manager of the team.
+            cooldown (optional):
+                The cooldown. Defaults to None, which means manager.cooldown.
+
+        Returns:
+            list[int]: The available robots.
+        """
+        if cooldown is None:
+            cooldown = manager.cooldown
+        key = (team, cooldown)
+        version = (manager.version, manager.limits_version)
+        entry = self._entries.get(key)
+        if (
+            entry is not None
+            and entry[0]() is manager
+            and entry[1] == version
+        ):
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return list(entry[2])
+
+        self._misses += 1
+        result = manager.available(cooldown)
+        self._entries[key] = (weakref.ref(manager), version, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+        return list(result)
+
+    def invalidate(self, team: Hashable | None = None) -> None:
+        """Drops the cached results of (team), or all of them if (team) is None.
+
+        Args:
+            team (Hashable | None, optional): The team. Defaults to None.
+        """
+        if team is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == team]:
+            del self._entries[key]
@@ -0,0 +1,327 @@
+"""Capture of manage_robot_tasks calls to a trace file, and timed replay of
+the trace against any engine.
+
+Example:
+    python call_trace.py calls.jsonl.gz --engine reference --engine manager
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import statistics
+import time
+from collections import OrderedDict
+from os import PathLike
+from typing import IO, Any, Iterator, NamedTuple, Sequence
+
+from compiled_limits import CompiledLimits
+from context_io import context_from_json_dict, context_to_json_dict
+from differential_fuzzing import (
+    DEFAULT_ENGINES,
+    Engine,
+    EngineFactory,
+    ReferenceEngine,
+)
+from manage_robot_tasks import (
+    DEFAULT_COOLDOWN,
+    Context,
+    manage_robot_tasks,
+)
+
+
+ENGINES: dict[str, EngineFactory] = {
+    "reference": ReferenceEngine,
+    **DEFAULT_ENGINES,
+}
+
+DEFAULT_MAX_STREAMS = 1024
+
+
+def _open_trace(path: str | PathLike[str], mode: str) -> IO[str]:
+    """Opens (path) as text, compressed with gzip if it ends with .gz."""
+    if str(path).endswith(".gz"):
+        return io.TextIOWrapper(gzip.GzipFile(path, mode), encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _digest(encoded: dict[str, Any]) -> str:
+    """Returns the digest of the output of context_to_json_dict with exact keys."""
+    return hashlib.blake2b(
+        json.dumps(
+            {
+                key: (
+                    sorted(value, key=repr)
+                    if key in ("max_assignments", "robot_records")
+                    else value
+                )
+                for key, value in encoded.items()
+            },
+            sort_keys=True,
+            default=str,
+        ).encode(),
+        digest_size=8,
+    ).hexdigest()
+
+
+def context_digest(context: Context) -> str:
+    """Returns a short digest of (context), which does not depend on the
+    order of its items.
+
+    Args:
+        context (Context): The context.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    return _digest(context_to_json_dict(context, exact_keys=True))
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+class TraceRecorder:
+    """A drop-in replacement of manage_robot_tasks that records every call.
+
+    Each line of the trace is a JSON object:
+        - {"kind": "context", "stream": n, "context": ...}: The full state of
+            the (n)th context passed by the caller, written the first time it
+            is seen, and again whenever it was changed outside of the calls.
+        - {"kind": "call", "stream": n | null, "assignments", "max_assignments",
+            "cooldown", "result", "error", "digest"}: A call, with the digest
+            of its context after the call.
+
+    Contexts are plain dicts, which cannot be weakly referenced, so the
+    recorder keeps the (max_streams) most recently used ones alive, which
+    also keeps their ids from being reused. A context that was dropped, or
+    released with forget, gets a new stream if it is passed again.
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike[str],
+        max_streams: int = DEFAULT_MAX_STREAMS,
+    ) -> None:
+        """
+        Args:
+            path (str | PathLike[str]):
+                The trace file, calls are appended to it. It is compressed
+                with gzip if it ends with .gz.
+            max_streams (int, optional):
+                The maximum number of contexts that are tracked at once.
+                Defaults to DEFAULT_MAX_STREAMS.
+        """
+        if not isinstance(max_streams, int) or max_streams <= 0:
+            raise ValueError("(max_streams) must be a positive integer")
+        self.path = path
+        self.max_streams = max_streams
+        self._file = _open_trace(path, "a")
+        # Tracked contexts by id, with their stream and their encoded state
+        # after the last call, least recently used first.
+        self._streams: OrderedDict[int, tuple[Context, int, str]] = (
+            OrderedDict()
+        )
+        self._stream_count = 0
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the trace file."""
+        self._file.close()
+
+    def forget(self, context: Context) -> None:
+        """Stops tracking (context), e.g. once the caller discarded it."""
+        self._streams.pop(id(context), None)
+
+    def _track(self, context: Context, stream: int, state: str) -> None:
+        """Records the state of (context) and drops the least recently used
+        contexts beyond (max_streams)."""
+        self._streams[id(context)] = (context, stream, state)
+        self._streams.move_to_end(id(context))
+        while len(self._streams) > self.max_streams:
+            self._streams.popitem(last=False)
+
+    def _stream(self, context: Context) -> int:
+        """Returns the stream of (context), writing its state if needed.
+
+        Comparing the encoded state is much cheaper than a digest, which is
+        only computed once per call, after it.
+        """
+        state = _dumps(context_to_json_dict(context, exact_keys=True))
+        entry = self._streams.get(id(context))
+        if entry is not None:
+            stream = entry[1]
+            if entry[2] == state:
+                self._streams.move_to_end(id(context))
+                return stream
+        else:
+            stream = self._stream_count
+            self._stream_count += 1
+        self._track(context, stream, state)
+        self._file.write(
+            f'{{"kind":"context","stream":{stream},"context":{state}}}\n'
+        )
+        return stream
+
+    def __call__(
+        self,
+        assignments: Sequence,
+        max_assignments: dict | CompiledLimits,
+        cooldown=DEFAULT_COOLDOWN,
+        *,
+        context: Context | None = None,
+    ) -> list[int]:
+        """Calls manage_robot_tasks and records the call, see manage_robot_tasks."""
+        stream = None if context is None else self._stream(context)
+        call: dict[str, Any] = {
+            "kind": "call",
+            "stream": stream,
+            "assignments": list(assignments),
+            "max_assignments": list(max_assignments.items()),
+            "cooldown": cooldown,
+            "result": None,
+            "error": None,
+            "digest": None,
+        }
+        try:
+            result = manage_robot_tasks(
+                assignments, max_assignments, cooldown, context=context
+            )
+        except ValueError as err:
+            call["error"] = str(err)
+            raise
+        else:
+            call["result"] = result
+            return result
+        finally:
+            if context is not None and stream is not None:
+                encoded = context_to_json_dict(context, exact_keys=True)
+                call["digest"] = _digest(encoded)
+                self._track(context, stream, _dumps(encoded))
+            self._file.write(_dumps(call) + "\n")
+
+
+def read_trace(path: str | PathLike[str]) -> Iterator[dict[str, Any]]:
+    """Lazily reads the entries of a trace file.
+
+    Args:
+        path (str | PathLike[str]): The trace file.
+
+    Yields:
+        dict[str, Any]: The entries, as written by TraceRecorder.
+    """
+    with _open_trace(path, "r") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+class CallTiming(NamedTuple):
+    """Represents the replay of a traced call"""
+
+    call_index: int
+    stream: int | None
+    assignment_count: int
+    seconds: float
+    matches: bool
+
+
+def replay_trace(
+    path: str | PathLike[str], engine_factory: EngineFactory = ReferenceEngine
+) -> list[CallTiming]:
+    """Re-executes the calls of a trace against an engine, timing each call.
+
+    Args:
+        path (str | PathLike[str]): The trace file.
+        engine_factory (EngineFactory, optional):
+            Creates an engine from a context. Defaults to ReferenceEngine.
+
+    Returns:
+        list[CallTiming]:
+            The timing of every call, and whether its result, error and
+            context digest match the trace.
+    """
+    engines: dict[int, Engine] = {}
+    timings: list[CallTiming] = []
+    for entry in read_trace(path):
+        stream = entry["stream"]
+        if entry["kind"] == "context":
+            engines[stream] = engine_factory(
+                context_from_json_dict(entry["context"])
+            )
+            continue
+        engine = engine_factory({}) if stream is None else engines[stream]
+        max_assignments = dict(map(tuple, entry["max_assignments"]))
+        outcome: tuple[list[int] | None, str | None]
+        start = time.perf_counter()
+        try:
+            outcome = engine.manage(
+                entry["assignments"], max_assignments, entry["cooldown"]
+            ), None
+        except ValueError as err:
+            outcome = None, str(err)
+        seconds = time.perf_counter() - start
+        timings.append(
+            CallTiming(
+                len(timings),
+                stream,
+                len(entry["assignments"]),
+                seconds,
+                outcome == (entry["result"], entry["error"])
+                and (
+                    stream is None
+                    or context_digest(engine.context) == entry["digest"]
+                ),
+            )
+        )
+    return timings
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Replays a trace against engines and prints their timings.
+
+    Args:
+        argv (Sequence[str] | None, optional):
+            The command-line arguments. Defaults to None, which means sys.argv[1:].
+
+    Returns:
+        int: The exit status, 1 if an engine does not reproduce the trace.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace")
+    parser.add_argument(
+        "--engine", action="append", choices=sorted(ENGINES), dest="engines"
+    )
+    parser.add_argument(
+        "--per-call",
+        action="store_true",
+        help="print the timing of every call as a JSON line",
+    )
+    args = parser.parse_args(argv)
+
+    status = 0
+    for name in args.engines or ["reference"]:
+        timings = replay_trace(args.trace, ENGINES[name])
+        if args.per_call:
+            for timing in timings:
+                print(_dumps({"engine": name, **timing._asdict()}))
+        seconds = [timing.seconds for timing in timings]
+        mismatches = sum(not timing.matches for timing in timings)
+        status = status or int(bool(mismatches))
+        print(
+            f"{name}: {len(timings)} calls, {sum(seconds) * 1000:.1f} ms, "
+            f"median {statistics.median(seconds or [0]) * 1e6:.1f} us, "
+            f"max {max(seconds, default=0) * 1e6:.1f} us, "
+            f"{mismatches} mismatches"
+        )
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+"""Capability tags of robots, with an inverted index from each capability to
+the mask of the robots that have it."""
+
+from typing import Hashable, Iterable
+
+from robot_bitsets import RobotInterner, TeamBitsets
+
+
+class CapabilityIndex:
+    """Maps capabilities to robot masks over the slots of a RobotInterner.
+
+    The available robots that have some capabilities are the intersection of
+    their masks with the available mask of a team that shares the interner,
+    so the answer is found with a few bitwise operations and decoded in time
+    proportional to its size, instead of filtering the whole team.
+    """
+
+    def __init__(self, interner: RobotInterner | None = None) -> None:
+        """
+        Args:
+            interner (RobotInterner | None, optional):
+                The interner of the teams that are queried.
+                Defaults to None, which means a new interner.
+        """
+        self.interner = RobotInterner() if interner is None else interner
+        self._masks: dict[Hashable, int] = {}
+        self._capabilities: dict[int, set[Hashable]] = {}
+
+    def capabilities(self, robot_id: int) -> frozenset[Hashable]:
+        """Returns the capabilities of (robot_id)."""
+        return frozenset(self._capabilities.get(robot_id, ()))
+
+    def tag(self, robot_id: int, capabilities: Iterable[Hashable]) -> None:
+        """Adds (capabilities) to (robot_id).
+
+        Args:
+            robot_id (int): The robot ID.
+            capabilities (Iterable[Hashable]): The capabilities.
+        """
+        bit = 1 << self.interner.slot(robot_id)
+        robot_capabilities = self._capabilities.setdefault(robot_id, set())
+        for capability in capabilities:
+            robot_capabilities.add(capability)
+            self._masks[capability] = self._masks.get(capability, 0) | bit
+
+    def untag(
+        self, robot_id: int, capabilities: Iterable[Hashable] | None = None
+    ) -> None:
+        """Removes (capabilities) from (robot_id).
+
+        Args:
+            robot_id (int): The robot ID.
+            capabilities (Iterable[Hashable] | None, optional):
+                The capabilities. Defaults to None, which means all of them.
+        """
+        robot_capabilities = self._capabilities.get(robot_id)
+        if not robot_capabilities:
+            return
+        bit = 1 << self.interner.slot(robot_id)
+        for capability in list(
+            robot_capabilities if capabilities is None else capabilities
+        ):
+            if capability in robot_capabilities:
+                robot_capabilities.discard(capability)
+                mask = self._masks[capability] & ~bit
+                if mask:
+                    self._masks[capability] = mask
+                else:
+                    del self._masks[capability]
+        if not robot_capabilities:
+            del self._capabilities[robot_id]
+
+    def mask(self, capabilities: Iterable[Hashable]) -> int:
+        """Returns the mask of the robots that have all of (capabilities).
+
+        Args:
+            capabilities (Iterable[Hashable]): At least one capability.
+
+        Raises:
+            ValueError: If (capabilities) is empty.
+
+        Returns:
+            int: The mask.
+        """
+        mask = None
+        for capability in capabilities:
+            capability_mask = self._masks.get(capability, 0)
+            mask = capability_mask if mask is None else mask & capability_mask
+            if not mask:
+                return 0
+        if mask is None:
+            raise ValueError("(capabilities) must not be empty")
+        return mask
+
+    def robot_ids(self, capabilities: Iterable[Hashable]) -> list[int]:
+        """Returns the robots that have all of (capabilities), in slot order."""
+        return self.interner.robot_ids(self.mask(capabilities))
+
+    def available(
+        self, team: TeamBitsets, capabilities: Iterable[Hashable]
+    ) -> list[int]:
+        """Returns the available robots of (team) that have all of (capabilities).
+
+        Args:
+            team (TeamBitsets): The bitsets of the team, with the same interner.
+            capabilities (Iterable[Hashable]): At least one capability.
+
+        Raises:
+            ValueError: If (team) does not share the interner of this index,
+                or if (capabilities) is empty.
+
+        Returns:
+            list[int]: The robots, in slot order.
+        """
+        if team.interner is not self.interner:
+            raise ValueError("(team) must share the interner of the index")
+        return self.interner.robot_ids(
+            team.available & self.mask(capabilities)
+        )
@@ -0,0 +1,258 @@
+"""Columnar export of the state of a team, as contiguous typed buffers."""
+
+from array import array
+from typing import Any, Callable, Mapping
+
+from manage_robot_tasks import (
+    DEFAULT_COOLDOWN,
+    MAX_UNIQUE_ROBOT_ID_COUNT,
+    Context,
+    RobotRecord,
+)
+from robot_state_events import RobotState
+from robot_task_manager import RobotTaskManager
+from utils import is_positive_int
+
+
+# The status column holds the index of each state in this tuple
+STATUSES: tuple[RobotState, ...] = tuple(RobotState)
+
+_STATUS_CODES = {state: code for code, state in enumerate(STATUSES)}
+
+_INT64_FORMAT = "q"
+
+_INT64_MAX = 2**63 - 1
+
+_STATUS_FORMAT = "b"
+
+
+class RobotColumns:
+    """The state of a team, one row per robot, stored as typed arrays.
+
+    Every column is exposed as a memoryview, so bulk consumers can read it
+    through the buffer protocol without creating a Python object per record.
+
+    - robot_ids: The robot IDs.
+    - assignment_counts: The number of assignments, 0 if never assigned.
+    - first_assignment_indices, last_assignment_indices:
+        The indices of the first and last assignments, -1 if never assigned.
+    - limits: The limit of the robot, -1 if it has no valid limit.
+    - statuses: The index of the RobotState of the robot in STATUSES.
+    """
+
+    __slots__ = (
+        "_robot_ids",
+        "_assignment_counts",
+        "_first_assignment_indices",
+        "_last_assignment_indices",
+        "_limits",
+        "_statuses",
+    )
+
+    def __init__(
+        self,
+        robot_records: Mapping[int, RobotRecord],
+        limits: Mapping[int, int],
+        status: Callable[[int, RobotRecord | None, int | None], RobotState],
+    ) -> None:
+        """
+        Args:
+            robot_records (Mapping[int, RobotRecord]): The records of the team.
+            limits (Mapping[int, int]): The valid limits of the team.
+            status (Callable[[int, RobotRecord | None, int | None], RobotState]):
+                Returns the state of a robot from its record and its limit.
+
+        Raises:
+            ValueError:
+                If a robot ID or a limit does not fit in a 64-bit integer,
+                although is_positive_int accepts it.
+        """
+        unassigned_robot_ids = [
+            robot_id for robot_id in limits if robot_id not in robot_records
+        ]
+        robot_ids = [*robot_records, *unassigned_robot_ids]
+        if (
+            max(robot_ids, default=0) > _INT64_MAX
+            or max(limits.values(), default=0) > _INT64_MAX
+        ):
+            raise ValueError(
+                f"Robot IDs and limits must be at most {_INT64_MAX} to be exported"
+            )
+        self._robot_ids = array(_INT64_FORMAT, robot_ids)
+        if robot_records:
+            counts, firsts, lasts = zip(*robot_records.values())
+        else:
+            counts = firsts = lasts = ()
+        padding = [-1] * len(unassigned_robot_ids)
+        self._assignment_counts = array(_INT64_FORMAT, counts)
+        self._assignment_counts.extend([0] * len(unassigned_robot_ids))
+        self._first_assignment_indices = array(_INT64_FORMAT, firsts)
+        self._first_assignment_indices.extend(padding)
+        self._last_assignment_indices = array(_INT64_FORMAT, lasts)
+        self._last_assignment_indices.extend(padding)
+        self._limits = array(
+            _INT64_FORMAT,
+            [limits.get(robot_id, -1) for robot_id in robot_ids],
+        )
+        self._statuses = array(
+            _STATUS_FORMAT,
+            [
+                _STATUS_CODES[
+                    status(
+                        robot_id,
+                        robot_records.get(robot_id),
+                        limits.get(robot_id),
+                    )
+                ]
+                for robot_id in robot_ids
+            ],
+        )
+
+    def __len__(self) -> int:
+        return len(self._robot_ids)
+
+    @property
+    def columns(self) -> dict[str, memoryview]:
+        """Zero-copy views of the columns, by name."""
+        return {
+            name.lstrip("_"): memoryview(getattr(self, name))
+            for name in self.__slots__
+        }
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Returns NumPy arrays that share the memory of the columns.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+
+        Returns:
+            dict[str, numpy.ndarray]: The columns, by name.
+        """
+        # pylint: disable-next=import-outside-toplevel,import-error
+        import numpy  # type: ignore[import-not-found]
+
+        return {
+            name: numpy.frombuffer(column, dtype=column.format)
+            for name, column in self.columns.items()
+        }
+
+
+def _status(
+    robot_record: RobotRecord | None,
+    limit: int | None,
+    min_cooldown_index: int,
+    can_assign_extra_robots: bool,
+) -> RobotState:
+    if limit is None:
+        return RobotState.UNKNOWN
+    if robot_record is None:
+        return (
+            RobotState.AVAILABLE
+            if can_assign_extra_robots
+            else RobotState.UNKNOWN
+        )
+    if robot_record.assignment_count >= limit:
+        return RobotState.EXHAUSTED
+    if robot_record.last_assignment_index >= min_cooldown_index:
+        return RobotState.COOLING
+    return RobotState.AVAILABLE
+
+
+def export_context(
+    context: Context, cooldown=DEFAULT_COOLDOWN
+) -> RobotColumns:
+    """Exports the robots of (context) as columns.
+
+    Robots that have a record but no valid limit are UNKNOWN, since a context
+    does not tell exhausted robots apart once they are dropped from its limits.
+
+    Args:
+        context (Context): The context.
+        cooldown (optional): The cooldown of the statuses. Defaults to DEFAULT_COOLDOWN.
+
+    Raises:
+        ValueError: If a robot ID or a limit does not fit in a 64-bit integer.
+
+    Returns:
+        RobotColumns: The columns.
+    """
+    robot_records = {
+        robot_id: (
+            robot_record
+            if isinstance(robot_record, RobotRecord)
+            else RobotRecord(*robot_record)
+        )
+        for robot_id, robot_record in context.get("robot_records", {}).items()
+    }
+    limits = {
+        robot_id: limit
+        for robot_id, limit in context.get("max_assignments", {}).items()
+        if is_positive_int(robot_id) and is_positive_int(limit, nonzero=True)
+    }
+    total_assignment_count = max(
+        sum(
+            robot_record.assignment_count
+            for robot_record in robot_records.values()
+        ),
+        context.get("total_assignment_count", 0),
+    )
+    min_cooldown_index = total_assignment_count - (
+        cooldown if is_positive_int(cooldown) else DEFAULT_COOLDOWN
+    )
+    can_assign_extra_robots = len(robot_records) < (
+        MAX_UNIQUE_ROBOT_ID_COUNT - 1
+    )
+    return RobotColumns(
+        robot_records,
+        limits,
+        lambda robot_id, robot_record, limit: _status(
+            robot_record, limit, min_cooldown_index, can_assign_extra_robots
+        ),
+    )
+
+
+def export_manager(manager: RobotTaskManager, cooldown=None) -> RobotColumns:
+    """Exports the robots of (manager) as columns, including its cold records.
+
+    Args:
+        manager (RobotTaskManager): The manager.
+        cooldown (optional):
+            The cooldown of the statuses. Defaults to None, which means manager.cooldown.
+
+    Raises:
+        ValueError: If a robot ID or a limit does not fit in a 64-bit integer.
+
+    Returns:
+        RobotColumns: The columns.
+    """
+    context = manager.context
+    limits = {
+        robot_id: limit
+        for robot_id in context["max_assignments"]
+        if (limit := manager.limit(robot_id)) is not None
+    }
+
+    def status(
+        robot_id: int, robot_record: RobotRecord | None, limit: int | None
+    ) -> RobotState:
+        if limit is None:
+            return (
+                RobotState.EXHAUSTED
+                if manager.is_exhausted(robot_id)
+                else RobotState.UNKNOWN
+            )
+        if robot_record is None:
+            return (
+                RobotState.AVAILABLE
+                if manager.is_available(robot_id, cooldown)
+                else RobotState.UNKNOWN
+            )
+        if robot_record.assignment_count >= limit:
+            return RobotState.EXHAUSTED
+        return (
+            RobotState.AVAILABLE
+            if manager.is_available(robot_id, cooldown)
+            else RobotState.COOLING
+        )
+
+    return RobotColumns(context["robot_records"], limits, status)
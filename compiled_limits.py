@@ -0,0 +1,127 @@
+"""Pre-validated maximum allowable assignments that can be reused across calls."""
+
+from typing import Iterator, Mapping
+
+from utils import is_positive_int
+
+
+class CompiledLimits(Mapping[int, int]):
+    """An immutable and hashable form of (max_assignments).
+
+    Invalid entries are dropped once when the object is created, so it can be
+    passed to manage_robot_tasks in place of a dict to skip the validation of
+    every entry on every call. Each robot ID is also mapped to a dense slot,
+    which is its position in (robot_ids) and (limits).
+    """
+
+    __slots__ = ("_robot_ids", "_limits", "_slots", "_dropped", "_hash")
+
+    def __init__(self, max_assignments: Mapping) -> None:
+        """
+        Args:
+            max_assignments (Mapping):
+                A mapping defining maximum allowable assignments per robot.
+                Entries whose robot ID is not a positive integer or whose
+                limit is not a nonzero positive integer are dropped.
+        """
+        valid_items = [
+            (robot_id, limit)
+            for robot_id, limit in max_assignments.items()
+            if is_positive_int(robot_id)
+            and is_positive_int(limit, nonzero=True)
+        ]
+        self._robot_ids: tuple[int, ...] = tuple(
+            robot_id for robot_id, _ in valid_items
+        )
+        self._limits: tuple[int, ...] = tuple(
+            limit for _, limit in valid_items
+        )
+        self._slots: dict[int, int] = {
+            robot_id: slot for slot, robot_id in enumerate(self._robot_ids)
+        }
+        # Dropped entries still override the ones they are merged over
+        self._dropped = frozenset(max_assignments.keys() - self._slots.keys())
+        self._hash = hash((self._robot_ids, self._limits, self._dropped))
+
+    @property
+    def robot_ids(self) -> tuple[int, ...]:
+        """The valid robot IDs, in their original order."""
+        return self._robot_ids
+
+    @property
+    def limits(self) -> tuple[int, ...]:
+        """The limits of (robot_ids), in the same order."""
+        return self._limits
+
+    def slot(self, robot_id: int) -> int:
+        """Returns the dense slot of (robot_id).
+
+        Args:
+            robot_id (int): The robot ID.
+
+        Raises:
+            KeyError: If (robot_id) is not in the limits.
+
+        Returns:
+            int: The index of (robot_id) in (robot_ids).
+        """
+        return self._slots[robot_id]
+
+    def __getitem__(self, robot_id: int) -> int:
+        return self._limits[self._slots[robot_id]]
+
+    def __contains__(self, robot_id: object) -> bool:
+        return robot_id in self._slots
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._robot_ids)
+
+    def __len__(self) -> int:
+        return len(self._robot_ids)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompiledLimits):
+            return (
+                self._hash == other._hash
+                and self._robot_ids == other._robot_ids
+                and self._limits == other._limits
+                and self._dropped == other._dropped
+            )
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def merged_over(self, max_assignments: dict) -> dict[int, int]:
+        """Returns the valid entries of (max_assignments | self), in the same
+        order as the dict union, validating the entries of (max_assignments) only.
+
+        The entries that were dropped from self still override the entries of
+        (max_assignments), like they would in a union with the original dict.
+
+        Args:
+            max_assignments (dict): The maximum allowable assignments to merge over.
+
+        Returns:
+            dict[int, int]: The valid merged maximum allowable assignments.
+        """
+        merged: dict[int, int] = {}
+        for robot_id, limit in max_assignments.items():
+            if robot_id in self._slots:
+                # An equal but invalid key (like 101.0) shadows the compiled
+                # entry in a dict union, so the entry is dropped in that case.
+                if is_positive_int(robot_id):
+                    merged[robot_id] = self[robot_id]
+            elif robot_id in self._dropped:
+                continue
+            elif is_positive_int(robot_id) and is_positive_int(
+                limit, nonzero=True
+            ):
+                merged[robot_id] = limit
+        for robot_id, limit in zip(self._robot_ids, self._limits):
+            if robot_id not in max_assignments:
+                merged[robot_id] = limit
+        return merged
@@ -0,0 +1,145 @@
+"""Serialization of manage_robot_tasks contexts.
+
+JSON objects only have string keys, so robot IDs are written as strings and
+parsed back into integers when a context is loaded.
+"""
+
+import json
+import os
+from os import PathLike
+from typing import Any
+
+from manage_robot_tasks import Context, RobotRecord
+
+
+def parse_robot_id(key: str) -> int | str:
+    """Parses a robot ID that was used as a JSON object key.
+
+    Args:
+        key (str): The JSON object key.
+
+    Returns:
+        int | str: The integer robot ID, or (key) itself if it is not an integer.
+    """
+    try:
+        return int(key)
+    except ValueError:
+        return key
+
+
+def context_to_json_dict(
+    context: Context, *, exact_keys: bool = False
+) -> dict[str, Any]:
+    """Converts (context) into a dict that can be serialized as JSON.
+
+    Args:
+        context (Context): The context to convert.
+        exact_keys (bool, optional):
+            If True, the items are written as [robot_id, value] pairs instead
+            of objects, which keeps keys like 2.0 or True as they are.
+            Defaults to False.
+
+    Returns:
+        dict[str, Any]: The JSON-compatible representation of (context).
+    """
+    result: dict[str, Any] = {}
+    if "max_assignments" in context:
+        result["max_assignments"] = (
+            [list(item) for item in context["max_assignments"].items()]
+            if exact_keys
+            else {
+                str(robot_id): limit
+                for robot_id, limit in context["max_assignments"].items()
+            }
+        )
+    if "robot_records" in context:
+        result["robot_records"] = (
+            [
+                [robot_id, list(robot_record)]
+                for robot_id, robot_record in context["robot_records"].items()
+            ]
+            if exact_keys
+            else {
+                str(robot_id): list(robot_record)
+                for robot_id, robot_record in context["robot_records"].items()
+            }
+        )
+    if "total_assignment_count" in context:
+        result["total_assignment_count"] = context["total_assignment_count"]
+    return result
+
+
+def context_from_json_dict(data: dict[str, Any]) -> Context:
+    """Converts the output of context_to_json_dict back into a context.
+
+    Args:
+        data (dict[str, Any]): The JSON-compatible representation of a context.
+
+    Returns:
+        Context: The parsed context.
+    """
+    context: Context = {}
+    if "max_assignments" in data:
+        max_assignments = data["max_assignments"]
+        context["max_assignments"] = (
+            dict(max_assignments)
+            if isinstance(max_assignments, list)
+            else {
+                parse_robot_id(key): limit  # type: ignore[misc]
+                for key, limit in max_assignments.items()
+            }
+        )
+    if "robot_records" in data:
+        robot_records = data["robot_records"]
+        context["robot_records"] = (
+            {
+                robot_id: RobotRecord(*robot_record)
+                for robot_id, robot_record in robot_records
+            }
+            if isinstance(robot_records, list)
+            else {
+                int(key): RobotRecord(*robot_record)
+                for key, robot_record in robot_records.items()
+            }
+        )
+    if "total_assignment_count" in data:
+        context["total_assignment_count"] = data["total_assignment_count"]
+    return context
+
+
+def dump_context(context: Context, path: str | PathLike[str]) -> None:
+    """Writes (context) to (path) as compact JSON.
+
+    The JSON is written to a temporary file that then replaces (path), so a
+    crash while writing never leaves a truncated file at (path).
+
+    Args:
+        context (Context): The context to write.
+        path (str | PathLike[str]): The path of the file, it is overwritten if it exists.
+    """
+    temporary_path = os.fspath(path) + ".tmp"
+    try:
+        with open(temporary_path, "w", encoding="utf-8") as context_file:
+            json.dump(
+                context_to_json_dict(context),
+                context_file,
+                separators=(",", ":"),
+            )
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+def load_context(path: str | PathLike[str]) -> Context:
+    """Reads a context written by dump_context.
+
+    Args:
+        path (str | PathLike[str]): The path of the file.
+
+    Returns:
+        Context: The loaded context.
+    """
+    with open(path, encoding="utf-8") as context_file:
+        return context_from_json_dict(json.load(context_file))
@@ -0,0 +1,176 @@
+"""Sampled, structured records of why robots were excluded from a result."""
+
+import json
+import random
+from collections import deque
+from enum import Enum
+from os import PathLike
+from typing import Any, Callable, NamedTuple
+
+from manage_robot_tasks import RobotRecord
+
+
+DEFAULT_CAPACITY = 1024
+
+
+class ExclusionReason(Enum):
+    """Why a robot with a limit was not available.
+
+    - INVALID_LIMIT: The robot ID or the limit is not valid.
+    - OVER_LIMIT: The robot reached its limit.
+    - COOLDOWN: The robot was assigned too recently.
+    - EXTRA_REJECTED: The robot was never assigned, and the team is too
+        close to MAX_UNIQUE_ROBOT_ID_COUNT to take on a new robot.
+    """
+
+    INVALID_LIMIT = "invalid_limit"
+    OVER_LIMIT = "over_limit"
+    COOLDOWN = "cooldown"
+    EXTRA_REJECTED = "extra_rejected"
+
+
+class Exclusion(NamedTuple):
+    """Represents a robot that was excluded from a result"""
+
+    robot_id: Any
+    reason: ExclusionReason
+    limit: Any
+    robot_record: RobotRecord | None
+
+
+class DecisionRecord(NamedTuple):
+    """Represents the exclusions of a RobotTaskManager.manage call"""
+
+    total_assignment_count: int
+    min_cooldown_index: int
+    unique_robot_id_count: int
+    exclusions: tuple[Exclusion, ...]
+
+
+def decision_record_to_json_dict(record: DecisionRecord) -> dict[str, Any]:
+    """Converts (record) into a dict that can be serialized as JSON.
+
+    Args:
+        record (DecisionRecord): The record to convert.
+
+    Returns:
+        dict[str, Any]: The JSON-compatible representation of (record).
+    """
+    return {
+        "total_assignment_count": record.total_assignment_count,
+        "min_cooldown_index": record.min_cooldown_index,
+        "unique_robot_id_count": record.unique_robot_id_count,
+        "exclusions": [
+            {
+                "robot_id": exclusion.robot_id,
+                "reason": exclusion.reason.value,
+                "limit": exclusion.limit,
+                "robot_record": (
+                    None
+                    if exclusion.robot_record is None
+                    else list(exclusion.robot_record)
+                ),
+            }
+            for exclusion in record.exclusions
+        ],
+    }
+
+
+class JsonLinesSink:  # pylint: disable=R0903
+    """Appends batches of decision records to a file, one JSON object per line"""
+
+    def __init__(self, path: str | PathLike[str]) -> None:
+        """
+        Args:
+            path (str | PathLike[str]): The path of the file.
+        """
+        self.path = path
+
+    def __call__(self, records: list[DecisionRecord]) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.writelines(
+                json.dumps(
+                    decision_record_to_json_dict(record),
+                    separators=(",", ":"),
+                    default=str,
+                )
+                + "\n"
+                for record in records
+            )
+
+
+class DecisionLog:
+    """A ring buffer of sampled decision records, flushed to a sink in batches.
+
+    A RobotTaskManager only explains its decisions for the calls that are
+    sampled, and does nothing more than an attribute check when it has no
+    decision log, so the hot path is unaffected when logging is disabled.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        capacity: int = DEFAULT_CAPACITY,
+        sink: Callable[[list[DecisionRecord]], object] | None = None,
+        batch_size: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Args:
+            sample_rate (float, optional):
+                The fraction of calls that are recorded. Defaults to 1.0.
+            capacity (int, optional):
+                The number of records kept in the ring buffer, older ones are
+                overwritten. Defaults to DEFAULT_CAPACITY.
+            sink (Callable[[list[DecisionRecord]], object] | None, optional):
+                Receives the records in batches. Defaults to None, which means
+                the records are only kept in the ring buffer.
+            batch_size (int | None, optional):
+                The number of records that triggers a flush to (sink).
+                Defaults to None, which means (capacity).
+            seed (int | None, optional): The seed of the sampling. Defaults to None.
+        """
+        if not 0 < sample_rate <= 1:
+            raise ValueError("(sample_rate) must be in (0, 1]")
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("(capacity) must be a positive integer")
+        if batch_size is None:
+            batch_size = capacity
+        if not isinstance(batch_size, int) or not 0 < batch_size <= capacity:
+            raise ValueError(
+                "(batch_size) must be a positive integer up to (capacity)"
+            )
+        self.sample_rate = sample_rate
+        self.sink = sink
+        self.batch_size = batch_size
+        self.dropped_count = 0
+        self._buffer: deque[DecisionRecord] = deque(maxlen=capacity)
+        self._rng = random.Random(seed)
+
+    @property
+    def records(self) -> list[DecisionRecord]:
+        """The records in the ring buffer, oldest first."""
+        return list(self._buffer)
+
+    def sample(self) -> bool:
+        """Returns whether the current call should be recorded."""
+        return self.sample_rate >= 1 or self._rng.random() < self.sample_rate
+
+    def record(self, record: DecisionRecord) -> None:
+        """Adds (record) to the ring buffer, and flushes a full batch to the sink."""
+        buffer = self._buffer
+        if len(buffer) == buffer.maxlen:
+            self.dropped_count += 1
+        buffer.append(record)
+        if self.sink is not None and len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Sends the buffered records to the sink, if there is one.
+
+        The buffer is only cleared once the sink returns, so if it raises,
+        the records are sent again with the next flush.
+        """
+        if self.sink is not None and self._buffer:
+            self.sink(list(self._buffer))
+            self._buffer.clear()
@@ -0,0 +1,239 @@
+"""Seeded differential fuzzing of alternative engines against manage_robot_tasks.
+
+Example:
+    python differential_fuzzing.py --seeds 20 --steps 500
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, Iterator, NamedTuple, Protocol, Sequence
+
+from context_io import context_from_json_dict, context_to_json_dict
+from manage_robot_tasks import (
+    MAX_UNIQUE_ROBOT_ID_COUNT,
+    Context,
+    manage_robot_tasks,
+)
+from record_retention import RetentionPolicy
+from robot_task_manager import RobotTaskManager
+
+
+class Engine(Protocol):
+    """An implementation of manage_robot_tasks that keeps its own context"""
+
+    @property
+    def context(self) -> Context:
+        """The current state, as a manage_robot_tasks context."""
+
+    def manage(
+        self, assignments: Sequence, max_assignments: dict, cooldown
+    ) -> list[int]:
+        """Same as manage_robot_tasks(assignments, max_assignments, cooldown, context=...)."""
+
+
+EngineFactory = Callable[[Context], Engine]
+
+
+class ReferenceEngine:  # pylint: disable=R0903
+    """Calls manage_robot_tasks with a context"""
+
+    def __init__(self, context: Context) -> None:
+        self.context = context
+
+    def manage(
+        self, assignments: Sequence, max_assignments: dict, cooldown
+    ) -> list[int]:
+        """Calls manage_robot_tasks."""
+        return manage_robot_tasks(
+            assignments, max_assignments, cooldown, context=self.context
+        )
+
+
+DEFAULT_ENGINES: dict[str, EngineFactory] = {
+    "manager": lambda context: RobotTaskManager(context=context),
+    "manager_with_retention": lambda context: RobotTaskManager(
+        context=context, retention=RetentionPolicy(idle_threshold=8)
+    ),
+}
+
+
+class Operation(NamedTuple):
+    """A step of a fuzzing sequence. A (None) (assignments) means that every
+    engine is rebuilt from a JSON round-trip of its context."""
+
+    assignments: list | None
+    max_assignments: dict
+    cooldown: object
+
+
+class EngineReport(NamedTuple):
+    """Represents the timing of an engine over a fuzzing run"""
+
+    name: str
+    seconds: float
+    speedup: float
+
+
+class DifferentialMismatch(AssertionError):
+    """Raised when an engine does not reproduce manage_robot_tasks"""
+
+
+_INVALID_ROBOT_IDS = ["_", "101", -1, 1.5, None, 101.0]
+
+_COOLDOWNS = [0, 1, 2, 3, 5, 20, None, -1, "3", 2.5]
+
+
+def generate_operations(seed: int, steps: int) -> Iterator[Operation]:
+    """Generates a random sequence of assignments, limit changes and
+    context round-trips.
+
+    The number of distinct robot IDs is sometimes close to
+    MAX_UNIQUE_ROBOT_ID_COUNT, to exercise the extra robots quirks.
+
+    Args:
+        seed (int): The random seed.
+        steps (int): The number of operations.
+
+    Yields:
+        Operation: The operations.
+    """
+    rng = random.Random(seed)
+    robot_count = rng.choice(
+        [5, 20, MAX_UNIQUE_ROBOT_ID_COUNT - 3, MAX_UNIQUE_ROBOT_ID_COUNT + 10]
+    )
+    robot_ids = list(range(1, robot_count + 1))
+    for _ in range(steps):
+        kind = rng.random()
+        if kind < 0.05:
+            yield Operation(None, {}, None)
+            continue
+        assignments = [
+            (
+                rng.choice(_INVALID_ROBOT_IDS)
+                if rng.random() < 0.1
+                else rng.choice(robot_ids)
+            )
+            for _ in range(rng.choice([0, 1, 1, 1, 2, 5, 30]))
+        ]
+        max_assignments: dict = {}
+        if kind < 0.3:
+            for _ in range(rng.randint(1, 6)):
+                robot_id = (
+                    rng.choice(_INVALID_ROBOT_IDS)
+                    if rng.random() < 0.1
+                    else rng.randint(1, robot_count + 5)
+                )
+                max_assignments[robot_id] = rng.choice(
+                    [0, 1, 2, 3, 10, -1, 1.5, "2", None]
+                )
+        yield Operation(assignments, max_assignments, rng.choice(_COOLDOWNS))
+
+
+def _outcome(engine: Engine, operation: Operation) -> tuple[str, object]:
+    try:
+        return "result", engine.manage(
+            operation.assignments or [],
+            operation.max_assignments,
+            operation.cooldown,
+        )
+    except ValueError as err:
+        return "ValueError", str(err)
+
+
+def _round_trip(context: Context) -> Context:
+    return context_from_json_dict(context_to_json_dict(context))
+
+
+def run_differential(
+    seed: int,
+    steps: int,
+    engines: dict[str, EngineFactory] | None = None,
+) -> list[EngineReport]:
+    """Drives the reference and every engine through the same operations,
+    and checks that their results, errors and contexts are identical.
+
+    Args:
+        seed (int): The random seed.
+        steps (int): The number of operations.
+        engines (dict[str, EngineFactory] | None, optional):
+            The engines to check, by name. Defaults to None, which means DEFAULT_ENGINES.
+
+    Raises:
+        DifferentialMismatch: If an engine differs from the reference.
+
+    Returns:
+        list[EngineReport]: The time spent in each engine, including the reference.
+    """
+    engines = DEFAULT_ENGINES if engines is None else engines
+    reference = ReferenceEngine({})
+    instances = {name: factory({}) for name, factory in engines.items()}
+    seconds = dict.fromkeys(["reference", *instances], 0.0)
+
+    for step, operation in enumerate(generate_operations(seed, steps)):
+        if operation.assignments is None:
+            reference = ReferenceEngine(_round_trip(reference.context))
+            instances = {
+                name: engines[name](_round_trip(instance.context))
+                for name, instance in instances.items()
+            }
+            continue
+
+        start = time.perf_counter()
+        expected = _outcome(reference, operation)
+        seconds["reference"] += time.perf_counter() - start
+        for name, instance in instances.items():
+            start = time.perf_counter()
+            actual = _outcome(instance, operation)
+            seconds[name] += time.perf_counter() - start
+            if actual != expected or instance.context != reference.context:
+                raise DifferentialMismatch(
+                    f"Engine {name!r} differs at step {step} of seed {seed}: "
+                    f"{operation!r} gave {actual!r} instead of {expected!r}"
+                )
+
+    return [
+        EngineReport(
+            name,
+            engine_seconds,
+            seconds["reference"] / engine_seconds if engine_seconds else 0.0,
+        )
+        for name, engine_seconds in seconds.items()
+    ]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Runs the differential fuzzing harness and prints the speedups.
+
+    Args:
+        argv (Sequence[str] | None, optional):
+            The command-line arguments. Defaults to None, which means sys.argv[1:].
+
+    Returns:
+        int: The exit status, 1 if an engine differs from the reference.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=10)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--steps", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    totals: dict[str, float] = {}
+    for seed in range(args.first_seed, args.first_seed + args.seeds):
+        try:
+            reports = run_differential(seed, args.steps)
+        except DifferentialMismatch as err:
+            print(err)
+            return 1
+        for report in reports:
+            totals[report.name] = totals.get(report.name, 0.0) + report.seconds
+    for name, seconds in totals.items():
+        print(
+            f"{name}: {seconds * 1000:.1f} ms, "
+            f"speedup {totals['reference'] / seconds:.2f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+"""Micro-benchmark that calibrates when manage_robot_tasks records assignments in bulk.
+
+Example:
+    python engine_selection.py --repeat 5
+"""
+
+import argparse
+import json
+import math
+import random
+import timeit
+from typing import Callable, Sequence
+
+from manage_robot_tasks import (
+    MAX_UNIQUE_ROBOT_ID_COUNT,
+    EngineThresholds,
+    record_assignments_in_bulk,
+    record_assignments_per_item,
+)
+
+
+DEFAULT_SIZES = tuple(
+    sorted({int(1.5**exponent) for exponent in range(1, 22)})
+)
+
+DEFAULT_ROBOT_COUNTS = (1, MAX_UNIQUE_ROBOT_ID_COUNT - 2)
+
+
+def _seconds(
+    record_assignments: Callable, assignments: list[int], repeat: int
+) -> float:
+    number = max(1, 20000 // len(assignments))
+    return (
+        min(
+            timeit.repeat(
+                lambda: record_assignments(assignments, {}, 0),
+                number=number,
+                repeat=repeat,
+            )
+        )
+        / number
+    )
+
+
+def find_crossover(
+    robot_count: int,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeat: int = 3,
+    seed: int = 0,
+) -> int:
+    """Finds the smallest number of assignments for which the bulk path is
+    faster than the per-item path.
+
+    Args:
+        robot_count (int): The number of distinct robots in the assignments.
+        sizes (Sequence[int], optional):
+            The increasing numbers of assignments to try. Defaults to DEFAULT_SIZES.
+        repeat (int, optional): The number of timing repetitions. Defaults to 3.
+        seed (int, optional): The random seed of the assignments. Defaults to 0.
+
+    Returns:
+        int: The crossover size, or the last size if the bulk path is never faster.
+    """
+    rng = random.Random(seed)
+    for size in sizes:
+        assignments = [rng.randint(1, robot_count) for _ in range(size)]
+        if _seconds(record_assignments_in_bulk, assignments, repeat) < (
+            _seconds(record_assignments_per_item, assignments, repeat)
+        ):
+            return size
+    return sizes[-1]
+
+
+def calibrate_engine_thresholds(
+    robot_counts: tuple[int, int] = DEFAULT_ROBOT_COUNTS,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeat: int = 3,
+) -> EngineThresholds:
+    """Measures the crossover for a small and a large team, and fits the
+    linear thresholds of manage_robot_tasks through both points.
+
+    Args:
+        robot_counts (tuple[int, int], optional):
+            The small and large team sizes. Defaults to DEFAULT_ROBOT_COUNTS.
+        sizes (Sequence[int], optional):
+            The increasing numbers of assignments to try. Defaults to DEFAULT_SIZES.
+        repeat (int, optional): The number of timing repetitions. Defaults to 3.
+
+    Returns:
+        EngineThresholds: The calibrated thresholds.
+    """
+    small, large = robot_counts
+    small_crossover = find_crossover(small, sizes, repeat)
+    large_crossover = find_crossover(large, sizes, repeat)
+    bulk_assignments_per_robot = max(
+        0, math.ceil((large_crossover - small_crossover) / (large - small))
+    )
+    return EngineThresholds(
+        max(0, small_crossover - bulk_assignments_per_robot * small),
+        bulk_assignments_per_robot,
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Runs the calibration and prints the thresholds as a JSON object.
+
+    Args:
+        argv (Sequence[str] | None, optional):
+            The command-line arguments. Defaults to None, which means sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    print(
+        json.dumps(
+            calibrate_engine_thresholds(repeat=args.repeat)._asdict()
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
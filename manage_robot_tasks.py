@@ -3,7 +3,9 @@
     This module manages these limitations while considering that tasks can arrive dynamically.
 """
 
-from typing import NamedTuple, NotRequired, TypedDict
+from collections import Counter
+from typing import Callable, NamedTuple, NotRequired, Sequence, TypedDict
+from compiled_limits import CompiledLimits
 from utils import count_unique_elements, is_positive_int, map_dict_values
 
 
@@ -22,6 +24,23 @@ class RobotRecord(NamedTuple):
     last_assignment_index: int
 
 
+class EngineThresholds(NamedTuple):
+    """Describes when manage_robot_tasks records (assignments) in bulk instead
+    of one item at a time.
+
+    The bulk path has a fixed overhead and scans (assignments) once per robot,
+    so it is used when len(assignments) is at least
+    bulk_min_assignments + bulk_assignments_per_robot * unique_robot_id_count.
+    The defaults were calibrated with engine_selection.calibrate_engine_thresholds.
+    """
+
+    bulk_min_assignments: int = 9
+    bulk_assignments_per_robot: int = 2
+
+
+DEFAULT_ENGINE_THRESHOLDS = EngineThresholds()
+
+
 class Context(TypedDict):
     """Represents the context that can be passed to manage_robot_tasks"""
 
@@ -30,19 +49,129 @@ class Context(TypedDict):
     total_assignment_count: NotRequired[int]
 
 
+def record_assignments_per_item(
+    assignments: Sequence,
+    robot_records: dict[int, RobotRecord],
+    prev_total_assignment_count: int,
+    on_record: Callable[[int, int], object] | None = None,
+) -> None:
+    """Updates (robot_records) in place with (assignments), one item at a time.
+
+    Args:
+        assignments (Sequence): The new assignments.
+        robot_records (dict[int, RobotRecord]): The records to update.
+        prev_total_assignment_count (int): The global index of assignments[0].
+        on_record (Callable[[int, int], object] | None, optional):
+            Called with the robot ID and the global index of every recorded
+            assignment. Defaults to None.
+    """
+    for actual_index, robot_id in enumerate(
+        assignments, prev_total_assignment_count
+    ):
+        if is_positive_int(robot_id):
+            if robot_id in robot_records:
+                robot_record = robot_records[robot_id]
+                robot_records[robot_id] = RobotRecord(
+                    robot_record.assignment_count + 1,
+                    robot_record.first_assignment_index,
+                    actual_index,
+                )
+            else:
+                robot_records[robot_id] = RobotRecord(
+                    1, actual_index, actual_index
+                )
+            if on_record is not None:
+                on_record(robot_id, actual_index)
+
+
+def record_assignments_in_bulk(
+    assignments: Sequence,
+    robot_records: dict[int, RobotRecord],
+    prev_total_assignment_count: int,
+) -> bool:
+    """Updates (robot_records) in place with (assignments), using a Counter
+    and dicts built from (robot_id, index) pairs instead of a Python-level loop.
+
+    The last index of every robot is the last one written to a dict built in
+    order, and its first index the last one written to a dict built in
+    reverse, so (assignments) is scanned a constant number of times however
+    many robots it has.
+
+    Only applies when every element is a non-negative int, since the counting
+    and the dicts compare elements by equality, and invalid elements like 1.0
+    or True are equal to valid robot IDs.
+
+    Args:
+        assignments (Sequence): The new assignments.
+        robot_records (dict[int, RobotRecord]): The records to update.
+        prev_total_assignment_count (int): The global index of assignments[0].
+
+    Returns:
+        bool: False if (assignments) has other elements, in which case nothing is changed.
+    """
+    items = assignments if isinstance(assignments, list) else list(assignments)
+    if set(map(type, items)) != {int} or min(items) < 0:
+        return False
+    indices = range(
+        prev_total_assignment_count, prev_total_assignment_count + len(items)
+    )
+    last_assignment_indices = dict(zip(items, indices))
+    first_assignment_indices = dict(zip(reversed(items), reversed(indices)))
+    for robot_id, count in Counter(items).items():
+        last_assignment_index = last_assignment_indices[robot_id]
+        robot_record = robot_records.get(robot_id)
+        if robot_record is not None:
+            robot_records[robot_id] = RobotRecord(
+                robot_record.assignment_count + count,
+                robot_record.first_assignment_index,
+                last_assignment_index,
+            )
+        else:
+            robot_records[robot_id] = RobotRecord(
+                count,
+                first_assignment_indices[robot_id],
+                last_assignment_index,
+            )
+    return True
+
+
+def count_unique_robot_ids(
+    assignments: Sequence, context: None | Context = None
+) -> int:
+    """Counts the unique robot IDs in (context["robot_records"]) and (assignments),
+    like manage_robot_tasks does before recording (assignments).
+
+    Args:
+        assignments (Sequence): The new assignments.
+        context (None | Context, optional): The context they are recorded in. Defaults to None.
+
+    Returns:
+        int: The count, counting stops at MAX_UNIQUE_ROBOT_ID_COUNT.
+    """
+    if context and "robot_records" in context:
+        return len(context["robot_records"]) + count_unique_elements(
+            assignments,
+            limit=MAX_UNIQUE_ROBOT_ID_COUNT - len(context["robot_records"]),
+            excluded=set(context["robot_records"]),
+        )
+    return count_unique_elements(assignments, limit=MAX_UNIQUE_ROBOT_ID_COUNT)
+
+
 def manage_robot_tasks(  # pylint: disable=R0912,R0914
-    assignments: list,
-    max_assignments: dict,
+    assignments: Sequence,
+    max_assignments: dict | CompiledLimits,
     cooldown=DEFAULT_COOLDOWN,
     *,
     context: None | Context = None,
+    engine_thresholds: EngineThresholds = DEFAULT_ENGINE_THRESHOLDS,
 ) -> list[int]:
     """Manages robot limitations while considering that tasks can arrive dynamically.
 
     Args:
-        assignments (list): A dynamic list of robot IDs representing tasks assigned over time.
-        max_assignments (dict):
+        assignments (Sequence): A dynamic list of robot IDs representing tasks assigned over time.
+        max_assignments (dict | CompiledLimits):
             A dictionary defining maximum allowable assignments per robot.
+            If it is a CompiledLimits, its entries are not validated again.
         cooldown (optional):
             An integer representing the number of subsequent tasks a robot cannot be assigned
             after taking on a new task. Defaults to DEFAULT_COOLDOWN.
@@ -55,6 +184,9 @@ def manage_robot_tasks(  # pylint: disable=R0912,R0914
                 - robot_records (dict[int, RobotRecord]):
                     Holds records that describe previous tasks of a robot.
                 - total_assignment_count (int): The total number of assignments so far.
+        engine_thresholds (EngineThresholds, optional):
+            When (assignments) are recorded in bulk instead of one item at a time.
+            Defaults to DEFAULT_ENGINE_THRESHOLDS.
     Returns:
         list[int]:
             A filtered list of robots that still can take on tasks,
@@ -63,29 +195,19 @@ def manage_robot_tasks(  # pylint: disable=R0912,R0914
 
     # Ensure the number of unique robot IDs in
     # (context["robot_records"]) and (assignments) is less than MAX_UNIQUE_ROBOT_ID_COUNT.
-    if context and "robot_records" in context:
-        unique_robot_id_count = len(
-            context["robot_records"]
-        ) + count_unique_elements(
-            assignments,
-            limit=MAX_UNIQUE_ROBOT_ID_COUNT - len(context["robot_records"]),
-            excluded=set(context["robot_records"]),
-        )
-
-    else:
-        unique_robot_id_count = count_unique_elements(
-            assignments, limit=MAX_UNIQUE_ROBOT_ID_COUNT
-        )
+    unique_robot_id_count = count_unique_robot_ids(assignments, context)
     if unique_robot_id_count >= MAX_UNIQUE_ROBOT_ID_COUNT:
         raise ValueError(MAX_UNIQUE_ROBOT_ID_MESSAGE)
 
     # Read the context if given
+    is_compiled = isinstance(max_assignments, CompiledLimits)
     if context:
-        max_assignments = (
-            (context["max_assignments"] | max_assignments)
-            if "max_assignments" in context
-            else max_assignments
-        )
+        if "max_assignments" in context:
+            max_assignments = (
+                max_assignments.merged_over(context["max_assignments"])
+                if isinstance(max_assignments, CompiledLimits)
+                else context["max_assignments"] | max_assignments
+            )
         robot_records = map_dict_values(
             lambda robot_record: (
                 robot_record
@@ -109,21 +231,17 @@ def manage_robot_tasks(  # pylint: disable=R0912,R0914
         robot_records = {}
         prev_total_assignment_count = 0
 
-    # Iterate through (assignments) and update robot_records
-    for i, robot_id in enumerate(assignments):
-        if is_positive_int(robot_id):
-            actual_index = prev_total_assignment_count + i
-            if robot_id in robot_records:
-                robot_record = robot_records[robot_id]
-                robot_records[robot_id] = RobotRecord(
-                    robot_record.assignment_count + 1,
-                    robot_record.first_assignment_index,
-                    actual_index,
-                )
-            else:
-                robot_records[robot_id] = RobotRecord(
-                    1, actual_index, actual_index
-                )
+    # Update robot_records with (assignments), in bulk if they are large
+    # enough for the size of the team
+    if len(assignments) < (
+        engine_thresholds.bulk_min_assignments
+        + engine_thresholds.bulk_assignments_per_robot * unique_robot_id_count
+    ) or not record_assignments_in_bulk(
+        assignments, robot_records, prev_total_assignment_count
+    ):
+        record_assignments_per_item(
+            assignments, robot_records, prev_total_assignment_count
+        )
 
     # Iterate through (max_assignments) items, extract extra_robot_ids, and
     # form the result and the clean_max_assignments
@@ -138,7 +256,9 @@ def manage_robot_tasks(  # pylint: disable=R0912,R0914
     result: list[int] = []
     clean_max_assignments: dict[int, int] = {}
     for robot_id, limit in max_assignments.items():
-        if is_positive_int(robot_id) and is_positive_int(limit, nonzero=True):
+        if is_compiled or (
+            is_positive_int(robot_id) and is_positive_int(limit, nonzero=True)
+        ):
             if robot_id in robot_records:
                 robot_record = robot_records[robot_id]
                 if robot_record.assignment_count < limit:
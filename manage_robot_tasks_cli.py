@@ -0,0 +1,228 @@
+"""Command-line batch processor for assignment log files.
+
+Example:
+    python manage_robot_tasks_cli.py assignments.log --limits limits.json \\
+        --cooldown 3 --save-context context.json --stats
+"""
+
+import argparse
+import json
+import sys
+import time
+from itertools import islice
+from typing import Iterator, Sequence, TextIO
+
+from assignment_log import DEFAULT_CHUNK_SIZE, replay_binary_log
+from context_io import (
+    context_to_json_dict,
+    dump_context,
+    load_context,
+    parse_robot_id,
+)
+from manage_robot_tasks import DEFAULT_COOLDOWN, Context, manage_robot_tasks
+
+
+def read_text_log(log_file: TextIO) -> Iterator[int | str]:
+    """Lazily reads a text assignment log that has one robot ID per line.
+
+    Blank lines are skipped, and lines that are not integers are yielded as
+    they are, so that they are counted as invalid assignments.
+
+    Args:
+        log_file (TextIO): The log file.
+
+    Yields:
+        int | str: The robot ID of each assignment.
+    """
+    for line in log_file:
+        line = line.strip()
+        if line:
+            yield parse_robot_id(line)
+
+
+def replay_text_log(
+    log_file: TextIO,
+    max_assignments: dict,
+    cooldown=DEFAULT_COOLDOWN,
+    *,
+    context: Context,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[int]:
+    """Streams a text assignment log into (context) in chunks.
+
+    Args:
+        log_file (TextIO): The log file.
+        max_assignments (dict):
+            A dictionary defining maximum allowable assignments per robot.
+        cooldown (optional): Passed to manage_robot_tasks. Defaults to DEFAULT_COOLDOWN.
+        context (Context): The context to replay the log into, it is updated in place.
+        chunk_size (int, optional):
+            The number of robot IDs passed to manage_robot_tasks at once.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+    Returns:
+        list[int]: The robots that can take on tasks after the whole log is replayed.
+    """
+    assignments = read_text_log(log_file)
+    result = manage_robot_tasks(
+        list(islice(assignments, chunk_size)),
+        max_assignments,
+        cooldown,
+        context=context,
+    )
+    while chunk := list(islice(assignments, chunk_size)):
+        result = manage_robot_tasks(chunk, {}, cooldown, context=context)
+    return result
+
+
+def load_limits(path: str) -> dict:
+    """Reads a JSON object that maps robot IDs to their maximum assignments.
+
+    Args:
+        path (str): The path of the limits file.
+
+    Returns:
+        dict: The limits, with integer keys wherever possible.
+    """
+    with open(path, encoding="utf-8") as limits_file:
+        return {
+            parse_robot_id(key): limit
+            for key, limit in json.load(limits_file).items()
+        }
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parses the command-line arguments.
+
+    Args:
+        argv (Sequence[str] | None, optional):
+            The arguments to parse. Defaults to None, which means sys.argv[1:].
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Replays an assignment log and prints the robots "
+        "that can still take on tasks, along with the final context."
+    )
+    parser.add_argument(
+        "log", help="The assignment log, or - to read a text log from stdin."
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "binary"),
+        default="text",
+        help="text: one robot ID per line, binary: native-endian int32 "
+        "robot IDs (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--limits",
+        help="A JSON file that maps robot IDs to their maximum assignments.",
+    )
+    parser.add_argument(
+        "--cooldown",
+        type=int,
+        default=DEFAULT_COOLDOWN,
+        help="(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--context", help="Resume from a context saved by --save-context."
+    )
+    parser.add_argument(
+        "--save-context", help="Write the final context to this file."
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Report throughput and phase timings on stderr.",
+    )
+    args = parser.parse_args(argv)
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be a positive integer")
+    if args.format == "binary" and args.log == "-":
+        parser.error("binary logs cannot be read from stdin")
+    return args
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Runs the command-line batch processor.
+
+    Args:
+        argv (Sequence[str] | None, optional):
+            The command-line arguments. Defaults to None, which means sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    args = parse_args(argv)
+    timings: dict[str, float] = {}
+
+    start = time.perf_counter()
+    max_assignments = load_limits(args.limits) if args.limits else {}
+    context: Context = load_context(args.context) if args.context else {}
+    prev_total_assignment_count = context.get("total_assignment_count", 0)
+    timings["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if args.format == "binary":
+        result = replay_binary_log(
+            args.log,
+            max_assignments,
+            args.cooldown,
+            context=context,
+            chunk_size=args.chunk_size,
+        )
+    elif args.log == "-":
+        result = replay_text_log(
+            sys.stdin,
+            max_assignments,
+            args.cooldown,
+            context=context,
+            chunk_size=args.chunk_size,
+        )
+    else:
+        with open(args.log, encoding="utf-8") as log_file:
+            result = replay_text_log(
+                log_file,
+                max_assignments,
+                args.cooldown,
+                context=context,
+                chunk_size=args.chunk_size,
+            )
+    timings["replay"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if args.save_context:
+        dump_context(context, args.save_context)
+    json.dump(
+        {"available": result, "context": context_to_json_dict(context)},
+        sys.stdout,
+    )
+    sys.stdout.write("\n")
+    timings["output"] = time.perf_counter() - start
+
+    if args.stats:
+        replayed = (
+            context.get("total_assignment_count", 0)
+            - prev_total_assignment_count
+        )
+        throughput = (
+            replayed / timings["replay"] if timings["replay"] else float("inf")
+        )
+        print(
+            f"assignments: {replayed}, throughput: {throughput:.0f}/s",
+            file=sys.stderr,
+        )
+        for phase, seconds in timings.items():
+            print(f"{phase}: {seconds * 1000:.3f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""Memory footprint of contexts, managers and registries, and a benchmark of
+the bytes per robot of each record storage backend.
+
+Example:
+    python memory_footprint.py --robots 99
+"""
+
+import argparse
+import json
+import random
+import sys
+from array import array
+from collections import deque
+from types import FunctionType, MethodType, ModuleType
+from typing import Any, Callable, NamedTuple, Sequence
+
+from context_io import context_to_json_dict
+from manage_robot_tasks import (
+    MAX_UNIQUE_ROBOT_ID_COUNT,
+    Context,
+    RobotRecord,
+)
+from record_retention import ColdRecordStore
+from robot_task_manager import RobotTaskManager
+from team_registry import TeamRegistry
+
+
+# Attributes of a RobotTaskManager that reference objects it does not own
+_EXTERNAL_ATTRIBUTES = frozenset(
+    ["retention", "decision_log", "_observers", "_clock_observers"]
+)
+
+_ATOMIC_TYPES = (str, bytes, bytearray, int, float, complex, array)
+
+_SKIPPED_TYPES = (type, ModuleType, FunctionType, MethodType)
+
+
+class Footprint(NamedTuple):
+    """Represents the bytes taken by an object, broken down by structure"""
+
+    total: int
+    breakdown: dict[str, int]
+
+
+class RegistryFootprint(NamedTuple):
+    """Represents the bytes taken by the teams of a TeamRegistry"""
+
+    resident_bytes: int
+    spilled_bytes: int
+    resident_team_count: int
+    mean_resident_bytes: float
+    max_resident_bytes: int
+    teams: dict[str, Footprint]
+
+
+def deep_sizeof(obj: Any, seen: set[int] | None = None) -> int:
+    """Returns the bytes of (obj) and of every object it references, counting
+    each object once.
+
+    Objects shared by the whole interpreter, like None, booleans and small
+    integers, are not counted, and neither are types, modules and functions.
+
+    Args:
+        obj (Any): The object.
+        seen (set[int] | None, optional):
+            The ids of the objects that were already counted, it is updated in
+            place so that shared objects are counted once across several calls.
+            Defaults to None.
+
+    Returns:
+        int: The number of bytes.
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if (
+            item is None
+            or isinstance(item, (bool, *_SKIPPED_TYPES))
+            or (isinstance(item, int) and -5 <= item <= 256)
+            or id(item) in seen
+        ):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, _ATOMIC_TYPES):
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        else:
+            if hasattr(item, "__dict__"):
+                stack.append(vars(item))
+            for cls in type(item).__mro__:
+                for name in getattr(cls, "__slots__", ()):
+                    if hasattr(item, name):
+                        stack.append(getattr(item, name))
+    return size
+
+
+def context_footprint(context: Context) -> Footprint:
+    """Returns the footprint of (context), broken down by item.
+
+    Args:
+        context (Context): The context.
+
+    Returns:
+        Footprint: The total includes the context dict itself.
+    """
+    seen: set[int] = set()
+    total = deep_sizeof(context, seen.copy())
+    breakdown = {
+        key: deep_sizeof(value, seen)
+        for key, value in context.items()  # type: ignore[attr-defined]
+    }
+    return Footprint(total, breakdown)
+
+
+def manager_footprint(manager: RobotTaskManager) -> Footprint:
+    """Returns the footprint of (manager), broken down by attribute.
+
+    Observers, the retention policy and the decision log are not counted,
+    since they are not owned by the manager.
+
+    Args:
+        manager (RobotTaskManager): The manager.
+
+    Returns:
+        Footprint: The breakdown has an "other" item for the manager object
+        itself and its scalar attributes.
+    """
+    seen: set[int] = set()
+    breakdown: dict[str, int] = {}
+    other = sys.getsizeof(manager) + sys.getsizeof(vars(manager))
+    for name, value in vars(manager).items():
+        if name in _EXTERNAL_ATTRIBUTES:
+            continue
+        size = deep_sizeof(value, seen)
+        if isinstance(value, (dict, list, deque, ColdRecordStore)):
+            breakdown[name.lstrip("_")] = size
+        else:
+            other += size
+    breakdown["other"] = other
+    return Footprint(sum(breakdown.values()), breakdown)
+
+
+def registry_footprint(registry: TeamRegistry) -> RegistryFootprint:
+    """Returns the footprint of every resident team of (registry), and the
+    bytes of the snapshots of the spilled ones.
+
+    Args:
+        registry (TeamRegistry): The registry, whose LRU order is not changed.
+
+    Returns:
+        RegistryFootprint: The aggregate stats and the footprint of each resident team.
+    """
+    teams = {}
+    spilled_bytes = 0
+    for team in registry:
+        manager = registry.peek(team)
+        if manager is None:
+            spilled_bytes += registry.snapshot_size(team)
+        else:
+            teams[team] = manager_footprint(manager)
+    sizes = [footprint.total for footprint in teams.values()]
+    return RegistryFootprint(
+        sum(sizes),
+        spilled_bytes,
+        len(sizes),
+        sum(sizes) / len(sizes) if sizes else 0.0,
+        max(sizes, default=0),
+        teams,
+    )
+
+
+def _robot_records(robot_count: int, seed: int) -> dict[int, RobotRecord]:
+    rng = random.Random(seed)
+    robot_ids = rng.sample(range(10**6, 10**9), robot_count)
+    return {
+        robot_id: RobotRecord(
+            rng.randint(1, 10**4),
+            rng.randint(0, 10**6),
+            rng.randint(10**6, 10**7),
+        )
+        for robot_id in robot_ids
+    }
+
+
+def _cold_record_store(robot_records: dict[int, RobotRecord]) -> int:
+    store = ColdRecordStore()
+    for robot_id, robot_record in robot_records.items():
+        store[robot_id] = robot_record
+    return deep_sizeof(store)
+
+
+def _manager(robot_records: dict[int, RobotRecord]) -> int:
+    manager = RobotTaskManager(
+        {robot_id: 10**5 for robot_id in robot_records},
+        context={"robot_records": dict(robot_records)},
+    )
+    manager.manage(list(robot_records))
+    return manager_footprint(manager).total
+
+
+STORAGE_BACKENDS: dict[str, Callable[[dict[int, RobotRecord]], int]] = {
+    "robot_records": deep_sizeof,
+    "cold_record_store": _cold_record_store,
+    "json_snapshot": lambda robot_records: len(
+        json.dumps(
+            context_to_json_dict({"robot_records": robot_records}),
+            separators=(",", ":"),
+        )
+    ),
+    "manager": _manager,
+}
+
+
+def bytes_per_robot(
+    robot_count: int = MAX_UNIQUE_ROBOT_ID_COUNT - 1, seed: int = 0
+) -> dict[str, float]:
+    """Measures the bytes per robot of each storage backend of robot records.
+
+    Args:
+        robot_count (int, optional):
+            The number of robots. Defaults to MAX_UNIQUE_ROBOT_ID_COUNT - 1.
+        seed (int, optional): The random seed of the records. Defaults to 0.
+
+    Returns:
+        dict[str, float]: The bytes per robot, by backend name.
+    """
+    robot_records = _robot_records(robot_count, seed)
+    return {
+        name: measure(robot_records) / robot_count
+        for name, measure in STORAGE_BACKENDS.items()
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Prints the bytes per robot of each storage backend.
+
+    Args:
+        argv (Sequence[str] | None, optional):
+            The command-line arguments. Defaults to None, which means sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--robots", type=int, default=MAX_UNIQUE_ROBOT_ID_COUNT - 1
+    )
+    args = parser.parse_args(argv)
+    for name, size in bytes_per_robot(args.robots).items():
+        print(f"{name}: {size:.1f} bytes per robot")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
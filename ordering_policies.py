@@ -0,0 +1,198 @@
+"""Ordering policies that pick which available robot takes the next task.
+
+Each policy is a RobotObserver: once attached to a RobotTaskManager, it keeps
+its own priority structure up to date on every change, so selecting a robot
+does not sort the whole team.
+"""
+
+import heapq
+from abc import ABC, abstractmethod
+from bisect import bisect_right, insort
+from typing import Callable, Iterable
+
+from manage_robot_tasks import RobotRecord
+
+
+class OrderingPolicy(ABC):
+    """A policy that orders robots by a priority key, smallest first.
+
+    Priorities are kept in a heap with lazy deletion: an updated robot gets a
+    new heap entry, and entries that no longer match the current key of
+    their robot are discarded when they reach the top.
+    """
+
+    def __init__(self) -> None:
+        self._keys: dict[int, tuple] = {}
+        self._heap: list[tuple[tuple, int]] = []
+
+    @abstractmethod
+    def priority(
+        self, robot_id: int, robot_record: RobotRecord | None, limit: int
+    ) -> tuple:
+        """Returns the priority key of (robot_id), smaller keys are selected first.
+
+        Args:
+            robot_id (int): The robot ID.
+            robot_record (RobotRecord | None):
+                The record of the robot, or None if it was never assigned.
+            limit (int): The limit of the robot.
+
+        Returns:
+            tuple: The priority key.
+        """
+
+    def update(
+        self, robot_id: int, robot_record: RobotRecord | None, limit: int
+    ) -> None:
+        """Updates the priority of (robot_id), in O(log n)."""
+        key = self.priority(robot_id, robot_record, limit)
+        if self._keys.get(robot_id) != key:
+            self._keys[robot_id] = key
+            heapq.heappush(self._heap, (key, robot_id))
+            if len(self._heap) > 2 * len(self._keys) + 16:
+                self._heap = [
+                    (key, robot_id) for robot_id, key in self._keys.items()
+                ]
+                heapq.heapify(self._heap)
+
+    def remove(self, robot_id: int) -> None:
+        """Removes (robot_id) from the policy."""
+        self._keys.pop(robot_id, None)
+
+    def select(self, is_available: Callable[[int], bool]) -> int | None:
+        """Returns the robot with the smallest key among the available ones.
+
+        Unavailable robots at the top of the heap are skipped, so this takes
+        O((k + 1) log n), where k is the number of skipped robots.
+
+        Args:
+            is_available (Callable[[int], bool]): Whether a robot is available.
+
+        Returns:
+            int | None: The selected robot, or None if no robot is available.
+        """
+        skipped: list[tuple[tuple, int]] = []
+        selected = None
+        while self._heap:
+            key, robot_id = self._heap[0]
+            if self._keys.get(robot_id) != key:
+                heapq.heappop(self._heap)
+            elif is_available(robot_id):
+                selected = robot_id
+                break
+            else:
+                skipped.append(heapq.heappop(self._heap))
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return selected
+
+    def order(self, robot_ids: Iterable[int]) -> list[int]:
+        """Sorts (robot_ids), which must be known to the policy, by their keys."""
+        return sorted(robot_ids, key=lambda robot_id: self._keys[robot_id])
+
+
+class FirstAssignmentPolicy(OrderingPolicy):
+    """The order of manage_robot_tasks: by first_assignment_index,
+    followed by never-assigned robots in the order they became known."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._sequence = 0
+
+    def priority(
+        self, robot_id: int, robot_record: RobotRecord | None, limit: int
+    ) -> tuple:
+        if robot_record is not None:
+            return (0, robot_record.first_assignment_index)
+        previous_key = self._keys.get(robot_id)
+        if previous_key is not None and previous_key[0]:
+            return previous_key
+        self._sequence += 1
+        return (1, self._sequence)
+
+
+class LeastRecentlyUsedPolicy(OrderingPolicy):
+    """Prefers the robot whose last assignment is the oldest,
+    never-assigned robots first."""
+
+    def priority(
+        self, robot_id: int, robot_record: RobotRecord | None, limit: int
+    ) -> tuple:
+        return (
+            -1 if robot_record is None else robot_record.last_assignment_index,
+            robot_id,
+        )
+
+
+class LeastLoadedPolicy(OrderingPolicy):
+    """Prefers the robot with the lowest assignment_count / limit ratio,
+    and the least recently used one among equally loaded robots."""
+
+    def priority(
+        self, robot_id: int, robot_record: RobotRecord | None, limit: int
+    ) -> tuple:
+        if robot_record is None:
+            return (0.0, -1, robot_id)
+        return (
+            robot_record.assignment_count / limit,
+            robot_record.last_assignment_index,
+            robot_id,
+        )
+
+
+class RoundRobinPolicy(OrderingPolicy):
+    """Cycles through the robots in ascending ID order, starting after the
+    most recently assigned robot."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._robot_ids: list[int] = []
+        self._last_robot_id: int | None = None
+        self._last_assignment_index = -1
+
+    def priority(
+        self, robot_id: int, robot_record: RobotRecord | None, limit: int
+    ) -> tuple:
+        return (robot_id,)
+
+    def update(
+        self, robot_id: int, robot_record: RobotRecord | None, limit: int
+    ) -> None:
+        if robot_id not in self._keys:
+            insort(self._robot_ids, robot_id)
+            self._keys[robot_id] = (robot_id,)
+        if (
+            robot_record is not None
+            and robot_record.last_assignment_index
+            > self._last_assignment_index
+        ):
+            self._last_robot_id = robot_id
+            self._last_assignment_index = robot_record.last_assignment_index
+
+    def remove(self, robot_id: int) -> None:
+        if self._keys.pop(robot_id, None) is not None:
+            del self._robot_ids[
+                bisect_right(self._robot_ids, robot_id) - 1
+            ]
+
+    def _start(self) -> int:
+        """Returns the position of the robot after the most recently assigned one."""
+        if self._last_robot_id is None:
+            return 0
+        return bisect_right(self._robot_ids, self._last_robot_id)
+
+    def _rotation(self) -> list[int]:
+        start = self._start()
+        return self._robot_ids[start:] + self._robot_ids[:start]
+
+    def select(self, is_available: Callable[[int], bool]) -> int | None:
+        start = self._start()
+        for i in range(len(self._robot_ids)):
+            robot_id = self._robot_ids[(start + i) % len(self._robot_ids)]
+            if is_available(robot_id):
+                return robot_id
+        return None
+
+    def order(self, robot_ids: Iterable[int]) -> list[int]:
+        rank = {robot_id: i for i, robot_id in enumerate(self._rotation())}
+        return sorted(robot_ids, key=rank.__getitem__)
@@ -0,0 +1,183 @@
+"""Map-reduce replay of long assignment histories across processes."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from typing import Sequence
+
+from manage_robot_tasks import (
+    DEFAULT_COOLDOWN,
+    MAX_UNIQUE_ROBOT_ID_COUNT,
+    MAX_UNIQUE_ROBOT_ID_MESSAGE,
+    Context,
+    RobotRecord,
+    manage_robot_tasks,
+)
+
+
+def _total_assignment_count(context: Context) -> int:
+    """Returns the total assignment count of (context), as manage_robot_tasks reads it."""
+    return max(
+        sum(
+            RobotRecord(*robot_record).assignment_count
+            for robot_record in context.get("robot_records", {}).values()
+        ),
+        context.get("total_assignment_count", 0),
+    )
+
+
+def merge_contexts(left: Context, right: Context) -> Context:
+    """Combines the contexts of two consecutive segments of a history.
+
+    (right) must have been computed from an empty context, so its indices are
+    offset by the total assignment count of (left). The operation is
+    associative, so segments can be merged in any grouping.
+
+    Args:
+        left (Context): The context of the earlier segment.
+        right (Context): The context of the later segment.
+
+    Returns:
+        Context: The context of both segments, as if they were replayed serially.
+    """
+    offset = _total_assignment_count(left)
+    robot_records = {
+        robot_id: RobotRecord(*robot_record)
+        for robot_id, robot_record in left.get("robot_records", {}).items()
+    }
+    for robot_id, robot_record in right.get("robot_records", {}).items():
+        assignment_count, first_assignment_index, last_assignment_index = (
+            robot_record
+        )
+        if robot_id in robot_records:
+            left_record = robot_records[robot_id]
+            robot_records[robot_id] = RobotRecord(
+                left_record.assignment_count + assignment_count,
+                left_record.first_assignment_index,
+                offset + last_assignment_index,
+            )
+        else:
+            robot_records[robot_id] = RobotRecord(
+                assignment_count,
+                offset + first_assignment_index,
+                offset + last_assignment_index,
+            )
+
+    merged: Context = {
+        "robot_records": robot_records,
+        "total_assignment_count": offset + _total_assignment_count(right),
+    }
+    if "max_assignments" in left or "max_assignments" in right:
+        merged["max_assignments"] = left.get(
+            "max_assignments", {}
+        ) | right.get("max_assignments", {})
+    return merged
+
+
+def _replay_segment(segment: list) -> tuple[Context, set]:
+    """Replays (segment) from an empty context.
+
+    Args:
+        segment (list): The robot IDs of the segment.
+
+    Returns:
+        tuple[Context, set]:
+            The robot records and total assignment count of the segment,
+            and the set of its unique elements, including invalid ones.
+    """
+    context: Context = {}
+    manage_robot_tasks(segment, {}, context=context)
+    del context["max_assignments"]
+    return context, set(segment)
+
+
+def parallel_replay(  # pylint: disable=R0913,R0914
+    assignments: Sequence,
+    max_assignments: dict,
+    cooldown=DEFAULT_COOLDOWN,
+    *,
+    context: None | Context = None,
+    processes: int | None = None,
+    segment_count: int | None = None,
+) -> list[int]:
+    """Replays (assignments) in segments across processes, and reduces them
+    with merge_contexts. The result and the updated context are identical to
+    manage_robot_tasks(assignments, max_assignments, cooldown, context=context).
+
+    Args:
+        assignments (Sequence): A list of robot IDs representing tasks assigned over time.
+        max_assignments (dict):
+            A dictionary defining maximum allowable assignments per robot.
+        cooldown (optional): The cooldown. Defaults to DEFAULT_COOLDOWN.
+        context (None | Context, optional):
+            If provided, it is used and updated in place like in manage_robot_tasks.
+            Defaults to None.
+        processes (int | None, optional):
+            The number of worker processes, 1 replays the segments in this process.
+            Defaults to None, which means os.cpu_count().
+        segment_count (int | None, optional):
+            The number of segments. Defaults to None, which means (processes).
+
+    Raises:
+        ValueError: If the number of unique robot IDs reaches MAX_UNIQUE_ROBOT_ID_COUNT.
+
+    Returns:
+        list[int]: The robots that can take on tasks after the whole history.
+    """
+    processes = processes or os.cpu_count() or 1
+    segment_count = max(1, min(segment_count or processes, len(assignments)))
+    segment_size = -(-len(assignments) // segment_count) or 1
+    segments = [
+        list(assignments[start : start + segment_size])
+        for start in range(0, len(assignments), segment_size)
+    ]
+
+    if processes == 1:
+        summaries = list(map(_replay_segment, segments))
+    else:
+        with ProcessPoolExecutor(processes) as executor:
+            summaries = list(executor.map(_replay_segment, segments))
+
+    # Count the unique robot IDs the same way as manage_robot_tasks
+    unique_elements: set = set().union(*(elements for _, elements in summaries))
+    if context and "robot_records" in context:
+        prev_robot_records = context["robot_records"]
+        unique_robot_id_count = len(prev_robot_records) + len(
+            unique_elements - prev_robot_records.keys()
+        )
+    else:
+        unique_robot_id_count = len(unique_elements)
+    if unique_robot_id_count >= MAX_UNIQUE_ROBOT_ID_COUNT:
+        raise ValueError(MAX_UNIQUE_ROBOT_ID_MESSAGE)
+
+    initial_context: Context = {}
+    if context:
+        initial_context.update(context)
+    merged = reduce(
+        merge_contexts,
+        (segment_context for segment_context, _ in summaries),
+        initial_context,
+    )
+    if unique_robot_id_count >= MAX_UNIQUE_ROBOT_ID_COUNT - 1:
+        # Invalid elements make the count reach the point where extra robots
+        # cannot be assigned, but the final call below only counts the
+        # records, so the extra robots are filtered out here instead.
+        robot_records = merged["robot_records"]
+        max_assignments = {
+            robot_id: limit
+            for robot_id, limit in max_assignments.items()
+            if robot_id in robot_records
+        }
+        if "max_assignments" in merged:
+            merged["max_assignments"] = {
+                robot_id: limit
+                for robot_id, limit in merged["max_assignments"].items()
+                if robot_id in robot_records
+            }
+
+    result = manage_robot_tasks([], max_assignments, cooldown, context=merged)
+    if context is not None:
+        context["max_assignments"] = merged["max_assignments"]
+        context["robot_records"] = merged["robot_records"]
+        context["total_assignment_count"] = merged["total_assignment_count"]
+    return result
@@ -0,0 +1,401 @@
+"""Partitioned dispatch of teams across worker nodes.
+
+Teams are assigned to worker nodes by consistent hashing, and the
+coordinator talks to the nodes through a pluggable transport. Messages are
+JSON-compatible dicts, so that they can be sent over sockets as they are.
+"""
+
+import hashlib
+import heapq
+import json
+import socket
+import struct
+import threading
+from bisect import bisect
+from typing import Any, Callable, Iterable, Protocol, Sequence
+
+from context_io import context_from_json_dict, context_to_json_dict
+from robot_task_manager import RobotTaskManager
+
+
+DEFAULT_VIRTUAL_NODE_COUNT = 64
+
+_LENGTH_PREFIX = struct.Struct(">I")
+
+_REMOTE_ERRORS: dict[str, type[Exception]] = {
+    "KeyError": KeyError,
+    "TypeError": TypeError,
+    "ValueError": ValueError,
+}
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(key.encode(), digest_size=8).digest(), "big"
+    )
+
+
+class HashRing:
+    """A consistent hash ring that maps teams to nodes"""
+
+    def __init__(
+        self,
+        node_ids: Iterable[str] = (),
+        virtual_node_count: int = DEFAULT_VIRTUAL_NODE_COUNT,
+    ) -> None:
+        """
+        Args:
+            node_ids (Iterable[str], optional): The initial nodes. Defaults to ().
+            virtual_node_count (int, optional):
+                The number of points of each node on the ring.
+                Defaults to DEFAULT_VIRTUAL_NODE_COUNT.
+        """
+        self.virtual_node_count = virtual_node_count
+        self._points: list[tuple[int, str]] = []
+        for node_id in node_ids:
+            self.add(node_id)
+
+    @property
+    def node_ids(self) -> set[str]:
+        """The nodes on the ring."""
+        return {node_id for _, node_id in self._points}
+
+    def add(self, node_id: str) -> None:
+        """Adds (node_id) to the ring."""
+        if node_id in self.node_ids:
+            raise ValueError(f"Node {node_id!r} is already on the ring")
+        self._points.extend(
+            (_hash(f"{node_id}#{i}"), node_id)
+            for i in range(self.virtual_node_count)
+        )
+        self._points.sort()
+
+    def remove(self, node_id: str) -> None:
+        """Removes (node_id) from the ring."""
+        if node_id not in self.node_ids:
+            raise ValueError(f"Node {node_id!r} is not on the ring")
+        self._points = [point for point in self._points if point[1] != node_id]
+
+    def node_for(self, team: str) -> str:
+        """Returns the node that owns (team).
+
+        Raises:
+            LookupError: If the ring is empty.
+        """
+        if not self._points:
+            raise LookupError("The ring has no nodes")
+        i = bisect(self._points, (_hash(team), ""))
+        return self._points[i % len(self._points)][1]
+
+
+class WorkerNode:  # pylint: disable=R0903
+    """Holds the managers of the teams that are assigned to a node"""
+
+    def __init__(self) -> None:
+        self.managers: dict[str, RobotTaskManager] = {}
+        self._operations: dict[str, Callable[[dict[str, Any]], Any]] = {
+            "manage": self._op_manage,
+            "available": self._op_available,
+            "available_all": self._op_available_all,
+            "teams": self._op_teams,
+            "snapshot": self._op_snapshot,
+            "restore": self._op_restore,
+            "drop": self._op_drop,
+        }
+
+    def handle(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Handles a coordinator message.
+
+        Args:
+            message (dict[str, Any]): The message, its "op" item selects the operation.
+
+        Returns:
+            dict[str, Any]:
+                {"result": ...} on success, or {"error": ..., "message": ...}
+                if the message is malformed or the operation raised, so that
+                one bad message never stops the node from serving.
+        """
+        try:
+            operation = self._operations.get(message["op"])
+            if operation is None:
+                raise ValueError(f"Unknown operation {message['op']!r}")
+            return {"result": operation(message)}
+        except Exception as err:  # pylint: disable=W0718
+            return {"error": type(err).__name__, "message": str(err)}
+
+    def _op_manage(self, message: dict[str, Any]) -> list[int]:
+        team = message["team"]
+        if team not in self.managers:
+            self.managers[team] = RobotTaskManager()
+        return self.managers[team].manage(
+            message["assignments"],
+            dict(message.get("max_assignments", [])),
+            message.get("cooldown"),
+        )
+
+    def _op_available(self, message: dict[str, Any]) -> list[int]:
+        manager = self.managers.get(message["team"])
+        return manager.available(message.get("cooldown")) if manager else []
+
+    def _op_available_all(self, message: dict[str, Any]) -> list[list]:
+        entries = []
+        for team, manager in self.managers.items():
+            for robot_id in manager.available(message.get("cooldown")):
+                robot_record = manager.record(robot_id)
+                entries.append(
+                    [
+                        (
+                            robot_record.first_assignment_index
+                            if robot_record
+                            else None
+                        ),
+                        team,
+                        robot_id,
+                    ]
+                )
+        entries.sort(key=_global_order)
+        return entries
+
+    def _op_teams(self, _message: dict[str, Any]) -> list[str]:
+        return list(self.managers)
+
+    def _op_snapshot(self, message: dict[str, Any]) -> str:
+        return json.dumps(
+            context_to_json_dict(self.managers[message["team"]].context),
+            separators=(",", ":"),
+        )
+
+    def _op_restore(self, message: dict[str, Any]) -> None:
+        self.managers[message["team"]] = RobotTaskManager(
+            context=context_from_json_dict(json.loads(message["snapshot"]))
+        )
+
+    def _op_drop(self, message: dict[str, Any]) -> None:
+        del self.managers[message["team"]]
+
+
+def _global_order(entry: Sequence) -> tuple[bool, int]:
+    """Orders robots by first_assignment_index, with never-assigned ones last."""
+    return (entry[0] is None, entry[0] or 0)
+
+
+class Transport(Protocol):  # pylint: disable=R0903
+    """Sends coordinator messages to worker nodes"""
+
+    def request(
+        self, node_id: str, message: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Sends (message) to (node_id) and returns its reply."""
+
+
+class InProcessTransport:
+    """A transport that calls the worker nodes directly"""
+
+    def __init__(self) -> None:
+        self.nodes: dict[str, WorkerNode] = {}
+
+    def add_node(self, node_id: str, node: WorkerNode) -> None:
+        """Makes (node) reachable as (node_id)."""
+        self.nodes[node_id] = node
+
+    def request(
+        self, node_id: str, message: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Sends (message) to (node_id) and returns its reply."""
+        return self.nodes[node_id].handle(message)
+
+
+def _send_message(sock: socket.socket, message: Any) -> None:
+    data = json.dumps(message, separators=(",", ":")).encode()
+    sock.sendall(_LENGTH_PREFIX.pack(len(data)) + data)
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> bytes | None:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+
+def _receive_message(sock: socket.socket) -> Any:
+    header = _receive_exactly(sock, _LENGTH_PREFIX.size)
+    if header is None:
+        return None
+    data = _receive_exactly(sock, _LENGTH_PREFIX.unpack(header)[0])
+    return None if data is None else json.loads(data)
+
+
+def serve_node(node: WorkerNode, sock: socket.socket) -> None:
+    """Serves length-prefixed JSON messages for (node) until (sock) is closed.
+
+    Args:
+        node (WorkerNode): The node that handles the messages.
+        sock (socket.socket): A connected socket.
+    """
+    with sock:
+        while (message := _receive_message(sock)) is not None:
+            _send_message(sock, node.handle(message))
+
+
+class SocketTransport:
+    """A transport that serves each worker node on its own thread and talks
+    to it through a local socket pair, as a stand-in for remote nodes.
+    """
+
+    def __init__(self) -> None:
+        self._sockets: dict[str, socket.socket] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._threads: list[threading.Thread] = []
+
+    def add_node(self, node_id: str, node: WorkerNode) -> None:
+        """Starts serving (node) as (node_id)."""
+        client_socket, server_socket = socket.socketpair()
+        thread = threading.Thread(
+            target=serve_node, args=(node, server_socket), daemon=True
+        )
+        thread.start()
+        self._sockets[node_id] = client_socket
+        self._locks[node_id] = threading.Lock()
+        self._threads.append(thread)
+
+    def request(
+        self, node_id: str, message: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Sends (message) to (node_id) and returns its reply."""
+        with self._locks[node_id]:
+            _send_message(self._sockets[node_id], message)
+            reply = _receive_message(self._sockets[node_id])
+        if reply is None:
+            raise ConnectionError(f"Node {node_id!r} closed the connection")
+        return reply
+
+    def close(self) -> None:
+        """Stops serving all the nodes."""
+        for client_socket in self._sockets.values():
+            client_socket.close()
+        for thread in self._threads:
+            thread.join()
+        self._sockets.clear()
+        self._locks.clear()
+        self._threads.clear()
+
+
+class PartitionedDispatcher:
+    """Routes the calls of each team to the worker node that owns it"""
+
+    def __init__(
+        self,
+        transport: Transport,
+        node_ids: Iterable[str],
+        virtual_node_count: int = DEFAULT_VIRTUAL_NODE_COUNT,
+    ) -> None:
+        """
+        Args:
+            transport (Transport): The transport to the worker nodes.
+            node_ids (Iterable[str]): The nodes, they must be reachable through (transport).
+            virtual_node_count (int, optional):
+                Passed to HashRing. Defaults to DEFAULT_VIRTUAL_NODE_COUNT.
+        """
+        self.transport = transport
+        self.ring = HashRing(node_ids, virtual_node_count)
+
+    def _request(self, node_id: str, message: dict[str, Any]) -> Any:
+        reply = self.transport.request(node_id, message)
+        if "error" in reply:
+            raise _REMOTE_ERRORS.get(reply["error"], RuntimeError)(
+                reply["message"]
+            )
+        return reply["result"]
+
+    def manage(
+        self,
+        team: str,
+        assignments: Sequence,
+        max_assignments: dict | None = None,
+        cooldown=None,
+    ) -> list[int]:
+        """Calls RobotTaskManager.manage for (team) on the node that owns it.
+
+        Args:
+            team (str): The team.
+            assignments (Sequence): A list of robot IDs representing new tasks.
+            max_assignments (dict | None, optional):
+                Maximum allowable assignments to merge over the current ones.
+                Defaults to None.
+            cooldown (optional): The cooldown. Defaults to None.
+
+        Returns:
+            list[int]: The robots of (team) that can take on tasks.
+        """
+        return self._request(
+            self.ring.node_for(team),
+            {
+                "op": "manage",
+                "team": team,
+                "assignments": list(assignments),
+                "max_assignments": list((max_assignments or {}).items()),
+                "cooldown": cooldown,
+            },
+        )
+
+    def available(self, team: str, cooldown=None) -> list[int]:
+        """Returns the robots of (team) that can take on tasks."""
+        return self._request(
+            self.ring.node_for(team),
+            {"op": "available", "team": team, "cooldown": cooldown},
+        )
+
+    def global_available(self, cooldown=None) -> list[tuple[str, int]]:
+        """Returns the available robots of all the teams on all the nodes.
+
+        The results of the nodes are merged, ordered by first_assignment_index,
+        and robots that were never assigned are placed last.
+
+        Args:
+            cooldown (optional): The cooldown. Defaults to None.
+
+        Returns:
+            list[tuple[str, int]]: The (team, robot_id) pairs.
+        """
+        node_entries = [
+            self._request(
+                node_id, {"op": "available_all", "cooldown": cooldown}
+            )
+            for node_id in sorted(self.ring.node_ids)
+        ]
+        return [
+            (team, robot_id)
+            for _, team, robot_id in heapq.merge(
+                *node_entries, key=_global_order
+            )
+        ]
+
+    def _rebalance(self, node_ids: Iterable[str]) -> None:
+        """Migrates the teams on (node_ids) whose owner changed, using snapshots."""
+        for node_id in node_ids:
+            for team in self._request(node_id, {"op": "teams"}):
+                owner = self.ring.node_for(team)
+                if owner != node_id:
+                    snapshot = self._request(
+                        node_id, {"op": "snapshot", "team": team}
+                    )
+                    self._request(
+                        owner,
+                        {"op": "restore", "team": team, "snapshot": snapshot},
+                    )
+                    self._request(node_id, {"op": "drop", "team": team})
+
+    def add_node(self, node_id: str) -> None:
+        """Adds (node_id), which must be reachable through the transport,
+        and migrates the teams it now owns to it."""
+        current_node_ids = self.ring.node_ids
+        self.ring.add(node_id)
+        self._rebalance(current_node_ids)
+
+    def remove_node(self, node_id: str) -> None:
+        """Migrates the teams of (node_id) to the other nodes and removes it."""
+        self.ring.remove(node_id)
+        self._rebalance([node_id])
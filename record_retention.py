@@ -0,0 +1,94 @@
+"""Retention of robot records that are no longer on the hot path."""
+
+from array import array
+from typing import Iterator, MutableMapping, NamedTuple
+
+from manage_robot_tasks import RobotRecord
+from utils import is_positive_int
+
+
+class RetentionPolicy(NamedTuple):
+    """Describes which robot records a RobotTaskManager moves to its cold tier.
+
+    - evict_exhausted: Whether the records of robots that have no valid limit,
+        including exhausted robots, are moved to the cold tier.
+    - idle_threshold: If set, the records of robots that were not assigned in
+        the last (idle_threshold) assignments are moved to the cold tier too.
+        It must be a non-negative integer.
+    """
+
+    evict_exhausted: bool = True
+    idle_threshold: int | None = None
+
+    def validate(self) -> None:
+        """Checks the policy before it is used by a RobotTaskManager.
+
+        Raises:
+            ValueError: If (idle_threshold) is neither None nor a non-negative integer.
+        """
+        if self.idle_threshold is not None and not is_positive_int(
+            self.idle_threshold
+        ):
+            raise ValueError(
+                "(idle_threshold) must be None or a non-negative integer"
+            )
+
+
+class ColdRecordStore(MutableMapping[int, RobotRecord]):
+    """A compact store of robot records.
+
+    Records are packed into a single array of 64-bit integers instead of
+    being kept as RobotRecord objects, and are unpacked on access.
+    """
+
+    def __init__(self) -> None:
+        self._robot_ids: list[int] = []
+        self._values = array("q")
+        self._slots: dict[int, int] = {}
+
+    def __getitem__(self, robot_id: int) -> RobotRecord:
+        start = 3 * self._slots[robot_id]
+        return RobotRecord(*self._values[start : start + 3])
+
+    def __contains__(self, robot_id: object) -> bool:
+        return robot_id in self._slots
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._robot_ids)
+
+    def __len__(self) -> int:
+        return len(self._robot_ids)
+
+    def __setitem__(self, robot_id: int, robot_record: RobotRecord) -> None:
+        if robot_id in self._slots:
+            start = 3 * self._slots[robot_id]
+            self._values[start : start + 3] = array("q", robot_record)
+        else:
+            self._slots[robot_id] = len(self._robot_ids)
+            self._robot_ids.append(robot_id)
+            self._values.extend(robot_record)
+
+    def __delitem__(self, robot_id: int) -> None:
+        if robot_id not in self._slots:
+            raise KeyError(robot_id)
+        self.pop(robot_id)
+
+    def pop(  # type: ignore[override]
+        self, key: int, default: RobotRecord | None = None
+    ) -> RobotRecord | None:
+        """Removes the record of robot (key) and returns it, or (default) if it is missing.
+
+        The last record is moved into the freed slot, so removal is O(1).
+        """
+        if key not in self._slots:
+            return default
+        robot_record = self[key]
+        slot = self._slots.pop(key)
+        last_robot_id = self._robot_ids.pop()
+        last_values = self._values[-3:]
+        del self._values[-3:]
+        if last_robot_id != key:
+            self._robot_ids[slot] = last_robot_id
+            self._values[3 * slot : 3 * slot + 3] = last_values
+            self._slots[last_robot_id] = slot
+        return robot_record
@@ -0,0 +1,107 @@
+"""Availability of robots as integer bitmasks over dense robot slots."""
+
+from typing import Iterable
+
+from robot_state_events import RobotState, StateTransition, StateWatcher
+from robot_task_manager import RobotTaskManager
+
+
+class RobotInterner:
+    """Maps sparse robot IDs to dense slots, so that a set of robots is an
+    integer whose bit (slot) is set for every robot of the set.
+
+    Teams that share an interner have comparable masks, so set operations
+    across teams are bitwise operations.
+    """
+
+    def __init__(self) -> None:
+        self._slots: dict[int, int] = {}
+        self._robot_ids: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._robot_ids)
+
+    def slot(self, robot_id: int) -> int:
+        """Returns the slot of (robot_id), assigning the next free one if needed."""
+        slot = self._slots.get(robot_id)
+        if slot is None:
+            slot = self._slots[robot_id] = len(self._robot_ids)
+            self._robot_ids.append(robot_id)
+        return slot
+
+    def robot_id(self, slot: int) -> int:
+        """Returns the robot ID of (slot)."""
+        return self._robot_ids[slot]
+
+    def mask(self, robot_ids: Iterable[int]) -> int:
+        """Returns the mask of (robot_ids)."""
+        mask = 0
+        for robot_id in robot_ids:
+            mask |= 1 << self.slot(robot_id)
+        return mask
+
+    def robot_ids(self, mask: int) -> list[int]:
+        """Returns the robots of (mask), in slot order."""
+        robot_ids = []
+        while mask:
+            lowest_bit = mask & -mask
+            robot_ids.append(self._robot_ids[lowest_bit.bit_length() - 1])
+            mask ^= lowest_bit
+        return robot_ids
+
+
+class TeamBitsets:
+    """Maintains the known, under limit and cooling robots of a team as
+    bitmasks, updated from the state transitions of its robots.
+
+    - known: The robots in a state other than RobotState.UNKNOWN.
+    - under_limit: The robots that are available or cooling.
+    - cooling: The robots in cooldown.
+    """
+
+    def __init__(
+        self,
+        manager: RobotTaskManager,
+        interner: RobotInterner | None = None,
+        cooldown=None,
+    ) -> None:
+        """
+        Args:
+            manager (RobotTaskManager): The manager of the team.
+            interner (RobotInterner | None, optional):
+                The interner, which can be shared by several teams.
+                Defaults to None, which means a new interner.
+            cooldown (optional):
+                The cooldown that defines the cooling robots.
+                Defaults to None, which means manager.cooldown.
+        """
+        self.interner = RobotInterner() if interner is None else interner
+        self.known = 0
+        self.under_limit = 0
+        self.cooling = 0
+        self.watcher = StateWatcher(manager, self._on_transition, cooldown)
+
+    def _on_transition(self, transition: StateTransition) -> None:
+        bit = 1 << self.interner.slot(transition.robot_id)
+        state = transition.current
+        if state is RobotState.UNKNOWN:
+            self.known &= ~bit
+        else:
+            self.known |= bit
+        if state in (RobotState.AVAILABLE, RobotState.COOLING):
+            self.under_limit |= bit
+        else:
+            self.under_limit &= ~bit
+        if state is RobotState.COOLING:
+            self.cooling |= bit
+        else:
+            self.cooling &= ~bit
+
+    @property
+    def available(self) -> int:
+        """The mask of the robots that can take on tasks."""
+        return self.under_limit & ~self.cooling
+
+    def available_robot_ids(self) -> list[int]:
+        """Returns the robots that can take on tasks, in slot order."""
+        return self.interner.robot_ids(self.available)
@@ -0,0 +1,179 @@
+"""Two-phase reservation of robots, for dispatchers that run concurrently."""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+from manage_robot_tasks import RobotRecord
+from ordering_policies import OrderingPolicy
+from robot_task_manager import RobotTaskManager
+
+
+DEFAULT_LEASE_SECONDS = 5.0
+
+
+class Lease(NamedTuple):
+    """Represents a reservation of a robot until (expires_at)"""
+
+    lease_id: int
+    robot_id: int
+    expires_at: float
+
+
+class RobotReservations:
+    """Hands out available robots with a lease, to be committed or aborted.
+
+    A reserved robot is hidden from other reservations and from
+    self.available, so dispatchers only hold the internal lock for the
+    duration of a reserve, commit or abort call, instead of across the whole
+    round trip from reading the available robots to recording an assignment.
+    The manager must only be changed through this object while it is shared
+    between threads.
+
+    Leases are reclaimed once they expire, which is checked lazily on every
+    reservation and whenever the manager records assignments, since it is an
+    AssignmentClockObserver. A lease is also reclaimed when its robot loses
+    its limit.
+    """
+
+    def __init__(
+        self,
+        manager: RobotTaskManager,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        policy: OrderingPolicy | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            manager (RobotTaskManager):
+                The manager of the team, the reservations attach themselves to it.
+            lease_seconds (float, optional):
+                How long a lease lasts. Defaults to DEFAULT_LEASE_SECONDS.
+            policy (OrderingPolicy | None, optional):
+                The policy that picks the reserved robot, it is attached to
+                (manager). Defaults to None, which means the first available robot.
+            clock (Callable[[], float], optional):
+                The clock of the leases. Defaults to time.monotonic.
+        """
+        if lease_seconds <= 0:
+            raise ValueError("(lease_seconds) must be positive")
+        self.manager = manager
+        self.lease_seconds = lease_seconds
+        self.policy = policy
+        self.clock = clock
+        # Reentrant, since manage notifies this object while the lock is held
+        self._lock = threading.RLock()
+        self._lease_ids = itertools.count()
+        # Active leases by robot, ordered by expiry since the duration is fixed
+        self._leases: OrderedDict[int, Lease] = OrderedDict()
+        manager.attach(self)
+        if policy is not None:
+            manager.attach(policy)
+
+    @property
+    def reserved_robot_ids(self) -> set[int]:
+        """The robots that have an active lease."""
+        with self._lock:
+            self._reclaim()
+            return set(self._leases)
+
+    def _reclaim(self) -> None:
+        """Drops the expired leases, the lock must be held."""
+        now = self.clock()
+        leases = self._leases
+        while leases:
+            lease = next(iter(leases.values()))
+            if lease.expires_at > now:
+                break
+            del leases[lease.robot_id]
+
+    def update(
+        self, robot_id: int, robot_record: RobotRecord | None, limit: int
+    ) -> None:
+        """Does nothing, see RobotObserver."""
+
+    def remove(self, robot_id: int) -> None:
+        """Reclaims the lease of (robot_id), see RobotObserver."""
+        with self._lock:
+            self._leases.pop(robot_id, None)
+
+    def advance(self, _total_assignment_count: int) -> None:
+        """Reclaims the expired leases, see AssignmentClockObserver.
+
+        Leases expire by (clock), not by assignments, so the new assignments
+        are only an opportunity to reclaim them early.
+        """
+        with self._lock:
+            self._reclaim()
+
+    def available(self, cooldown=None) -> list[int]:
+        """Returns manager.available(cooldown) without the reserved robots."""
+        with self._lock:
+            self._reclaim()
+            return [
+                robot_id
+                for robot_id in self.manager.available(cooldown)
+                if robot_id not in self._leases
+            ]
+
+    def reserve(self, cooldown=None) -> Lease | None:
+        """Reserves an available robot that is not reserved yet.
+
+        Args:
+            cooldown (optional): The cooldown. Defaults to None, which means manager.cooldown.
+
+        Returns:
+            Lease | None: The lease, or None if no robot can be reserved.
+        """
+        with self._lock:
+            self._reclaim()
+            leases = self._leases
+            if self.policy is not None:
+                robot_id = self.policy.select(
+                    lambda robot_id: robot_id not in leases
+                    and self.manager.is_available(robot_id, cooldown)
+                )
+            else:
+                robot_id = next(
+                    (
+                        robot_id
+                        for robot_id in self.manager.available(cooldown)
+                        if robot_id not in leases
+                    ),
+                    None,
+                )
+            if robot_id is None:
+                return None
+            lease = Lease(
+                next(self._lease_ids),
+                robot_id,
+                self.clock() + self.lease_seconds,
+            )
+            leases[robot_id] = lease
+            return lease
+
+    def commit(self, lease: Lease, cooldown=None) -> bool:
+        """Records the assignment of the robot of (lease), and ends the lease.
+
+        Args:
+            lease (Lease): A lease returned by self.reserve.
+            cooldown (optional): The cooldown. Defaults to None, which means manager.cooldown.
+
+        Returns:
+            bool: False if the lease expired or was reclaimed, in which case nothing is recorded.
+        """
+        with self._lock:
+            self._reclaim()
+            if self._leases.get(lease.robot_id) != lease:
+                return False
+            del self._leases[lease.robot_id]
+            self.manager.manage([lease.robot_id], cooldown=cooldown)
+            return True
+
+    def abort(self, lease: Lease) -> None:
+        """Ends (lease) without recording anything."""
+        with self._lock:
+            if self._leases.get(lease.robot_id) == lease:
+                del self._leases[lease.robot_id]
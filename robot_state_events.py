@@ -0,0 +1,153 @@
+"""Events fired when robots move between availability states."""
+
+from collections import OrderedDict
+from enum import Enum
+from typing import Callable, NamedTuple
+
+from manage_robot_tasks import DEFAULT_COOLDOWN, RobotRecord
+from robot_task_manager import RobotTaskManager
+from utils import is_positive_int
+
+
+class RobotState(Enum):
+    """The availability state of a robot.
+
+    - AVAILABLE: The robot can take on a task.
+    - COOLING: The robot is under its limit, but in cooldown.
+    - EXHAUSTED: The robot reached its limit.
+    - UNKNOWN: The robot has no valid limit, or was never assigned and the
+        team cannot take on new robots.
+    """
+
+    AVAILABLE = "available"
+    COOLING = "cooling"
+    EXHAUSTED = "exhausted"
+    UNKNOWN = "unknown"
+
+
+class StateTransition(NamedTuple):
+    """Represents a change of the state of a robot"""
+
+    robot_id: int
+    previous: RobotState
+    current: RobotState
+    total_assignment_count: int
+
+
+class StateWatcher:
+    """Calls a callback on every state transition of the robots of a team.
+
+    It is a RobotObserver and an AssignmentClockObserver: robot changes are
+    classified as they are notified, and robots whose cooldown ends are
+    found from an index of cooling robots ordered by their last assignment.
+    A team that receives no assignments costs nothing.
+
+    To push transitions onto a queue, pass its put method as the callback.
+    """
+
+    def __init__(
+        self,
+        manager: RobotTaskManager,
+        callback: Callable[[StateTransition], object],
+        cooldown=None,
+    ) -> None:
+        """
+        Args:
+            manager (RobotTaskManager): The manager of the team, the watcher attaches itself to it.
+            callback (Callable[[StateTransition], object]):
+                Called with every transition, including the initial state of
+                the robots that have a limit.
+            cooldown (optional):
+                The cooldown that defines the COOLING state.
+                Defaults to None, which means manager.cooldown.
+        """
+        self.manager = manager
+        self.callback = callback
+        self.cooldown = cooldown
+        self._states: dict[int, RobotState] = {}
+        # Cooling robots, ordered by last_assignment_index
+        self._cooling: OrderedDict[int, int] = OrderedDict()
+        manager.attach(self)
+
+    def state(self, robot_id: int) -> RobotState:
+        """Returns the current state of (robot_id)."""
+        return self._states.get(robot_id, RobotState.UNKNOWN)
+
+    def _min_cooldown_index(self, total_assignment_count: int) -> int:
+        cooldown = (
+            self.manager.cooldown if self.cooldown is None else self.cooldown
+        )
+        return total_assignment_count - (
+            cooldown if is_positive_int(cooldown) else DEFAULT_COOLDOWN
+        )
+
+    def _transition(self, robot_id: int, state: RobotState) -> None:
+        previous = self._states.get(robot_id, RobotState.UNKNOWN)
+        if state is RobotState.UNKNOWN:
+            self._states.pop(robot_id, None)
+        else:
+            self._states[robot_id] = state
+        if state is not previous:
+            self.callback(
+                StateTransition(
+                    robot_id,
+                    previous,
+                    state,
+                    self.manager.total_assignment_count,
+                )
+            )
+
+    def update(
+        self, robot_id: int, robot_record: RobotRecord | None, limit: int
+    ) -> None:
+        """Classifies (robot_id) after a change, see RobotObserver."""
+        cooling = self._cooling
+        cooling.pop(robot_id, None)
+        if robot_record is None:
+            state = (
+                RobotState.AVAILABLE
+                if self.manager.is_available(robot_id)
+                else RobotState.UNKNOWN
+            )
+        elif robot_record.assignment_count >= limit:
+            state = RobotState.EXHAUSTED
+        elif robot_record.last_assignment_index < self._min_cooldown_index(
+            self.manager.total_assignment_count
+        ):
+            state = RobotState.AVAILABLE
+        else:
+            state = RobotState.COOLING
+            index = robot_record.last_assignment_index
+            if not cooling or next(reversed(cooling.values())) <= index:
+                cooling[robot_id] = index
+            else:
+                # Only limit changes and retractions get here, which are rare
+                cooling[robot_id] = index
+                self._cooling = OrderedDict(
+                    sorted(cooling.items(), key=lambda x: x[1])
+                )
+        self._transition(robot_id, state)
+
+    def remove(self, robot_id: int) -> None:
+        """Classifies (robot_id) once it lost its limit, see RobotObserver."""
+        self._cooling.pop(robot_id, None)
+        self._transition(
+            robot_id,
+            (
+                RobotState.EXHAUSTED
+                if self.manager.is_exhausted(robot_id)
+                else RobotState.UNKNOWN
+            ),
+        )
+
+    def advance(self, total_assignment_count: int) -> None:
+        """Fires the transitions of the robots whose cooldown ended,
+        see AssignmentClockObserver."""
+        min_cooldown_index = self._min_cooldown_index(total_assignment_count)
+        cooling = self._cooling
+        while cooling:
+            robot_id, index = next(iter(cooling.items()))
+            if index >= min_cooldown_index:
+                break
+            del cooling[robot_id]
+            self._transition(robot_id, RobotState.AVAILABLE)
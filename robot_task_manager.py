@@ -0,0 +1,669 @@
+"""Stateful manager that keeps the context of manage_robot_tasks in memory."""
+
+from bisect import bisect_left
+from collections import ChainMap, OrderedDict, deque
+from itertools import chain
+from typing import Iterable, Protocol, Sequence, runtime_checkable
+
+from compiled_limits import CompiledLimits
+from decision_log import (
+    DecisionLog,
+    DecisionRecord,
+    Exclusion,
+    ExclusionReason,
+)
+from manage_robot_tasks import (
+    DEFAULT_COOLDOWN,
+    MAX_UNIQUE_ROBOT_ID_COUNT,
+    MAX_UNIQUE_ROBOT_ID_MESSAGE,
+    Context,
+    RobotRecord,
+    record_assignments_per_item,
+)
+from ordering_policies import OrderingPolicy
+from record_retention import ColdRecordStore, RetentionPolicy
+from utils import count_unique_elements, is_positive_int
+
+
+DEFAULT_HISTORY_LIMIT = 16
+
+
+class RobotObserver(Protocol):
+    """Receives the changes of the robots of a RobotTaskManager"""
+
+    def update(
+        self, robot_id: int, robot_record: RobotRecord | None, limit: int
+    ) -> None:
+        """Called when the record or the limit of (robot_id) changes.
+        (robot_record) is None if the robot was never assigned."""
+
+    def remove(self, robot_id: int) -> None:
+        """Called when (robot_id) no longer has a valid limit."""
+
+
+@runtime_checkable
+class AssignmentClockObserver(Protocol):  # pylint: disable=R0903
+    """A RobotObserver that is also told when the total assignment count
+    grows, which is when cooldowns can end without any robot changing"""
+
+    def advance(self, total_assignment_count: int) -> None:
+        """Called after new assignments were recorded."""
+
+
+class RobotTaskManager:  # pylint: disable=R0902
+    """Manages robot limitations the same way as calling manage_robot_tasks
+    with the same context every time, without copying the context on every call.
+
+    Besides, the last (history_limit) assignment indices of every robot are
+    kept, so that recent assignments can be retracted.
+
+    A retracted assignment keeps its global index: (total_assignment_count) is
+    never decremented, and the retracted index is considered an invalid entry
+    that still counts towards the cooldown of the other robots.
+
+    If a retention policy is given, the records of robots that are not on the
+    hot path are moved to a compact cold tier, and are moved back as soon as
+    the robot is assigned, retracted or given a new limit.
+    """
+
+    def __init__(  # pylint: disable=R0913
+        self,
+        max_assignments: dict | CompiledLimits | None = None,
+        cooldown=DEFAULT_COOLDOWN,
+        *,
+        context: Context | None = None,
+        history_limit: int = DEFAULT_HISTORY_LIMIT,
+        retention: RetentionPolicy | None = None,
+        decision_log: DecisionLog | None = None,
+    ) -> None:
+        """
+        Args:
+            max_assignments (dict | CompiledLimits | None, optional):
+                The initial maximum allowable assignments per robot,
+                merged over the ones in (context). Defaults to None.
+            cooldown (optional):
+                The cooldown used when a call does not specify one.
+                Defaults to DEFAULT_COOLDOWN.
+            context (Context | None, optional):
+                A context returned by manage_robot_tasks to start from.
+                Its assignments cannot be retracted. Defaults to None.
+            history_limit (int, optional):
+                The number of recent assignments kept per robot for retraction.
+                Defaults to DEFAULT_HISTORY_LIMIT.
+            retention (RetentionPolicy | None, optional):
+                Which records are moved to the cold tier. Defaults to None,
+                which means all records are kept on the hot path.
+            decision_log (DecisionLog | None, optional):
+                Where the exclusions of sampled manage calls are recorded.
+                Defaults to None, which means they are not recorded.
+        """
+        if not is_positive_int(history_limit, nonzero=True):
+            raise ValueError("(history_limit) must be a positive integer")
+        if retention is not None:
+            retention.validate()
+        self.cooldown = cooldown
+        self.history_limit = history_limit
+        self.retention = retention
+        self.decision_log = decision_log
+        self.version = 0
+        self.limits_version = 0
+
+        context = context or {}
+        self._max_assignments: dict = dict(context.get("max_assignments", {}))
+        # Whether every entry of (self._max_assignments) is known to be valid
+        self._is_max_assignments_valid = not self._max_assignments
+        self._robot_records: dict[int, RobotRecord] = {
+            robot_id: (
+                robot_record
+                if isinstance(robot_record, RobotRecord)
+                else RobotRecord(*robot_record)
+            )
+            for robot_id, robot_record in context.get(
+                "robot_records", {}
+            ).items()
+        }
+        self._total_assignment_count = max(
+            sum(
+                robot_record.assignment_count
+                for robot_record in self._robot_records.values()
+            ),
+            context.get("total_assignment_count", 0),
+        )
+        self._assignment_history: dict[int, deque[int]] = {}
+        # Limits of the robots that were dropped from (self._max_assignments)
+        # because they were exhausted, in case a retraction frees them again.
+        self._exhausted_limits: dict[int, int] = {}
+        self._cold_records = ColdRecordStore()
+        # Hot robots ordered by their last assignment, to find idle ones
+        self._recency: OrderedDict[int, None] | None = None
+        self._observers: list[RobotObserver] = []
+        self._clock_observers: list[AssignmentClockObserver] = []
+        if max_assignments:
+            self._merge_max_assignments(max_assignments)
+        if retention is not None:
+            if retention.idle_threshold is not None:
+                self._recency = OrderedDict.fromkeys(
+                    sorted(
+                        self._robot_records,
+                        key=lambda robot_id: self._robot_records[
+                            robot_id
+                        ].last_assignment_index,
+                    )
+                )
+            self._apply_retention(list(self._robot_records))
+
+    @property
+    def total_assignment_count(self) -> int:
+        """The total number of assignments so far, including retracted ones."""
+        return self._total_assignment_count
+
+    @property
+    def context(self) -> Context:
+        """A copy of the current state, as a manage_robot_tasks context."""
+        return {
+            "max_assignments": dict(self._max_assignments),
+            "robot_records": (
+                dict(self._robot_records) | dict(self._cold_records)
+            ),
+            "total_assignment_count": self._total_assignment_count,
+        }
+
+    @property
+    def cold_robot_ids(self) -> set[int]:
+        """The robots whose records are in the cold tier."""
+        return set(self._cold_records)
+
+    def record(self, robot_id: int) -> RobotRecord | None:
+        """Returns the record of (robot_id), or None if it was never assigned."""
+        robot_record = self._robot_records.get(robot_id)
+        if robot_record is None and self._cold_records:
+            robot_record = self._cold_records.get(robot_id)
+        return robot_record
+
+    def limit(self, robot_id: int) -> int | None:
+        """Returns the limit of (robot_id), or None if it has no valid limit."""
+        limit = self._max_assignments.get(robot_id)
+        if limit is None or self._is_max_assignments_valid:
+            return limit
+        return (
+            limit
+            if is_positive_int(robot_id)
+            and is_positive_int(limit, nonzero=True)
+            else None
+        )
+
+    def attach(self, observer: RobotObserver) -> None:
+        """Sends the state of every robot with a valid limit to (observer),
+        and then keeps sending it the changes.
+
+        If (observer) is an AssignmentClockObserver, it is also told when
+        the total assignment count grows.
+
+        Args:
+            observer (RobotObserver): The observer.
+        """
+        self._observers.append(observer)
+        if isinstance(observer, AssignmentClockObserver):
+            self._clock_observers.append(observer)
+        for robot_id in self._max_assignments:
+            limit = self.limit(robot_id)
+            if limit is not None:
+                observer.update(robot_id, self.record(robot_id), limit)
+
+    def detach(self, observer: RobotObserver) -> None:
+        """Stops sending changes to (observer)."""
+        self._observers.remove(observer)
+        if (
+            isinstance(observer, AssignmentClockObserver)
+            and observer in self._clock_observers
+        ):
+            self._clock_observers.remove(observer)
+
+    def _notify(self, robot_ids: Iterable) -> None:
+        """Sends the current state of (robot_ids) to the observers."""
+        for robot_id in robot_ids:
+            limit = self.limit(robot_id)
+            robot_record = self.record(robot_id)
+            for observer in self._observers:
+                if limit is None:
+                    observer.remove(robot_id)
+                else:
+                    observer.update(robot_id, robot_record, limit)
+
+    def _on_record(self, robot_id: int, actual_index: int) -> None:
+        """Keeps the history and the recency of an assignment recorded by manage."""
+        assignment_history = self._assignment_history.get(robot_id)
+        if assignment_history is None:
+            assignment_history = self._assignment_history[robot_id] = deque(
+                maxlen=self.history_limit
+            )
+        assignment_history.append(actual_index)
+        if self._recency is not None:
+            self._recency[robot_id] = None
+            self._recency.move_to_end(robot_id)
+
+    def _rehydrate(self, robot_id: int) -> RobotRecord | None:
+        """Moves the record of (robot_id) back from the cold tier, if it is there."""
+        robot_record = self._cold_records.pop(robot_id)
+        if robot_record is not None:
+            self._robot_records[robot_id] = robot_record
+            if self._recency is not None:
+                self._recency[robot_id] = None
+        return robot_record
+
+    def _apply_retention(self, robot_ids: Iterable[int]) -> None:
+        """Moves records to the cold tier according to the retention policy.
+
+        Args:
+            robot_ids (Iterable[int]):
+                The robots whose records or limits may have changed.
+        """
+        if self.retention is None:
+            return
+        cold_robot_ids: list[int] = []
+        if self.retention.evict_exhausted:
+            cold_robot_ids.extend(
+                robot_id
+                for robot_id in robot_ids
+                if robot_id in self._robot_records
+                and robot_id not in self._max_assignments
+            )
+        idle_threshold = self.retention.idle_threshold
+        if self._recency is not None and idle_threshold is not None:
+            min_last_assignment_index = (
+                self._total_assignment_count - idle_threshold
+            )
+            for robot_id in self._recency:
+                if (
+                    self._robot_records[robot_id].last_assignment_index
+                    >= min_last_assignment_index
+                ):
+                    break
+                cold_robot_ids.append(robot_id)
+        for robot_id in cold_robot_ids:
+            if robot_id in self._robot_records:
+                self._cold_records[robot_id] = self._robot_records.pop(
+                    robot_id
+                )
+                if self._recency is not None:
+                    del self._recency[robot_id]
+
+    def _merge_max_assignments(
+        self, max_assignments: dict | CompiledLimits
+    ) -> list[int]:
+        """Merges (max_assignments) over the current ones.
+
+        Returns:
+            list[int]:
+                The valid stored keys whose limits were given. A key like 2.0
+                updates the limit of robot 2, but the stored key stays 2.
+        """
+        if isinstance(max_assignments, CompiledLimits):
+            self._max_assignments = max_assignments.merged_over(
+                self._max_assignments
+            )
+            self._is_max_assignments_valid = True
+        else:
+            self._max_assignments = self._max_assignments | max_assignments
+            self._is_max_assignments_valid = False
+        robot_ids = [
+            robot_id
+            for robot_id in self._max_assignments
+            if robot_id in max_assignments and is_positive_int(robot_id)
+        ]
+        for robot_id in robot_ids:
+            self._exhausted_limits.pop(robot_id, None)
+            if self._cold_records:
+                self._rehydrate(robot_id)
+        self.limits_version += 1
+        return robot_ids
+
+    def _evaluate(
+        self, unique_robot_id_count: int, cooldown, *, clean: bool
+    ) -> list[int]:
+        """Computes the available robots, as the second half of manage_robot_tasks.
+
+        Args:
+            unique_robot_id_count (int): The unique robot ID count of the call.
+            cooldown: The cooldown of the call, None means self.cooldown.
+            clean (bool):
+                If True, invalid and exhausted robots are dropped from the
+                maximum allowable assignments, like manage_robot_tasks does.
+
+        Returns:
+            list[int]: The available robots.
+        """
+        if cooldown is None:
+            cooldown = self.cooldown
+        min_cooldown_index = self._total_assignment_count - (
+            cooldown if is_positive_int(cooldown) else DEFAULT_COOLDOWN
+        )
+        can_assign_extra_robots = (
+            unique_robot_id_count < MAX_UNIQUE_ROBOT_ID_COUNT - 1
+        )
+        robot_records = self._robot_records
+        cold_records = self._cold_records
+        is_valid = self._is_max_assignments_valid
+        extra_robot_ids: list[int] = []
+        result: list[tuple[int, int]] = []
+        clean_max_assignments: dict[int, int] = {}
+        for robot_id, limit in self._max_assignments.items():
+            if is_valid or (
+                is_positive_int(robot_id)
+                and is_positive_int(limit, nonzero=True)
+            ):
+                robot_record = robot_records.get(robot_id)
+                if robot_record is None and cold_records:
+                    robot_record = cold_records.get(robot_id)
+                if robot_record is not None:
+                    if robot_record.assignment_count < limit:
+                        clean_max_assignments[robot_id] = limit
+                        if (
+                            robot_record.last_assignment_index
+                            < min_cooldown_index
+                        ):
+                            result.append(
+                                (robot_record.first_assignment_index, robot_id)
+                            )
+                    elif clean:
+                        self._exhausted_limits[robot_id] = limit
+                elif can_assign_extra_robots:
+                    extra_robot_ids.append(robot_id)
+                    clean_max_assignments[robot_id] = limit
+
+        result.sort()
+        if clean:
+            self._max_assignments = clean_max_assignments
+            self._is_max_assignments_valid = True
+        return [robot_id for _, robot_id in result] + extra_robot_ids
+
+    def _explain(
+        self, unique_robot_id_count: int, cooldown
+    ) -> DecisionRecord:
+        """Explains why robots with a limit would be excluded by _evaluate.
+
+        Args:
+            unique_robot_id_count (int): The unique robot ID count of the call.
+            cooldown: The cooldown of the call, None means self.cooldown.
+
+        Returns:
+            DecisionRecord: The exclusions.
+        """
+        if cooldown is None:
+            cooldown = self.cooldown
+        min_cooldown_index = self._total_assignment_count - (
+            cooldown if is_positive_int(cooldown) else DEFAULT_COOLDOWN
+        )
+        can_assign_extra_robots = (
+            unique_robot_id_count < MAX_UNIQUE_ROBOT_ID_COUNT - 1
+        )
+        exclusions: list[Exclusion] = []
+        for robot_id, limit in self._max_assignments.items():
+            if not (
+                self._is_max_assignments_valid
+                or (
+                    is_positive_int(robot_id)
+                    and is_positive_int(limit, nonzero=True)
+                )
+            ):
+                exclusions.append(
+                    Exclusion(
+                        robot_id, ExclusionReason.INVALID_LIMIT, limit, None
+                    )
+                )
+                continue
+            robot_record = self.record(robot_id)
+            if robot_record is None:
+                reason = (
+                    None
+                    if can_assign_extra_robots
+                    else ExclusionReason.EXTRA_REJECTED
+                )
+            elif robot_record.assignment_count >= limit:
+                reason = ExclusionReason.OVER_LIMIT
+            elif robot_record.last_assignment_index >= min_cooldown_index:
+                reason = ExclusionReason.COOLDOWN
+            else:
+                reason = None
+            if reason is not None:
+                exclusions.append(
+                    Exclusion(robot_id, reason, limit, robot_record)
+                )
+        return DecisionRecord(
+            self._total_assignment_count,
+            min_cooldown_index,
+            unique_robot_id_count,
+            tuple(exclusions),
+        )
+
+    def manage(  # pylint: disable=R0912,R0914
+        self,
+        assignments: Sequence,
+        max_assignments: dict | CompiledLimits | None = None,
+        cooldown=None,
+    ) -> list[int]:
+        """Records (assignments) and returns the robots that can take on tasks,
+        like manage_robot_tasks(assignments, max_assignments, cooldown, context=...).
+
+        Args:
+            assignments (Sequence): A list of robot IDs representing new tasks.
+            max_assignments (dict | CompiledLimits | None, optional):
+                Maximum allowable assignments to merge over the current ones.
+                Defaults to None.
+            cooldown (optional): The cooldown. Defaults to None, which means self.cooldown.
+
+        Raises:
+            ValueError: If the number of unique robot IDs would reach
+                MAX_UNIQUE_ROBOT_ID_COUNT, in which case nothing is changed.
+
+        Returns:
+            list[int]:
+                A filtered list of robots that still can take on tasks,
+                maintaining the order of their original assignments.
+        """
+        robot_records = self._robot_records
+        cold_records = self._cold_records
+        known_robot_count = len(robot_records) + len(cold_records)
+        unique_robot_id_count = known_robot_count + count_unique_elements(
+            assignments,
+            limit=MAX_UNIQUE_ROBOT_ID_COUNT - known_robot_count,
+            excluded=(
+                ChainMap(robot_records, cold_records)
+                if cold_records
+                else robot_records
+            ),
+        )
+        if unique_robot_id_count >= MAX_UNIQUE_ROBOT_ID_COUNT:
+            raise ValueError(MAX_UNIQUE_ROBOT_ID_MESSAGE)
+
+        limit_robot_ids = (
+            self._merge_max_assignments(max_assignments)
+            if max_assignments
+            else []
+        )
+
+        if cold_records:
+            for robot_id in filter(is_positive_int, assignments):
+                if robot_id in cold_records:
+                    self._rehydrate(robot_id)
+        record_assignments_per_item(
+            assignments,
+            robot_records,
+            self._total_assignment_count,
+            self._on_record,
+        )
+
+        if assignments:
+            self._total_assignment_count += len(assignments)
+            self.version += 1
+
+        decision_log = self.decision_log
+        if decision_log is not None and decision_log.sample():
+            decision_log.record(self._explain(unique_robot_id_count, cooldown))
+        previous_robot_ids = self._max_assignments.keys()
+        result = self._evaluate(unique_robot_id_count, cooldown, clean=True)
+        if self.retention is not None or self._observers:
+            # Only valid IDs are used, since invalid keys like 101.0 are
+            # equal to valid robot IDs and would alias their records. The
+            # order is kept, so that policies see new robots in the order
+            # they became known.
+            changed_robot_ids = dict.fromkeys(
+                chain(filter(is_positive_int, assignments), limit_robot_ids)
+            )
+            if self._observers:
+                self._notify(
+                    chain(
+                        changed_robot_ids,
+                        filter(
+                            is_positive_int,
+                            previous_robot_ids
+                            - self._max_assignments.keys()
+                            - changed_robot_ids.keys(),
+                        ),
+                    )
+                )
+            self._apply_retention(changed_robot_ids)
+        if assignments:
+            for clock_observer in self._clock_observers:
+                clock_observer.advance(self._total_assignment_count)
+        return result
+
+    def available(self, cooldown=None) -> list[int]:
+        """Returns the robots that can take on tasks without changing any state,
+        which is the same result as self.manage([], cooldown=cooldown).
+
+        Args:
+            cooldown (optional): The cooldown. Defaults to None, which means self.cooldown.
+
+        Returns:
+            list[int]: The available robots.
+        """
+        return self._evaluate(
+            len(self._robot_records) + len(self._cold_records),
+            cooldown,
+            clean=False,
+        )
+
+    def is_exhausted(self, robot_id: int) -> bool:
+        """Returns whether (robot_id) was dropped from the maximum allowable
+        assignments because it reached its limit."""
+        return robot_id in self._exhausted_limits
+
+    def is_available(self, robot_id: int, cooldown=None) -> bool:
+        """Returns whether (robot_id) would be in the result of self.available(cooldown).
+
+        Args:
+            robot_id (int): The robot ID.
+            cooldown (optional): The cooldown. Defaults to None, which means self.cooldown.
+
+        Returns:
+            bool: True if the robot can take on a task.
+        """
+        limit = self.limit(robot_id)
+        if limit is None:
+            return False
+        robot_record = self.record(robot_id)
+        if robot_record is None:
+            return (
+                len(self._robot_records) + len(self._cold_records)
+                < MAX_UNIQUE_ROBOT_ID_COUNT - 1
+            )
+        if cooldown is None:
+            cooldown = self.cooldown
+        return (
+            robot_record.assignment_count < limit
+            and robot_record.last_assignment_index
+            < self._total_assignment_count
+            - (cooldown if is_positive_int(cooldown) else DEFAULT_COOLDOWN)
+        )
+
+    def select(self, policy: OrderingPolicy, cooldown=None) -> int | None:
+        """Returns the available robot that (policy) prefers.
+
+        Args:
+            policy (OrderingPolicy): A policy that is attached to this manager.
+            cooldown (optional): The cooldown. Defaults to None, which means self.cooldown.
+
+        Returns:
+            int | None: The selected robot, or None if no robot is available.
+        """
+        return policy.select(
+            lambda robot_id: self.is_available(robot_id, cooldown)
+        )
+
+    def retract(self, robot_id: int, index: int | None = None) -> int:
+        """Retracts an assignment of (robot_id), restoring its record exactly.
+
+        The assignment count, first and last assignment indices are restored
+        from the retained history: the assignment is found by binary search,
+        and removing it from the history takes O(history_limit). The retracted
+        index stays counted in (total_assignment_count), as an invalid entry.
+
+        Args:
+            robot_id (int): The robot whose assignment is retracted.
+            index (int | None, optional):
+                The global index of the assignment to retract.
+                Defaults to None, which means the most recent assignment of the robot.
+
+        Raises:
+            ValueError: If the assignment is not in the retained history, or
+                if the record cannot be restored because the previous
+                assignment of the robot was not retained.
+
+        Returns:
+            int: The global index of the retracted assignment.
+        """
+        assignment_history = self._assignment_history.get(robot_id)
+        if not assignment_history:
+            raise ValueError(
+                f"Robot {robot_id!r} has no retractable assignments"
+            )
+        if index is None:
+            position = len(assignment_history) - 1
+        else:
+            position = bisect_left(assignment_history, index)
+            if (
+                position == len(assignment_history)
+                or assignment_history[position] != index
+            ):
+                raise ValueError(
+                    f"Assignment {index!r} of robot {robot_id!r} is not retractable"
+                )
+        index = assignment_history[position]
+
+        if robot_id in self._cold_records:
+            self._rehydrate(robot_id)
+        robot_record = self._robot_records[robot_id]
+        assignment_count = robot_record.assignment_count - 1
+        if not assignment_count:
+            del self._robot_records[robot_id]
+            del self._assignment_history[robot_id]
+            if self._recency is not None:
+                del self._recency[robot_id]
+        else:
+            last_assignment_index = robot_record.last_assignment_index
+            if index == last_assignment_index:
+                if not position:
+                    raise ValueError(
+                        f"The assignment of robot {robot_id!r} before "
+                        f"{index} was not retained"
+                    )
+                last_assignment_index = assignment_history[position - 1]
+            first_assignment_index = (
+                assignment_history[position + 1]
+                if index == robot_record.first_assignment_index
+                else robot_record.first_assignment_index
+            )
+            del assignment_history[position]
+            self._robot_records[robot_id] = RobotRecord(
+                assignment_count, first_assignment_index, last_assignment_index
+            )
+
+        if assignment_count < self._exhausted_limits.get(robot_id, 0):
+            self._max_assignments[robot_id] = self._exhausted_limits.pop(
+                robot_id
+            )
+        self._notify([robot_id])
+        self._apply_retention([robot_id])
+        self.version += 1
+        return index
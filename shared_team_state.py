@@ -0,0 +1,365 @@
+"""Team state in shared memory, written by one process and read by many.
+
+The state is a fixed layout of 64-bit integers:
+    - A header: the sequence number, the total assignment count, the number
+        of robot records, the number of limits and the cooldown.
+    - MAX_UNIQUE_ROBOT_ID_COUNT robot records: (robot_id, assignment_count,
+        first_assignment_index, last_assignment_index).
+    - (max_limits) limits: (robot_id, limit), in the order of max_assignments.
+
+The sequence number is a seqlock: the writer makes it odd while it writes and
+even again once it is done, and readers retry until they copied the state
+between two reads of the same even sequence number.
+"""
+
+from array import array
+from itertools import chain
+from multiprocessing import shared_memory
+from typing import Final, Sequence
+
+from compiled_limits import CompiledLimits
+from manage_robot_tasks import (
+    DEFAULT_COOLDOWN,
+    MAX_UNIQUE_ROBOT_ID_COUNT,
+    RobotRecord,
+    manage_robot_tasks,
+)
+from robot_task_manager import RobotTaskManager
+from utils import is_positive_int
+
+
+DEFAULT_MAX_LIMITS = 1024
+
+_ITEM_FORMAT: Final = "q"
+
+_ITEM_SIZE = 8
+
+_ITEM_MAX = 2**63 - 1
+
+_HEADER_SIZE = 8
+
+_SEQUENCE, _TOTAL_ASSIGNMENT_COUNT, _ROBOT_COUNT, _LIMIT_COUNT, _COOLDOWN = (
+    range(5)
+)
+
+_RECORD_SIZE = 4
+
+_LIMIT_SIZE = 2
+
+_RECORDS_START = _HEADER_SIZE
+
+_LIMITS_START = _RECORDS_START + _RECORD_SIZE * MAX_UNIQUE_ROBOT_ID_COUNT
+
+
+def _shared_memory_size(max_limits: int) -> int:
+    return _ITEM_SIZE * (_LIMITS_START + _LIMIT_SIZE * max_limits)
+
+
+def _cast_values(block: shared_memory.SharedMemory) -> memoryview:
+    """Returns the contents of (block) as 64-bit integers."""
+    buf = block.buf
+    if buf is None:
+        raise ValueError(f"The shared memory block {block.name!r} is closed")
+    return buf.cast(_ITEM_FORMAT)
+
+
+class SharedTeamWriter:
+    """Records assignments through a RobotTaskManager and publishes the
+    resulting state to shared memory after every change."""
+
+    def __init__(
+        self,
+        manager: RobotTaskManager | None = None,
+        max_limits: int = DEFAULT_MAX_LIMITS,
+        name: str | None = None,
+    ) -> None:
+        """
+        Args:
+            manager (RobotTaskManager | None, optional):
+                The manager of the team. Defaults to None, which means a new manager.
+            max_limits (int, optional):
+                The maximum number of limits that can be published.
+                Defaults to DEFAULT_MAX_LIMITS.
+            name (str | None, optional):
+                The name of the shared memory block. Defaults to None,
+                which means a unique name is generated.
+        """
+        self.manager = manager or RobotTaskManager()
+        self.max_limits = max_limits
+        self._shared_memory = shared_memory.SharedMemory(
+            name, create=True, size=_shared_memory_size(max_limits)
+        )
+        self._values = _cast_values(self._shared_memory)
+        try:
+            self.publish()
+        except ValueError:
+            self.close()
+            self.unlink()
+            raise
+
+    @property
+    def name(self) -> str:
+        """The name that readers use to attach to the shared memory block."""
+        return self._shared_memory.name
+
+    def __enter__(self) -> "SharedTeamWriter":
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
+        self.unlink()
+
+    def publish(self) -> None:
+        """Writes the current state of the manager to shared memory.
+
+        The state is encoded before the sequence number is touched, so if
+        encoding fails the previously published state stays readable.
+
+        Raises:
+            ValueError:
+                If the manager has more than (max_limits) valid limits,
+                or a value does not fit in a 64-bit integer.
+        """
+        manager = self.manager
+        context = manager.context
+        limits = [
+            (robot_id, limit)
+            for robot_id in context["max_assignments"]
+            if (limit := manager.limit(robot_id)) is not None
+        ]
+        if len(limits) > self.max_limits:
+            raise ValueError(
+                f"The team has more than {self.max_limits} limits"
+            )
+        try:
+            header = array(
+                _ITEM_FORMAT,
+                (
+                    context["total_assignment_count"],
+                    len(context["robot_records"]),
+                    len(limits),
+                    (
+                        manager.cooldown
+                        if is_positive_int(manager.cooldown)
+                        else DEFAULT_COOLDOWN
+                    ),
+                ),
+            )
+            records = array(
+                _ITEM_FORMAT,
+                chain.from_iterable(
+                    (robot_id, *robot_record)
+                    for robot_id, robot_record in context[
+                        "robot_records"
+                    ].items()
+                ),
+            )
+            limit_values = array(_ITEM_FORMAT, chain.from_iterable(limits))
+        except OverflowError as err:
+            raise ValueError(
+                "The team state has a value that does not fit in a 64-bit integer"
+            ) from err
+
+        values = self._values
+        values[_SEQUENCE] += 1
+        values[_TOTAL_ASSIGNMENT_COUNT : _COOLDOWN + 1] = header
+        values[_RECORDS_START : _RECORDS_START + len(records)] = records
+        values[_LIMITS_START : _LIMITS_START + len(limit_values)] = (
+            limit_values
+        )
+        values[_SEQUENCE] += 1
+
+    def _limit_count(self) -> int:
+        """Returns the number of valid limits of the manager."""
+        manager = self.manager
+        return sum(
+            manager.limit(robot_id) is not None
+            for robot_id in manager.context["max_assignments"]
+        )
+
+    def _check_manage(
+        self,
+        assignments: Sequence,
+        max_assignments: dict | CompiledLimits | None,
+    ) -> None:
+        """Checks that the state after manager.manage can be published,
+        so that a rejected call leaves the manager unchanged.
+
+        Raises:
+            ValueError:
+                If a robot ID or a limit does not fit in a 64-bit integer,
+                or the team would have more than (max_limits) valid limits.
+        """
+        max_assignments = max_assignments or {}
+        if (
+            max(
+                filter(
+                    is_positive_int,
+                    chain(
+                        assignments,
+                        max_assignments,
+                        max_assignments.values(),
+                    ),
+                ),
+                default=0,
+            )
+            > _ITEM_MAX
+        ):
+            raise ValueError(
+                f"Robot IDs and limits must be at most {_ITEM_MAX} to be published"
+            )
+        new_robot_ids = [
+            robot_id
+            for robot_id, limit in max_assignments.items()
+            if is_positive_int(robot_id)
+            and is_positive_int(limit, nonzero=True)
+            and self.manager.limit(robot_id) is None
+        ]
+        if self._limit_count() + len(new_robot_ids) <= self.max_limits:
+            return
+        # The new limits may not all be kept, so compute the exact ones
+        context = self.manager.context
+        manage_robot_tasks(assignments, max_assignments, context=context)
+        if len(context["max_assignments"]) > self.max_limits:
+            raise ValueError(
+                f"The team would have more than {self.max_limits} limits"
+            )
+
+    def manage(
+        self,
+        assignments: Sequence,
+        max_assignments: dict | CompiledLimits | None = None,
+        cooldown=None,
+    ) -> list[int]:
+        """Calls manager.manage and publishes the new state.
+
+        Raises:
+            ValueError:
+                If manager.manage raises, or the new state could not be
+                published, in which case the manager is not changed.
+        """
+        self._check_manage(assignments, max_assignments)
+        result = self.manager.manage(assignments, max_assignments, cooldown)
+        self.publish()
+        return result
+
+    def retract(self, robot_id: int, index: int | None = None) -> int:
+        """Calls manager.retract and publishes the new state.
+
+        Raises:
+            ValueError:
+                If manager.retract raises, or the retraction could restore
+                the limit of an exhausted robot beyond (max_limits), in which
+                case the manager is not changed.
+        """
+        if (
+            self.manager.is_exhausted(robot_id)
+            and self._limit_count() >= self.max_limits
+        ):
+            raise ValueError(
+                f"The team would have more than {self.max_limits} limits"
+            )
+        index = self.manager.retract(robot_id, index)
+        self.publish()
+        return index
+
+    def close(self) -> None:
+        """Detaches from the shared memory block."""
+        self._values.release()
+        self._shared_memory.close()
+
+    def unlink(self) -> None:
+        """Destroys the shared memory block, once every process closed it."""
+        self._shared_memory.unlink()
+
+
+class SharedTeamReader:
+    """Computes the availability of a team from the shared memory written
+    by a SharedTeamWriter, without any IPC or deserialization."""
+
+    def __init__(self, name: str) -> None:
+        """
+        Args:
+            name (str): The name of the shared memory block of the writer.
+        """
+        self._shared_memory = shared_memory.SharedMemory(name)
+        self._values = _cast_values(self._shared_memory)
+
+    def __enter__(self) -> "SharedTeamReader":
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
+
+    def _read(self) -> tuple[int, list[int], list[int], list[int]]:
+        """Copies a consistent state out of shared memory.
+
+        Returns:
+            tuple[int, list[int], list[int], list[int]]:
+                The sequence number, the header, the records and the limits.
+        """
+        values = self._values
+        while True:
+            sequence = values[_SEQUENCE]
+            if sequence % 2:
+                continue
+            header = values[:_HEADER_SIZE].tolist()
+            records = values[
+                _RECORDS_START : _RECORDS_START
+                + _RECORD_SIZE * header[_ROBOT_COUNT]
+            ].tolist()
+            limits = values[
+                _LIMITS_START : _LIMITS_START
+                + _LIMIT_SIZE * header[_LIMIT_COUNT]
+            ].tolist()
+            if values[_SEQUENCE] == sequence:
+                return sequence, header, records, limits
+
+    @property
+    def version(self) -> int:
+        """The number of times the writer published its state."""
+        return self._values[_SEQUENCE] // 2
+
+    def available(self, cooldown=None) -> list[int]:
+        """Returns the robots that can take on tasks, like RobotTaskManager.available.
+
+        Args:
+            cooldown (optional):
+                The cooldown. Defaults to None, which means the cooldown of the writer's manager.
+
+        Returns:
+            list[int]: The available robots.
+        """
+        _, header, records, limits = self._read()
+        if cooldown is None:
+            cooldown = header[_COOLDOWN]
+        min_cooldown_index = header[_TOTAL_ASSIGNMENT_COUNT] - (
+            cooldown if is_positive_int(cooldown) else DEFAULT_COOLDOWN
+        )
+        can_assign_extra_robots = (
+            header[_ROBOT_COUNT] < MAX_UNIQUE_ROBOT_ID_COUNT - 1
+        )
+        robot_records = {
+            records[i]: RobotRecord(*records[i + 1 : i + _RECORD_SIZE])
+            for i in range(0, len(records), _RECORD_SIZE)
+        }
+        extra_robot_ids: list[int] = []
+        result: list[tuple[int, int]] = []
+        for i in range(0, len(limits), _LIMIT_SIZE):
+            robot_id, limit = limits[i], limits[i + 1]
+            robot_record = robot_records.get(robot_id)
+            if robot_record is None:
+                if can_assign_extra_robots:
+                    extra_robot_ids.append(robot_id)
+            elif (
+                robot_record.assignment_count < limit
+                and robot_record.last_assignment_index < min_cooldown_index
+            ):
+                result.append((robot_record.first_assignment_index, robot_id))
+        result.sort()
+        return [robot_id for _, robot_id in result] + extra_robot_ids
+
+    def close(self) -> None:
+        """Detaches from the shared memory block."""
+        self._values.release()
+        self._shared_memory.close()
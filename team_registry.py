@@ -0,0 +1,184 @@
+"""Registry of many teams that keeps the recently used ones in memory and
+spills the others to snapshots on disk."""
+
+import os
+import time
+from collections import OrderedDict
+from os import PathLike
+from typing import Callable, Iterator, NamedTuple, Sequence
+from urllib.parse import quote, unquote
+
+from compiled_limits import CompiledLimits
+from context_io import dump_context, load_context
+from manage_robot_tasks import Context
+from robot_task_manager import RobotTaskManager
+
+
+DEFAULT_MAX_RESIDENT = 256
+
+_SNAPSHOT_SUFFIX = ".json"
+
+
+class RegistryStats(NamedTuple):
+    """Represents the counters of a TeamRegistry"""
+
+    hits: int
+    misses: int
+    evictions: int
+    loads: int
+    load_seconds: float
+
+
+class TeamRegistry:  # pylint: disable=R0902
+    """Hosts the RobotTaskManager of many teams in one process.
+
+    At most (max_resident) teams are kept in memory. The least recently used
+    team is spilled to a compact JSON snapshot in (directory) when another
+    team needs room, and is loaded back transparently the next time it is
+    used. A team is either resident or spilled, never both.
+
+    Spilling keeps the context of a team, but not its retraction history.
+    """
+
+    def __init__(
+        self,
+        directory: str | PathLike[str],
+        max_resident: int = DEFAULT_MAX_RESIDENT,
+        manager_factory: Callable[[Context], RobotTaskManager] | None = None,
+    ) -> None:
+        """
+        Args:
+            directory (str | PathLike[str]):
+                The directory of the snapshots, it is created if needed.
+            max_resident (int, optional):
+                The maximum number of teams in memory. Defaults to DEFAULT_MAX_RESIDENT.
+            manager_factory (Callable[[Context], RobotTaskManager] | None, optional):
+                Creates the manager of a team from its context, which is empty
+                for a new team. Defaults to None, which means RobotTaskManager(context=context).
+        """
+        if not isinstance(max_resident, int) or max_resident <= 0:
+            raise ValueError("(max_resident) must be a positive integer")
+        self.directory = directory
+        self.max_resident = max_resident
+        self.manager_factory = manager_factory or (
+            lambda context: RobotTaskManager(context=context)
+        )
+        os.makedirs(directory, exist_ok=True)
+        self._resident: OrderedDict[str, RobotTaskManager] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._loads = 0
+        self._load_seconds = 0.0
+
+    @property
+    def stats(self) -> RegistryStats:
+        """The hit, miss, eviction and load counts, and the time spent loading."""
+        return RegistryStats(
+            self._hits,
+            self._misses,
+            self._evictions,
+            self._loads,
+            self._load_seconds,
+        )
+
+    @property
+    def resident_teams(self) -> list[str]:
+        """The teams in memory, least recently used first."""
+        return list(self._resident)
+
+    def _snapshot_path(self, team: str) -> str:
+        return os.path.join(
+            self.directory, quote(team, safe="") + _SNAPSHOT_SUFFIX
+        )
+
+    def __contains__(self, team: object) -> bool:
+        return isinstance(team, str) and (
+            team in self._resident
+            or os.path.exists(self._snapshot_path(team))
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over all the teams, resident ones first."""
+        yield from list(self._resident)
+        for file_name in sorted(os.listdir(self.directory)):
+            if file_name.endswith(_SNAPSHOT_SUFFIX):
+                yield unquote(file_name[: -len(_SNAPSHOT_SUFFIX)])
+
+    def peek(self, team: str) -> RobotTaskManager | None:
+        """Returns the manager of (team) if it is resident, without loading it
+        or changing the LRU order and the stats."""
+        return self._resident.get(team)
+
+    def snapshot_size(self, team: str) -> int:
+        """Returns the bytes of the snapshot of (team), or 0 if it is not spilled."""
+        path = self._snapshot_path(team)
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    def manager(self, team: str) -> RobotTaskManager:
+        """Returns the manager of (team), loading or creating it if needed.
+
+        Args:
+            team (str): The team.
+
+        Returns:
+            RobotTaskManager: The manager, which is now the most recently used one.
+        """
+        manager = self._resident.get(team)
+        if manager is not None:
+            self._hits += 1
+            self._resident.move_to_end(team)
+            return manager
+
+        self._misses += 1
+        path = self._snapshot_path(team)
+        context: Context = {}
+        is_spilled = os.path.exists(path)
+        if is_spilled:
+            start = time.perf_counter()
+            context = load_context(path)
+            self._load_seconds += time.perf_counter() - start
+            self._loads += 1
+        manager = self.manager_factory(context)
+        self._resident[team] = manager
+        # The snapshot is only removed once the manager is resident, so a
+        # failing factory never loses the state of the team.
+        if is_spilled:
+            os.remove(path)
+        while len(self._resident) > self.max_resident:
+            self.spill(next(iter(self._resident)))
+        return manager
+
+    def spill(self, team: str) -> None:
+        """Writes (team) to its snapshot and removes it from memory.
+
+        Args:
+            team (str): A resident team.
+
+        Raises:
+            KeyError: If (team) is not resident.
+        """
+        dump_context(self._resident[team].context, self._snapshot_path(team))
+        del self._resident[team]
+        self._evictions += 1
+
+    def spill_all(self) -> None:
+        """Spills every resident team, e.g. before shutting down."""
+        for team in list(self._resident):
+            self.spill(team)
+
+    def manage(
+        self,
+        team: str,
+        assignments: Sequence,
+        max_assignments: dict | CompiledLimits | None = None,
+        cooldown=None,
+    ) -> list[int]:
+        """Calls manage on the manager of (team), see RobotTaskManager.manage."""
+        return self.manager(team).manage(
+            assignments, max_assignments, cooldown
+        )
+
+    def available(self, team: str, cooldown=None) -> list[int]:
+        """Calls available on the manager of (team), see RobotTaskManager.available."""
+        return self.manager(team).available(cooldown)
@@ -0,0 +1,97 @@
+# pylint: skip-file
+
+"""Contains tests for the admission control classes"""
+
+import random
+import pytest
+from admission_control import AdmissionController, CapacityTracker
+from ordering_policies import LeastLoadedPolicy
+from robot_task_manager import RobotTaskManager
+
+
+def brute_force_counters(manager, cooldown):
+    context = manager.context
+    remaining_capacity = cooling_count = 0
+    for robot_id, limit in context["max_assignments"].items():
+        record = context["robot_records"].get(robot_id)
+        remaining_capacity += limit - (record.assignment_count if record else 0)
+        if record and record.last_assignment_index >= (
+            context["total_assignment_count"] - cooldown
+        ):
+            cooling_count += 1
+    return remaining_capacity, cooling_count
+
+
+class TestCapacityTracker:
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matching_a_brute_force_walk(seed):
+        rng = random.Random(seed)
+        manager = RobotTaskManager(cooldown=3)
+        tracker = CapacityTracker(manager)
+        for _ in range(80):
+            assignments = [
+                rng.choice([*range(12), "_"]) for _ in range(rng.randint(0, 3))
+            ]
+            limits = {rng.randrange(14): rng.randint(0, 5)} if rng.random() < 0.3 else {}
+            manager.manage(assignments, limits)
+            if rng.random() < 0.2 and assignments:
+                try:
+                    manager.retract(assignments[-1])
+                except ValueError:
+                    pass
+                manager.manage([])
+            assert (
+                tracker.remaining_capacity,
+                tracker.cooling_count,
+            ) == brute_force_counters(manager, 3)
+
+
+    @staticmethod
+    def test_aliased_limit_keys():
+        """A key like 2.0 changes the limit of robot 2, so the tracker is told about robot 2."""
+        manager = RobotTaskManager({2: 4}, cooldown=0)
+        tracker = CapacityTracker(manager)
+        manager.manage([], {2.0: 1})
+        assert manager.context["max_assignments"] == {2: 1}
+        assert tracker.remaining_capacity == 1
+
+class TestAdmissionController:
+    @staticmethod
+    def test_backpressure():
+        """Tasks are rejected once pending tasks would use up the remaining capacity or the queue is full."""
+        manager = RobotTaskManager({101: 2, 202: 1}, cooldown=0)
+        controller = AdmissionController(manager, max_pending=5)
+        assert [controller.offer(task) for task in "abcd"] == [
+            True,
+            True,
+            True,
+            False,
+        ]
+        assert controller.projected_capacity == 0
+        assert controller.dispatch() == ("a", 101)
+        assert controller.dispatch() == ("b", 101)
+        assert controller.dispatch() == ("c", 202)
+        assert controller.dispatch() is None
+        assert not controller.offer("d")
+
+    @staticmethod
+    def test_queue_limit_and_waiting_for_cooldown():
+        manager = RobotTaskManager({101: 9}, cooldown=1)
+        controller = AdmissionController(
+            manager, max_pending=2, policy=LeastLoadedPolicy()
+        )
+        assert controller.offer("a") and controller.offer("b")
+        assert not controller.offer("c")
+        assert controller.dispatch() == ("a", 101)
+        assert controller.dispatch() is None  # 101 is in cooldown
+        assert controller.capacity.cooling_count == 1
+        manager.manage(["_"])
+        assert controller.dispatch() == ("b", 101)
+        assert controller.pending_count == 0
+
+    @staticmethod
+    @pytest.mark.parametrize("max_pending", [0, -1, 1.5])
+    def test_raising_an_error_for_an_invalid_max_pending(max_pending):
+        with pytest.raises(ValueError):
+            AdmissionController(RobotTaskManager(), max_pending)
@@ -0,0 +1,76 @@
+# pylint: skip-file
+
+"""Contains tests for the AssignmentHistory class"""
+
+import random
+import pytest
+from assignment_history import AssignmentHistory
+from manage_robot_tasks import manage_robot_tasks
+
+MAX_UNIQUE_ROBOT_ID_MESSAGE = (
+    "The (assignments) list must have less than a 100 unique robot IDs"
+)
+
+
+class TestAvailableAt:
+    @staticmethod
+    def test_example():
+        """Every prefix of the example history gives the same result as manage_robot_tasks."""
+        assignments = [101, 202, 303, 202, 404, 101, 202]
+        max_assignments = {101: 2, 202: 1, 303: 1, 404: 1, 505: 1}
+        history = AssignmentHistory(assignments)
+        for i in range(len(assignments) + 1):
+            assert history.available_at(
+                i, max_assignments, cooldown=2
+            ) == manage_robot_tasks(assignments[:i], max_assignments, 2)
+
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_histories(seed):
+        """Random histories with invalid entries and near-limit unique counts match manage_robot_tasks on every prefix."""
+        rng = random.Random(seed)
+        population = list(range(95)) + ["_", -1, 1.5]
+        assignments = [rng.choice(population) for _ in range(300)]
+        max_assignments = {
+            rid: rng.randint(0, 6) for rid in rng.sample(range(110), 60)
+        }
+        cooldown = rng.randint(0, 5)
+        history = AssignmentHistory()
+        for start in range(0, len(assignments), 37):
+            history.record(assignments[start : start + 37])
+        for i in range(0, len(assignments) + 1, 7):
+            assert history.available_at(
+                i, max_assignments, cooldown
+            ) == manage_robot_tasks(assignments[:i], max_assignments, cooldown)
+
+    @staticmethod
+    @pytest.mark.parametrize("index", [-1, 4, 1.5])
+    def test_raising_an_error_for_an_out_of_range_index(index):
+        history = AssignmentHistory([101, 202, 303])
+        with pytest.raises(IndexError):
+            history.available_at(index, {101: 1})
+
+
+class TestRecords:
+    @staticmethod
+    def test_records_at():
+        """Records are restored exactly for any prefix, and robots not assigned yet are missing."""
+        history = AssignmentHistory([101, 202, "_", 101, 303, 101])
+        assert history.records_at(0) == {}
+        assert history.records_at(4) == {101: (2, 0, 3), 202: (1, 1, 1)}
+        assert history.records_at(6) == {
+            101: (3, 0, 5),
+            202: (1, 1, 1),
+            303: (1, 4, 4),
+        }
+        assert history.record_at(303, 4) is None
+        assert len(history) == 6
+
+    @staticmethod
+    def test_raising_an_error_for_a_100_or_more_unique_robot_ids():
+        """Recording stops at the same limit as manage_robot_tasks, and a rejected batch leaves the history untouched."""
+        history = AssignmentHistory(range(99))
+        with pytest.raises(ValueError) as err:
+            history.record([99, 100])
+        assert str(err.value) == MAX_UNIQUE_ROBOT_ID_MESSAGE
+        assert len(history) == 99
@@ -0,0 +1,93 @@
+# pylint: skip-file
+
+"""Contains tests for the assignment_log functions"""
+
+import pytest
+from assignment_log import (
+    LOG_ITEM_SIZE,
+    replay_binary_log,
+    write_binary_log,
+)
+from manage_robot_tasks import manage_robot_tasks
+
+
+class TestReplayBinaryLog:
+    @staticmethod
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000])
+    def test_matching_a_single_manage_robot_tasks_call(tmp_path, chunk_size):
+        """Replaying a log in chunks of any size yields the same result and context as passing the whole log at once."""
+        assignments = [101, 202, 303, 202, 404, -1, 101, 505, 303, 202]
+        max_assignments = {101: 3, 202: 4, 303: 2, 404: 1, 505: 2, 606: 1}
+        path = tmp_path / "assignments.log"
+        write_binary_log(path, assignments)
+
+        expected_context = {}
+        expected_result = manage_robot_tasks(
+            assignments, max_assignments, 2, context=expected_context
+        )
+        context = {}
+        assert (
+            replay_binary_log(
+                path,
+                max_assignments,
+                2,
+                context=context,
+                chunk_size=chunk_size,
+            )
+            == expected_result
+        )
+        assert context == expected_context
+
+    @staticmethod
+    def test_resuming_from_a_context(tmp_path):
+        """The log is appended to the assignments already recorded in the context."""
+        path = tmp_path / "assignments.log"
+        write_binary_log(path, [202, 101])
+        context = {
+            "max_assignments": {101: 2, 202: 2, 303: 1},
+            "robot_records": {101: (1, 0, 0)},
+            "total_assignment_count": 1,
+        }
+        assert replay_binary_log(
+            path, {}, cooldown=1, context=context, chunk_size=1
+        ) == [202, 303]
+        assert context["robot_records"] == {
+            101: (2, 0, 2),
+            202: (1, 1, 1),
+        }
+        assert context["total_assignment_count"] == 3
+
+    @staticmethod
+    def test_empty_log(tmp_path):
+        """An empty log records nothing but still returns the available robots."""
+        path = tmp_path / "assignments.log"
+        write_binary_log(path, [])
+        context = {}
+        assert replay_binary_log(path, {101: 1}, context=context) == [101]
+        assert context["total_assignment_count"] == 0
+
+    @staticmethod
+    def test_leaving_the_context_unchanged_when_a_chunk_raises(tmp_path):
+        """A replay that reaches too many unique robot IDs partway does not change the context."""
+        path = tmp_path / "assignments.log"
+        write_binary_log(path, list(range(150)))
+        context = {"max_assignments": {1: 2}, "total_assignment_count": 4}
+        with pytest.raises(ValueError):
+            replay_binary_log(path, {2: 1}, context=context, chunk_size=10)
+        assert context == {"max_assignments": {1: 2}, "total_assignment_count": 4}
+
+    @staticmethod
+    def test_raising_an_error_for_a_truncated_log(tmp_path):
+        """A log whose size is not a multiple of the item size is rejected."""
+        path = tmp_path / "assignments.log"
+        path.write_bytes(b"\0" * (LOG_ITEM_SIZE + 1))
+        with pytest.raises(ValueError):
+            replay_binary_log(path, {}, context={})
+
+    @staticmethod
+    @pytest.mark.parametrize("chunk_size", [0, -1, 1.5])
+    def test_raising_an_error_for_an_invalid_chunk_size(tmp_path, chunk_size):
+        path = tmp_path / "assignments.log"
+        write_binary_log(path, [101])
+        with pytest.raises(ValueError):
+            replay_binary_log(path, {}, context={}, chunk_size=chunk_size)
@@ -0,0 +1,89 @@
+# pylint: skip-file
+
+"""Contains tests for the AvailabilityCache class"""
+
+import pytest
+from availability_cache import AvailabilityCache, CacheStats
+from robot_task_manager import RobotTaskManager
+from team_registry import TeamRegistry
+
+
+class TestAvailabilityCache:
+    @staticmethod
+    def test_hits_and_misses():
+        """Repeated queries hit the cache until the team records an assignment or changes its limits."""
+        cache = AvailabilityCache()
+        manager = RobotTaskManager({101: 2, 202: 2}, cooldown=1)
+        assert cache.available("a", manager) == [101, 202]
+        assert cache.available("a", manager) == [101, 202]
+        assert cache.stats == CacheStats(1, 1, 0)
+
+        manager.manage([101])
+        assert cache.available("a", manager) == [202]
+        manager.manage([], {303: 1})
+        assert cache.available("a", manager) == [202, 303]
+        manager.retract(101)
+        assert cache.available("a", manager) == [101, 202, 303]
+        assert cache.stats == CacheStats(1, 4, 0)
+
+    @staticmethod
+    def test_keying_on_the_cooldown():
+        cache = AvailabilityCache()
+        manager = RobotTaskManager({101: 2})
+        manager.manage([101])
+        assert cache.available("a", manager, cooldown=0) == [101]
+        assert cache.available("a", manager, cooldown=1) == []
+        assert cache.available("a", manager, cooldown=0) == [101]
+        assert cache.stats == CacheStats(1, 2, 0)
+
+    @staticmethod
+    def test_reloaded_teams(tmp_path):
+        """A team reloaded from a snapshot gets a new manager whose versions start over, which is never a hit."""
+        cache = AvailabilityCache()
+        registry = TeamRegistry(tmp_path, max_resident=1)
+        registry.manage("a", [1], {1: 2, 2: 2}, 0)
+        assert cache.available("a", registry.manager("a"), 0) == [1, 2]
+        registry.manager("b")
+        manager = registry.manager("a")
+        manager.manage([2], {3: 1})
+        assert (manager.version, manager.limits_version) == (1, 1)
+        assert cache.available("a", manager, 0) == [1, 2, 3]
+        assert cache.stats == CacheStats(0, 2, 0)
+
+    @staticmethod
+    def test_lru_eviction_across_teams():
+        cache = AvailabilityCache(max_size=2)
+        managers = {team: RobotTaskManager({101: 1}) for team in "abc"}
+        cache.available("a", managers["a"])
+        cache.available("b", managers["b"])
+        cache.available("a", managers["a"])
+        cache.available("c", managers["c"])  # Evicts "b"
+        assert len(cache) == 2
+        cache.available("a", managers["a"])
+        cache.available("b", managers["b"])
+        assert cache.stats == CacheStats(2, 4, 2)
+
+    @staticmethod
+    def test_returning_copies():
+        """Mutating a returned list does not corrupt the cache."""
+        cache = AvailabilityCache()
+        manager = RobotTaskManager({101: 1})
+        cache.available("a", manager).append(202)
+        assert cache.available("a", manager) == [101]
+
+    @staticmethod
+    def test_invalidate():
+        cache = AvailabilityCache()
+        manager = RobotTaskManager({101: 1})
+        cache.available("a", manager)
+        cache.available("b", manager)
+        cache.invalidate("a")
+        assert len(cache) == 1
+        cache.invalidate()
+        assert len(cache) == 0
+
+    @staticmethod
+    @pytest.mark.parametrize("max_size", [0, -1, 1.5])
+    def test_raising_an_error_for_an_invalid_max_size(max_size):
+        with pytest.raises(ValueError):
+            AvailabilityCache(max_size)
@@ -0,0 +1,105 @@
+# pylint: skip-file
+
+"""Contains tests for the call trace capture and replay"""
+
+import random
+import pytest
+from call_trace import (
+    ENGINES,
+    TraceRecorder,
+    context_digest,
+    main,
+    read_trace,
+    replay_trace,
+)
+
+
+def record_workload(path, seed=0):
+    rng = random.Random(seed)
+    contexts = [{"max_assignments": {1: 2, "x": 1}}, {}]
+    with TraceRecorder(path) as recorder:
+        for step in range(80):
+            context = rng.choice(contexts)
+            kind = rng.random()
+            if kind < 0.6:
+                assignments = [rng.randint(1, 10)]
+            elif kind < 0.8:
+                assignments = [rng.choice([*range(1, 10), 1.0, "_"]) for _ in range(200)]
+            else:
+                assignments = []
+            limits = {rng.randint(1, 12): rng.randint(0, 40)} if kind > 0.7 else {}
+            recorder(assignments, limits, rng.choice([1, 2, None]), context=context)
+            if step == 40:
+                context.setdefault("max_assignments", {})[11] = 3
+        recorder([1, 2, 1], {1: 1, 2: 1})
+        with pytest.raises(ValueError):
+            recorder(list(range(200, 400)), {}, context=contexts[0])
+    return contexts
+
+
+class TestCallTrace:
+    @staticmethod
+    @pytest.mark.parametrize("name", sorted(ENGINES))
+    @pytest.mark.parametrize("file_name", ["trace.jsonl", "trace.jsonl.gz"])
+    def test_replay_matching(name, file_name, tmp_path):
+        """Tests that every engine reproduces a recorded workload."""
+        path = tmp_path / file_name
+        record_workload(path)
+        timings = replay_trace(path, ENGINES[name])
+        assert len(timings) == 82
+        assert all(timing.matches for timing in timings)
+        assert timings[-2].stream is None and timings[-2].assignment_count == 3
+
+    @staticmethod
+    def test_external_changes_are_captured(tmp_path):
+        """Tests that a context changed between calls is written again."""
+        path = tmp_path / "trace.jsonl"
+        record_workload(path)
+        snapshots = [entry for entry in read_trace(path) if entry["kind"] == "context"]
+        assert len(snapshots) == 3
+
+    @staticmethod
+    def test_bounded_streams(tmp_path):
+        """Tests that contexts beyond max_streams, or forgotten ones, get a new stream."""
+        path = tmp_path / "trace.jsonl"
+        first, second = {}, {}
+        with TraceRecorder(path, max_streams=1) as recorder:
+            for context in [first, second, first, first]:
+                recorder([1], {1: 5}, 1, context=context)
+            recorder.forget(first)
+            recorder([2], {2: 5}, 1, context=first)
+        streams = [entry["stream"] for entry in read_trace(path) if entry["kind"] == "context"]
+        assert streams == [0, 1, 2, 3]
+        assert all(timing.matches for timing in replay_trace(path))
+        with pytest.raises(ValueError):
+            TraceRecorder(path, max_streams=0)
+
+    @staticmethod
+    def test_replay_mismatch(tmp_path):
+        """Tests that a result that differs from the trace is detected."""
+        path = tmp_path / "trace.jsonl"
+        with TraceRecorder(path) as recorder:
+            recorder([1, 2], {1: 2, 2: 2}, 1, context={})
+        text = path.read_text().replace('"result":[1]', '"result":[2]')
+        path.write_text(text)
+        assert [timing.matches for timing in replay_trace(path)] == [False]
+
+    @staticmethod
+    def test_context_digest():
+        """Tests that digests ignore the order of items."""
+        assert context_digest({"max_assignments": {1: 2, 3: 4}}) == context_digest(
+            {"max_assignments": {3: 4, 1: 2}}
+        )
+        assert context_digest({"max_assignments": {1: 2}}) != context_digest(
+            {"max_assignments": {1.0: 2}}
+        )
+
+    @staticmethod
+    def test_main(tmp_path, capsys):
+        """Tests the command-line replay."""
+        path = tmp_path / "trace.jsonl"
+        record_workload(path)
+        assert main([str(path), "--engine", "reference", "--engine", "manager"]) == 0
+        output = capsys.readouterr().out
+        assert "reference: 82 calls" in output and "manager: 82 calls" in output
+        assert "0 mismatches" in output
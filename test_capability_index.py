@@ -0,0 +1,63 @@
+# pylint: skip-file
+
+"""Contains tests for the capability index"""
+
+import random
+import pytest
+from capability_index import CapabilityIndex
+from robot_bitsets import RobotInterner, TeamBitsets
+from robot_task_manager import RobotTaskManager
+
+CAPABILITIES = ["weld", "paint", "lift"]
+
+
+class TestCapabilityIndex:
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matching_a_filtered_availability(seed):
+        """Tests that the intersection matches filtering manager.available."""
+        rng = random.Random(seed)
+        manager = RobotTaskManager(cooldown=2)
+        index = CapabilityIndex()
+        team = TeamBitsets(manager, index.interner)
+        for _ in range(100):
+            robot_id = rng.randint(1, 14)
+            if rng.random() < 0.3:
+                index.tag(robot_id, rng.sample(CAPABILITIES, rng.randint(1, 2)))
+            elif rng.random() < 0.1:
+                index.untag(robot_id, rng.choice([None, ["weld"]]))
+            manager.manage(
+                [rng.randint(1, 12) for _ in range(rng.randint(0, 3))],
+                {robot_id: rng.choice([0, 1, 3])} if rng.random() < 0.3 else {},
+            )
+            required = rng.sample(CAPABILITIES, rng.randint(1, 2))
+            expected = [
+                robot_id
+                for robot_id in manager.available()
+                if set(required) <= index.capabilities(robot_id)
+            ]
+            assert sorted(index.available(team, required)) == sorted(expected)
+
+    @staticmethod
+    def test_tags():
+        """Tests tagging and untagging robots."""
+        index = CapabilityIndex()
+        index.tag(1, ["weld", "paint"])
+        index.tag(2, ["weld"])
+        assert index.robot_ids(["weld"]) == [1, 2]
+        assert index.robot_ids(["weld", "paint"]) == [1]
+        assert index.robot_ids(["fly"]) == []
+        index.untag(1, ["weld"])
+        assert index.capabilities(1) == {"paint"}
+        index.untag(1)
+        assert index.capabilities(1) == frozenset()
+        assert index.robot_ids(["paint"]) == []
+
+    @staticmethod
+    def test_invalid_queries():
+        """Tests that empty requirements and foreign teams are rejected."""
+        index = CapabilityIndex()
+        with pytest.raises(ValueError):
+            index.mask([])
+        with pytest.raises(ValueError):
+            index.available(TeamBitsets(RobotTaskManager(), RobotInterner()), ["weld"])
@@ -0,0 +1,89 @@
+# pylint: skip-file
+
+"""Contains tests for the columnar export"""
+
+import random
+import pytest
+from columnar_export import STATUSES, export_context, export_manager
+from manage_robot_tasks import manage_robot_tasks
+from robot_state_events import RobotState, StateWatcher
+from robot_task_manager import RobotTaskManager
+
+
+def rows(columns):
+    views = columns.columns
+    return [
+        tuple(views[name][i] for name in views) for i in range(len(columns))
+    ]
+
+
+class TestExportContext:
+    @staticmethod
+    def test_columns():
+        """Tests the rows and formats of an exported context."""
+        context = {"max_assignments": {1: 1, 2: 5, 3: 5, 4: 5, "x": 1}}
+        manage_robot_tasks([1, 2, 3, None, None], {}, 2, context=context)
+        columns = export_context(context, 3)
+        codes = {state: STATUSES.index(state) for state in RobotState}
+        assert rows(columns) == [
+            (1, 1, 0, 0, -1, codes[RobotState.UNKNOWN]),
+            (2, 1, 1, 1, 5, codes[RobotState.AVAILABLE]),
+            (3, 1, 2, 2, 5, codes[RobotState.COOLING]),
+            (4, 0, -1, -1, 5, codes[RobotState.AVAILABLE]),
+        ]
+        assert [view.format for view in columns.columns.values()] == ["q"] * 5 + ["b"]
+        assert all(view.contiguous for view in columns.columns.values())
+
+    @staticmethod
+    def test_empty_context():
+        """Tests that an empty context has empty columns."""
+        columns = export_context({})
+        assert len(columns) == 0
+        assert all(len(view) == 0 for view in columns.columns.values())
+
+
+class TestExportManager:
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matching_the_state_watcher(seed):
+        """Tests that the statuses match the states of a StateWatcher."""
+        rng = random.Random(seed)
+        manager = RobotTaskManager(cooldown=2)
+        states = {}
+        StateWatcher(
+            manager,
+            lambda transition: states.__setitem__(transition.robot_id, transition.current),
+        )
+        for _ in range(60):
+            manager.manage(
+                [rng.randint(1, 10) for _ in range(rng.randint(0, 3))],
+                {rng.randint(1, 12): rng.choice([0, 1, 3])} if rng.random() < 0.3 else {},
+            )
+            columns = export_manager(manager).columns
+            exported = {
+                robot_id: STATUSES[status]
+                for robot_id, status in zip(columns["robot_ids"], columns["statuses"])
+            }
+            for robot_id in set(exported) | set(states):
+                assert exported.get(robot_id, RobotState.UNKNOWN) is states.get(
+                    robot_id, RobotState.UNKNOWN
+                )
+
+    @staticmethod
+    def test_raising_an_error_for_64_bit_overflow():
+        """Robot IDs and limits that do not fit in the int64 columns are rejected up front."""
+        with pytest.raises(ValueError):
+            export_context({"max_assignments": {2**63: 1}})
+        with pytest.raises(ValueError):
+            export_context({"max_assignments": {1: 2**63}})
+        assert len(export_context({"max_assignments": {2**63 - 1: 1}})) == 1
+
+    @staticmethod
+    def test_to_numpy():
+        """Tests the NumPy views, when NumPy is installed."""
+        numpy = pytest.importorskip("numpy")
+        manager = RobotTaskManager({1: 3, 2: 3})
+        manager.manage([1, 2, 1])
+        arrays = export_manager(manager).to_numpy()
+        assert arrays["assignment_counts"].tolist() == [2, 1]
+        assert arrays["robot_ids"].dtype == numpy.int64
@@ -0,0 +1,84 @@
+# pylint: skip-file
+
+"""Contains tests for the CompiledLimits class"""
+
+import pytest
+from compiled_limits import CompiledLimits
+from manage_robot_tasks import manage_robot_tasks
+from robot_task_manager import RobotTaskManager
+
+MAX_ASSIGNMENTS = {101: 2, "101": 1, 202: 0, 303: 1.5, 404: 3, 1.01: 2, 505: 1}
+
+
+class TestCompiledLimits:
+    @staticmethod
+    def test_dropping_invalid_entries():
+        limits = CompiledLimits(MAX_ASSIGNMENTS)
+        assert dict(limits) == {101: 2, 404: 3, 505: 1}
+        assert limits.robot_ids == (101, 404, 505)
+        assert limits.limits == (2, 3, 1)
+        assert [limits.slot(rid) for rid in limits] == [0, 1, 2]
+        assert 202 not in limits and len(limits) == 3
+        with pytest.raises(KeyError):
+            limits.slot(202)
+
+    @staticmethod
+    def test_hashing_and_equality():
+        """Compiled limits are equal if they were compiled from equal dicts, since dropped entries still affect merging."""
+        limits = CompiledLimits(MAX_ASSIGNMENTS)
+        assert limits == CompiledLimits(dict(MAX_ASSIGNMENTS))
+        assert hash(limits) == hash(CompiledLimits(dict(MAX_ASSIGNMENTS)))
+        assert len({limits, CompiledLimits(MAX_ASSIGNMENTS)}) == 1
+        assert limits != CompiledLimits({101: 2, 404: 3, 505: 1})
+        assert CompiledLimits({101: 2, 404: 3}) != CompiledLimits(
+            {404: 3, 101: 2}
+        )
+        assert limits == {101: 2, 404: 3, 505: 1}
+
+
+class TestPassingCompiledLimits:
+    @staticmethod
+    @pytest.mark.parametrize("cooldown", [0, 1, 3])
+    def test_matching_the_dict(cooldown):
+        assignments = [101, 404, 202, 101, 505]
+        assert manage_robot_tasks(
+            assignments, CompiledLimits(MAX_ASSIGNMENTS), cooldown
+        ) == manage_robot_tasks(assignments, MAX_ASSIGNMENTS, cooldown)
+
+    @staticmethod
+    def test_merging_over_the_context_max_assignments():
+        """The context entries are merged and validated in the same order as a dict union, including equal but invalid keys that shadow compiled entries."""
+        context_max_assignments = {
+            606: 2,
+            101.0: 5,
+            404: 1,
+            "_": 3,
+            707: -1,
+            808: 1,
+        }
+        max_assignments = {101: 2, 404: 3, 909: 1, 808: 0}
+        expected_context = {"max_assignments": dict(context_max_assignments)}
+        context = {"max_assignments": dict(context_max_assignments)}
+        expected_result = manage_robot_tasks(
+            [404], max_assignments, 0, context=expected_context
+        )
+        assert (
+            manage_robot_tasks(
+                [404], CompiledLimits(max_assignments), 0, context=context
+            )
+            == expected_result
+        )
+        assert context == expected_context
+
+    @staticmethod
+    def test_passing_compiled_limits_to_a_manager():
+        limits = CompiledLimits(MAX_ASSIGNMENTS)
+        context = {}
+        manager = RobotTaskManager()
+        for assignments in [[101], [404, 505], [101, "_"], []]:
+            assert manager.manage(
+                assignments, limits, cooldown=1
+            ) == manage_robot_tasks(
+                assignments, MAX_ASSIGNMENTS, 1, context=context
+            )
+            assert manager.context == context
@@ -0,0 +1,57 @@
+# pylint: skip-file
+
+"""Contains tests for the context_io functions"""
+
+import json
+from context_io import (
+    context_from_json_dict,
+    context_to_json_dict,
+    dump_context,
+    load_context,
+)
+from manage_robot_tasks import RobotRecord, manage_robot_tasks
+
+
+class TestContextSerialization:
+    @staticmethod
+    def test_round_trip(tmp_path):
+        """A dumped context is loaded back unchanged, with integer robot IDs and RobotRecord values."""
+        context = {}
+        manage_robot_tasks(
+            [101, 202, 303, 202], {101: 2, 202: 3, 404: 1}, context=context
+        )
+        path = tmp_path / "context.json"
+        dump_context(context, path)
+        loaded = load_context(path)
+        assert loaded == context
+        assert all(
+            isinstance(robot_record, RobotRecord)
+            for robot_record in loaded["robot_records"].values()
+        )
+
+    @staticmethod
+    def test_partial_context():
+        """Missing context items stay missing."""
+        assert context_to_json_dict({"total_assignment_count": 3}) == {
+            "total_assignment_count": 3
+        }
+        assert context_from_json_dict({}) == {}
+
+    @staticmethod
+    def test_keeping_invalid_max_assignments_keys():
+        """Non-integer robot IDs are kept as strings, so manage_robot_tasks still ignores them."""
+        assert context_from_json_dict(
+            {"max_assignments": {"101": 1, "_": 2}}
+        ) == {"max_assignments": {101: 1, "_": 2}}
+
+    @staticmethod
+    def test_exact_keys():
+        """With exact keys, keys like 2.0 or True keep their types through JSON."""
+        context = {
+            "max_assignments": {2.0: 1, True: 3, 5: 2},
+            "robot_records": {5: RobotRecord(1, 0, 0)},
+        }
+        data = json.loads(json.dumps(context_to_json_dict(context, exact_keys=True)))
+        loaded = context_from_json_dict(data)
+        assert loaded == context
+        assert [type(key) for key in loaded["max_assignments"]] == [float, bool, int]
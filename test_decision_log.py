@@ -0,0 +1,147 @@
+# pylint: skip-file
+
+"""Contains tests for the decision log"""
+
+import json
+import random
+import pytest
+from decision_log import (
+    DecisionLog,
+    Exclusion,
+    ExclusionReason,
+    JsonLinesSink,
+)
+from manage_robot_tasks import RobotRecord
+from robot_task_manager import RobotTaskManager
+
+
+class TestExplanations:
+    @staticmethod
+    def test_reasons():
+        """Tests the reason of every excluded robot."""
+        log = DecisionLog()
+        manager = RobotTaskManager(
+            {1: 1, 2: 5, 3: 5, "x": 1}, cooldown=2, decision_log=log
+        )
+        assert manager.manage([1, 2]) == [3]
+        (record,) = log.records
+        assert record[:3] == (2, 0, 2)
+        assert record.exclusions == (
+            Exclusion(1, ExclusionReason.OVER_LIMIT, 1, RobotRecord(1, 0, 0)),
+            Exclusion(2, ExclusionReason.COOLDOWN, 5, RobotRecord(1, 1, 1)),
+            Exclusion("x", ExclusionReason.INVALID_LIMIT, 1, None),
+        )
+
+    @staticmethod
+    def test_rejected_extra_robots():
+        """Tests that extra robots are rejected near the unique robot ID limit."""
+        log = DecisionLog()
+        manager = RobotTaskManager(decision_log=log)
+        assert manager.manage(list(range(1, 100)), {500: 1}) == []
+        assert log.records[0].exclusions[-1] == Exclusion(
+            500, ExclusionReason.EXTRA_REJECTED, 1, None
+        )
+
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matching_the_results(seed):
+        """Tests that exactly the robots missing from the result are excluded."""
+        rng = random.Random(seed)
+        log = DecisionLog()
+        manager = RobotTaskManager(cooldown=2, decision_log=log)
+        for _ in range(60):
+            limits = {rng.randint(1, 12): rng.choice([0, 1, 3, "2"])}
+            robot_ids = set(manager.context["max_assignments"] | limits)
+            result = manager.manage(
+                [rng.randint(1, 10) for _ in range(rng.randint(0, 3))], limits
+            )
+            record = log.records[-1]
+            excluded = [exclusion.robot_id for exclusion in record.exclusions]
+            assert sorted(excluded) == sorted(robot_ids - set(result))
+        assert len(log.records) == 60
+
+
+class TestDecisionLog:
+    @staticmethod
+    def test_sampling():
+        """Tests that only sampled calls are recorded."""
+        log = DecisionLog(sample_rate=0.25, seed=1)
+        manager = RobotTaskManager({1: 1000}, decision_log=log)
+        for _ in range(400):
+            manager.manage([1])
+        assert 60 < len(log.records) < 140
+
+    @staticmethod
+    def test_batches():
+        """Tests that full batches are flushed to the sink."""
+        batches = []
+        log = DecisionLog(capacity=4, sink=batches.append, batch_size=2)
+        manager = RobotTaskManager({1: 10}, decision_log=log)
+        for _ in range(5):
+            manager.manage([1])
+        assert [len(batch) for batch in batches] == [2, 2]
+        assert len(log.records) == 1
+        log.flush()
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert log.records == []
+
+    @staticmethod
+    def test_keeping_records_when_the_sink_fails():
+        """Tests that a batch the sink failed to take is sent with the next flush."""
+        batches = []
+
+        def sink(records):
+            if not batches:
+                batches.append(None)
+                raise OSError("sink is down")
+            batches.append(records)
+
+        log = DecisionLog(capacity=4, sink=sink, batch_size=2)
+        manager = RobotTaskManager({1: 10}, decision_log=log)
+        manager.manage([1])
+        with pytest.raises(OSError):
+            manager.manage([1])
+        assert len(log.records) == 2
+        log.flush()
+        assert [record.total_assignment_count for record in batches[1]] == [1, 2]
+        assert log.records == []
+
+    @staticmethod
+    def test_ring_buffer():
+        """Tests that the oldest records are overwritten without a sink."""
+        log = DecisionLog(capacity=2)
+        manager = RobotTaskManager({1: 10}, decision_log=log)
+        for _ in range(5):
+            manager.manage([1])
+        assert [record.total_assignment_count for record in log.records] == [4, 5]
+        assert log.dropped_count == 3
+
+    @staticmethod
+    def test_json_lines_sink(tmp_path):
+        """Tests that records are written as JSON lines."""
+        path = tmp_path / "decisions.jsonl"
+        log = DecisionLog(sink=JsonLinesSink(path), batch_size=1)
+        RobotTaskManager({1: 1}, decision_log=log).manage([1])
+        assert json.loads(path.read_text()) == {
+            "total_assignment_count": 1,
+            "min_cooldown_index": -2,
+            "unique_robot_id_count": 1,
+            "exclusions": [
+                {
+                    "robot_id": 1,
+                    "reason": "over_limit",
+                    "limit": 1,
+                    "robot_record": [1, 0, 0],
+                }
+            ],
+        }
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"sample_rate": 0}, {"capacity": 0}, {"capacity": 2, "batch_size": 3}],
+    )
+    def test_invalid_arguments(kwargs):
+        """Tests that invalid arguments are rejected."""
+        with pytest.raises(ValueError):
+            DecisionLog(**kwargs)
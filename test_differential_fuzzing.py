@@ -0,0 +1,55 @@
+# pylint: skip-file
+
+"""Contains tests for the differential fuzzing harness"""
+
+import pytest
+from differential_fuzzing import (
+    DEFAULT_ENGINES,
+    DifferentialMismatch,
+    ReferenceEngine,
+    generate_operations,
+    main,
+    run_differential,
+)
+from robot_task_manager import RobotTaskManager
+
+
+class ReversedEngine(ReferenceEngine):
+    """A broken engine that reverses the order of the result"""
+
+    def manage(self, assignments, max_assignments, cooldown):
+        return super().manage(assignments, max_assignments, cooldown)[::-1]
+
+
+class TestRunDifferential:
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(8))
+    def test_default_engines(seed):
+        reports = run_differential(seed, 200)
+        assert [report.name for report in reports] == [
+            "reference",
+            *DEFAULT_ENGINES,
+        ]
+        assert all(report.seconds > 0 for report in reports)
+
+    @staticmethod
+    def test_detecting_a_mismatch():
+        with pytest.raises(DifferentialMismatch):
+            run_differential(0, 200, {"reversed": ReversedEngine})
+
+    @staticmethod
+    def test_detecting_a_context_mismatch():
+        """An engine that forgets its context on round-trips is caught."""
+        with pytest.raises(DifferentialMismatch):
+            run_differential(1, 300, {"forgetful": lambda _: RobotTaskManager()})
+
+    @staticmethod
+    def test_deterministic_operations():
+        assert list(generate_operations(3, 50)) == list(
+            generate_operations(3, 50)
+        )
+
+    @staticmethod
+    def test_main(capsys):
+        assert main(["--seeds", "2", "--steps", "50"]) == 0
+        assert "speedup" in capsys.readouterr().out
@@ -0,0 +1,91 @@
+# pylint: skip-file
+
+"""Contains tests for the engine selection of manage_robot_tasks"""
+
+import random
+import pytest
+from engine_selection import calibrate_engine_thresholds, find_crossover
+from manage_robot_tasks import (
+    EngineThresholds,
+    RobotRecord,
+    manage_robot_tasks,
+    record_assignments_in_bulk,
+    record_assignments_per_item,
+)
+
+ALWAYS_BULK = EngineThresholds(0, 0)
+
+NEVER_BULK = EngineThresholds(10**9, 0)
+
+
+class TestRecordAssignments:
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(10))
+    def test_bulk_matching_per_item(seed):
+        """Tests that both paths produce the same records."""
+        rng = random.Random(seed)
+        robot_ids = [rng.randint(0, 10**15) for _ in range(rng.randint(1, 30))]
+        assignments = [rng.choice(robot_ids) for _ in range(rng.randint(1, 300))]
+        initial = {robot_ids[0]: RobotRecord(2, 1, 3), 7: RobotRecord(1, 0, 0)}
+        expected = dict(initial)
+        actual = dict(initial)
+        record_assignments_per_item(assignments, expected, 5)
+        assert record_assignments_in_bulk(assignments, actual, 5)
+        assert actual == expected
+        assert list(actual) == list(expected)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "assignments", [[1, 1.0, 2], [1, True], [1, -1], [1, "1"], []]
+    )
+    def test_bulk_rejecting_invalid_elements(assignments):
+        """Tests that the bulk path leaves invalid inputs to the per-item path."""
+        robot_records = {}
+        assert not record_assignments_in_bulk(assignments, robot_records, 0)
+        assert robot_records == {}
+
+
+class TestManageRobotTasks:
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(10))
+    def test_paths_matching(seed):
+        """Tests that the selected path never changes results or contexts."""
+        rng = random.Random(seed)
+        contexts = [{}, {}]
+        for _ in range(30):
+            assignments = [
+                rng.choice([*range(1, 20), 1.0, "_"]) if rng.random() < 0.05 else rng.randint(1, 20)
+                for _ in range(rng.choice([0, 1, 5, 100]))
+            ]
+            limits = {rng.randint(1, 22): rng.randint(0, 30)}
+            results = [
+                manage_robot_tasks(
+                    assignments, limits, 2, context=context, engine_thresholds=thresholds
+                )
+                for context, thresholds in zip(contexts, [ALWAYS_BULK, NEVER_BULK])
+            ]
+            assert results[0] == results[1]
+            assert contexts[0] == contexts[1]
+
+    @staticmethod
+    def test_memoryview_assignments():
+        """Tests the bulk path with a memoryview, as replayed from binary logs."""
+        assignments = memoryview(bytes([1, 2, 1, 3, 2, 1]))
+        assert manage_robot_tasks(
+            assignments, {1: 5, 2: 5, 3: 5}, 1, engine_thresholds=ALWAYS_BULK
+        ) == manage_robot_tasks(
+            assignments, {1: 5, 2: 5, 3: 5}, 1, engine_thresholds=NEVER_BULK
+        )
+
+
+class TestCalibration:
+    @staticmethod
+    def test_find_crossover():
+        """Tests that the crossover is one of the tried sizes."""
+        assert find_crossover(1, sizes=(1, 5000), repeat=1) in (1, 5000)
+
+    @staticmethod
+    def test_calibrate_engine_thresholds():
+        """Tests that the calibrated thresholds are non-negative."""
+        thresholds = calibrate_engine_thresholds(sizes=(1, 64, 5000), repeat=1)
+        assert min(thresholds) >= 0
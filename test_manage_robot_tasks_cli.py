@@ -0,0 +1,131 @@
+# pylint: skip-file
+
+"""Contains tests for the manage_robot_tasks command-line interface"""
+
+import io
+import json
+import pytest
+from assignment_log import write_binary_log
+from context_io import load_context
+from manage_robot_tasks import manage_robot_tasks
+from manage_robot_tasks_cli import main
+
+ASSIGNMENTS = [101, 202, 303, 202, 404, 101, 202]
+
+MAX_ASSIGNMENTS = {101: 2, 202: 1, 303: 1, 404: 1}
+
+
+@pytest.fixture
+def limits_path(tmp_path):
+    path = tmp_path / "limits.json"
+    path.write_text(json.dumps(MAX_ASSIGNMENTS))
+    return path
+
+
+def expected_output(assignments, cooldown):
+    context = {}
+    result = manage_robot_tasks(
+        assignments, MAX_ASSIGNMENTS, cooldown, context=context
+    )
+    return result, context
+
+
+class TestMain:
+    @staticmethod
+    @pytest.mark.parametrize("chunk_size", ["1", "3", "100"])
+    def test_text_log(tmp_path, limits_path, capsys, chunk_size):
+        """A text log is replayed and the result and context are printed as JSON."""
+        log_path = tmp_path / "assignments.txt"
+        log_path.write_text("\n".join(map(str, ASSIGNMENTS)) + "\n")
+        assert (
+            main(
+                [
+                    str(log_path),
+                    "--limits",
+                    str(limits_path),
+                    "--cooldown",
+                    "1",
+                    "--chunk-size",
+                    chunk_size,
+                ]
+            )
+            == 0
+        )
+        output = json.loads(capsys.readouterr().out)
+        result, context = expected_output(ASSIGNMENTS, 1)
+        assert output["available"] == result
+        assert output["context"]["total_assignment_count"] == 7
+
+    @staticmethod
+    def test_text_log_from_stdin_with_invalid_lines(
+        limits_path, capsys, monkeypatch
+    ):
+        """Lines that are not integers are counted as invalid assignments."""
+        monkeypatch.setattr("sys.stdin", io.StringIO("303\n_\n\n101\n"))
+        main(["-", "--limits", str(limits_path), "--cooldown", "2"])
+        output = json.loads(capsys.readouterr().out)
+        assert output["available"] == expected_output([303, "_", 101], 2)[0]
+        assert output["context"]["total_assignment_count"] == 3
+
+    @staticmethod
+    def test_binary_log_with_stats(tmp_path, limits_path, capsys):
+        """Binary logs are supported, and --stats reports on stderr only."""
+        log_path = tmp_path / "assignments.log"
+        write_binary_log(log_path, ASSIGNMENTS)
+        main(
+            [
+                str(log_path),
+                "--format",
+                "binary",
+                "--limits",
+                str(limits_path),
+                "--stats",
+            ]
+        )
+        captured = capsys.readouterr()
+        assert (
+            json.loads(captured.out)["available"]
+            == expected_output(ASSIGNMENTS, 3)[0]
+        )
+        assert "throughput" in captured.err
+        assert "replay" in captured.err
+
+    @staticmethod
+    def test_resuming_from_a_saved_context(tmp_path, limits_path, capsys):
+        """Replaying a log in two runs through a saved context is the same as replaying it in one run."""
+        first_path = tmp_path / "first.txt"
+        first_path.write_text("\n".join(map(str, ASSIGNMENTS[:3])))
+        second_path = tmp_path / "second.txt"
+        second_path.write_text("\n".join(map(str, ASSIGNMENTS[3:])))
+        context_path = tmp_path / "context.json"
+        main(
+            [
+                str(first_path),
+                "--limits",
+                str(limits_path),
+                "--save-context",
+                str(context_path),
+            ]
+        )
+        main(
+            [
+                str(second_path),
+                "--context",
+                str(context_path),
+                "--save-context",
+                str(context_path),
+            ]
+        )
+        output = json.loads(capsys.readouterr().out.splitlines()[-1])
+        result, context = expected_output(ASSIGNMENTS, 3)
+        assert output["available"] == result
+        assert load_context(context_path) == context
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "argv",
+        [["-", "--format", "binary"], ["log.txt", "--chunk-size", "0"]],
+    )
+    def test_rejecting_invalid_arguments(argv):
+        with pytest.raises(SystemExit):
+            main(argv)
@@ -0,0 +1,101 @@
+# pylint: skip-file
+
+"""Contains tests for the memory footprint accounting"""
+
+import sys
+import pytest
+from manage_robot_tasks import RobotRecord, manage_robot_tasks
+from memory_footprint import (
+    STORAGE_BACKENDS,
+    bytes_per_robot,
+    context_footprint,
+    deep_sizeof,
+    main,
+    manager_footprint,
+    registry_footprint,
+)
+from robot_task_manager import RobotTaskManager
+from team_registry import TeamRegistry
+
+
+class TestDeepSizeof:
+    @staticmethod
+    def test_shared_objects_are_counted_once():
+        """Tests that an object referenced twice is counted once."""
+        item = [10**20]
+        assert deep_sizeof([item, item]) == (
+            sys.getsizeof([item, item]) + sys.getsizeof(item) + sys.getsizeof(10**20)
+        )
+
+    @staticmethod
+    def test_interpreter_objects_are_skipped():
+        """Tests that None, booleans and small integers are not counted."""
+        assert deep_sizeof((None, True, 5)) == sys.getsizeof((None, True, 5))
+
+    @staticmethod
+    def test_seen_is_shared():
+        """Tests that objects counted by a previous call are skipped."""
+        record = RobotRecord(1000, 2000, 3000)
+        seen = set()
+        assert deep_sizeof(record, seen) > 0
+        assert deep_sizeof({1000: record}, seen) == sys.getsizeof({1000: record})
+
+
+class TestFootprints:
+    @staticmethod
+    def test_context_footprint():
+        """Tests the breakdown of a context."""
+        context = {}
+        manage_robot_tasks(list(range(300, 350)), {300: 5}, context=context)
+        footprint = context_footprint(context)
+        assert set(footprint.breakdown) == {
+            "max_assignments",
+            "robot_records",
+            "total_assignment_count",
+        }
+        assert sum(footprint.breakdown.values()) < footprint.total
+
+    @staticmethod
+    def test_manager_footprint():
+        """Tests that the footprint of a manager grows with its robots."""
+        manager = RobotTaskManager({1000: 5})
+        before = manager_footprint(manager)
+        manager.manage(list(range(1000, 1050)))
+        after = manager_footprint(manager)
+        assert after.total == sum(after.breakdown.values())
+        assert after.breakdown["robot_records"] > before.breakdown["robot_records"]
+        assert after.breakdown["assignment_history"] > 0
+        assert {"max_assignments", "cold_records", "other"} <= set(after.breakdown)
+
+    @staticmethod
+    def test_registry_footprint(tmp_path):
+        """Tests the aggregate footprint of a registry."""
+        registry = TeamRegistry(tmp_path, max_resident=2)
+        for team in "abc":
+            registry.manage(team, [1000, 2000], {1000: 3})
+        registry.manage("b", [])
+        footprint = registry_footprint(registry)
+        assert sorted(footprint.teams) == ["b", "c"]
+        assert footprint.resident_team_count == 2
+        assert footprint.resident_bytes == sum(
+            team.total for team in footprint.teams.values()
+        )
+        assert footprint.spilled_bytes > 0
+        assert registry.resident_teams == ["c", "b"]
+        assert registry.stats.hits == 1
+
+
+class TestBytesPerRobot:
+    @staticmethod
+    def test_backends():
+        """Tests that every backend is measured, and the compact ones are smaller."""
+        sizes = bytes_per_robot(20)
+        assert set(sizes) == set(STORAGE_BACKENDS)
+        assert sizes["cold_record_store"] < sizes["robot_records"] < sizes["manager"]
+        assert sizes["json_snapshot"] < sizes["cold_record_store"]
+
+    @staticmethod
+    def test_main(capsys):
+        """Tests the command-line benchmark."""
+        assert main(["--robots", "10"]) == 0
+        assert "cold_record_store:" in capsys.readouterr().out
@@ -0,0 +1,118 @@
+# pylint: skip-file
+
+"""Contains tests for the ordering policies"""
+
+import random
+import pytest
+from ordering_policies import (
+    FirstAssignmentPolicy,
+    LeastLoadedPolicy,
+    LeastRecentlyUsedPolicy,
+    RoundRobinPolicy,
+)
+from robot_task_manager import RobotTaskManager
+
+
+def brute_force_select(manager, key):
+    available = manager.available()
+    return min(available, key=key) if available else None
+
+
+class TestPolicies:
+    @staticmethod
+    def test_first_assignment_policy_matches_the_manager_order():
+        manager = RobotTaskManager({101: 3, 202: 3, 303: 3, 404: 1}, cooldown=0)
+        policy = FirstAssignmentPolicy()
+        manager.attach(policy)
+        manager.manage([303, 101])
+        assert policy.order(manager.available()) == manager.available()
+        assert manager.select(policy) == 303
+
+    @staticmethod
+    def test_first_assignment_policy_orders_new_robots_as_they_became_known():
+        manager = RobotTaskManager(cooldown=0)
+        policy = FirstAssignmentPolicy()
+        manager.attach(policy)
+        result = manager.manage([], {505: 1, 404: 1, 1000: 1, 3: 1})
+        assert result == [505, 404, 1000, 3]
+        assert policy.order(result) == result
+        assert manager.select(policy) == 505
+        result = manager.manage([1000], {7: 1, 6: 1})
+        assert policy.order(result) == result == [505, 404, 3, 7, 6]
+
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matching_a_brute_force_selection(seed):
+        """Incrementally maintained policies select the same robot as sorting the available ones."""
+        rng = random.Random(seed)
+        manager = RobotTaskManager(cooldown=2)
+        lru, least_loaded = LeastRecentlyUsedPolicy(), LeastLoadedPolicy()
+        manager.attach(lru)
+        manager.manage([], {rid: rng.randint(1, 6) for rid in range(10)})
+        manager.attach(least_loaded)
+
+        def lru_key(rid):
+            record = manager.record(rid)
+            return (-1 if record is None else record.last_assignment_index, rid)
+
+        def load_key(rid):
+            record = manager.record(rid)
+            if record is None:
+                return (0.0, -1, rid)
+            return (
+                record.assignment_count / manager.limit(rid),
+                record.last_assignment_index,
+                rid,
+            )
+
+        for _ in range(40):
+            assert manager.select(lru) == brute_force_select(manager, lru_key)
+            assert manager.select(least_loaded) == brute_force_select(
+                manager, load_key
+            )
+            selected = manager.select(
+                rng.choice([lru, least_loaded])
+            )
+            if rng.random() < 0.2:
+                manager.manage([], {rng.randrange(12): rng.randint(0, 6)})
+            manager.manage([selected] if selected is not None else ["_"])
+            if rng.random() < 0.1 and selected is not None:
+                manager.retract(selected)
+
+    @staticmethod
+    def test_least_loaded_policy():
+        manager = RobotTaskManager({101: 4, 202: 2}, cooldown=0)
+        policy = LeastLoadedPolicy()
+        manager.attach(policy)
+        manager.manage([101, 202])
+        assert manager.select(policy) == 101  # 1/4 < 1/2
+        manager.manage([101])
+        assert manager.select(policy) == 202  # 2/4 == 1/2, 202 is less recent
+        manager.manage([202])
+        assert manager.select(policy) == 101  # 202 is exhausted
+
+    @staticmethod
+    def test_round_robin_policy():
+        manager = RobotTaskManager({303: 9, 101: 9, 202: 9}, cooldown=1)
+        policy = RoundRobinPolicy()
+        manager.attach(policy)
+        selections = []
+        for _ in range(6):
+            selected = manager.select(policy)
+            selections.append(selected)
+            manager.manage([selected])
+        assert selections == [101, 202, 303, 101, 202, 303]
+        assert policy.order(manager.available()) == [101, 202]
+
+    @staticmethod
+    def test_removing_exhausted_robots():
+        manager = RobotTaskManager({101: 1, 202: 1}, cooldown=0)
+        policy = LeastRecentlyUsedPolicy()
+        manager.attach(policy)
+        manager.manage([101])
+        assert manager.select(policy) == 202
+        manager.manage([202])
+        assert manager.select(policy) is None
+        manager.detach(policy)
+        manager.manage([], {303: 1})
+        assert manager.select(policy) is None
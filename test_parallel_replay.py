@@ -0,0 +1,110 @@
+# pylint: skip-file
+
+"""Contains tests for the parallel_replay functions"""
+
+import random
+from functools import reduce
+import pytest
+from manage_robot_tasks import manage_robot_tasks
+from parallel_replay import merge_contexts, parallel_replay
+
+MAX_UNIQUE_ROBOT_ID_MESSAGE = (
+    "The (assignments) list must have less than a 100 unique robot IDs"
+)
+
+
+def segment_context(segment):
+    context = {}
+    manage_robot_tasks(segment, {}, context=context)
+    return context
+
+
+class TestMergeContexts:
+    @staticmethod
+    def test_offsetting_and_combining_records():
+        left = segment_context([101, 202, 101])
+        right = segment_context(["_", 202, 303])
+        assert merge_contexts(left, right) == {
+            "max_assignments": {},
+            "robot_records": {
+                101: (2, 0, 2),
+                202: (2, 1, 4),
+                303: (1, 5, 5),
+            },
+            "total_assignment_count": 6,
+        }
+
+    @staticmethod
+    def test_associativity():
+        """Any grouping of consecutive segments gives the records of a serial replay."""
+        rng = random.Random(0)
+        segments = [
+            [rng.choice([101, 202, 303, "_"]) for _ in range(rng.randint(0, 9))]
+            for _ in range(4)
+        ]
+        a, b, c, d = map(segment_context, segments)
+        expected = segment_context(sum(segments, []))
+        assert merge_contexts(merge_contexts(a, b), merge_contexts(c, d)) == (
+            expected
+        )
+        assert merge_contexts(a, merge_contexts(b, merge_contexts(c, d))) == (
+            expected
+        )
+
+
+class TestParallelReplay:
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(6))
+    @pytest.mark.parametrize("segment_count", [1, 3, 7])
+    def test_matching_a_serial_replay(seed, segment_count):
+        """Results and contexts are identical to a serial call, including near the unique robot ID limit with invalid entries."""
+        rng = random.Random(seed)
+        population = list(range(rng.choice([10, 97, 98]))) + ["_", -1]
+        assignments = [rng.choice(population) for _ in range(400)]
+        max_assignments = {rid: rng.randint(1, 9) for rid in range(105)}
+        context = (
+            {}
+            if seed % 2
+            else {
+                "max_assignments": {200: 1},
+                "robot_records": {1: (2, 0, 1)},
+                "total_assignment_count": 3,
+            }
+        )
+        expected_context = dict(context)
+        expected_result = manage_robot_tasks(
+            assignments, max_assignments, 5, context=expected_context
+        )
+        assert (
+            parallel_replay(
+                assignments,
+                max_assignments,
+                5,
+                context=context,
+                processes=1,
+                segment_count=segment_count,
+            )
+            == expected_result
+        )
+        assert context == expected_context
+
+    @staticmethod
+    def test_using_processes():
+        assignments = [101, 202, 303, 202, 404, 101, 202] * 10
+        max_assignments = {101: 30, 202: 40, 303: 10, 404: 11, 505: 1}
+        assert parallel_replay(
+            assignments, max_assignments, 2, processes=2
+        ) == manage_robot_tasks(assignments, max_assignments, 2)
+
+    @staticmethod
+    def test_empty_assignments():
+        assert parallel_replay([], {101: 1}, processes=1) == [101]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "assignments", [list(range(100)), list(range(60)) + ["_"] * 5 + list(range(40, 100))]
+    )
+    def test_raising_an_error_for_a_100_or_more_unique_robot_ids(assignments):
+        with pytest.raises(ValueError) as err:
+            parallel_replay(assignments, {}, processes=1, segment_count=3)
+        assert str(err.value) == MAX_UNIQUE_ROBOT_ID_MESSAGE
@@ -0,0 +1,134 @@
+# pylint: skip-file
+
+"""Contains tests for the partitioned dispatch classes"""
+
+import pytest
+from manage_robot_tasks import manage_robot_tasks
+from partitioned_dispatch import (
+    HashRing,
+    InProcessTransport,
+    PartitionedDispatcher,
+    SocketTransport,
+    WorkerNode,
+)
+
+TEAMS = [f"team-{i}" for i in range(20)]
+
+
+def make_transport(transport_type, node_ids):
+    transport = transport_type()
+    nodes = {}
+    for node_id in node_ids:
+        nodes[node_id] = WorkerNode()
+        transport.add_node(node_id, nodes[node_id])
+    return transport, nodes
+
+
+@pytest.fixture(params=[InProcessTransport, SocketTransport])
+def transport_type(request):
+    return request.param
+
+
+class TestHashRing:
+    @staticmethod
+    def test_minimal_movement():
+        """Adding a node only moves teams to the new node."""
+        ring = HashRing(["a", "b", "c"])
+        before = {team: ring.node_for(team) for team in TEAMS}
+        ring.add("d")
+        for team in TEAMS:
+            assert ring.node_for(team) in (before[team], "d")
+        ring.remove("d")
+        assert {team: ring.node_for(team) for team in TEAMS} == before
+
+    @staticmethod
+    def test_errors():
+        ring = HashRing()
+        with pytest.raises(LookupError):
+            ring.node_for("team")
+        ring.add("a")
+        with pytest.raises(ValueError):
+            ring.add("a")
+        with pytest.raises(ValueError):
+            ring.remove("b")
+
+
+class TestPartitionedDispatcher:
+    @staticmethod
+    def test_matching_manage_robot_tasks_per_team(transport_type):
+        transport, nodes = make_transport(transport_type, ["a", "b", "c"])
+        dispatcher = PartitionedDispatcher(transport, ["a", "b", "c"])
+        contexts = {team: {} for team in TEAMS}
+        for i, team in enumerate(TEAMS * 2):
+            assignments = [101 + i % 3, "_", 202]
+            max_assignments = {101: 3, 102: 2, 103: 1, 202: 5, "x": 1}
+            assert dispatcher.manage(
+                team, assignments, max_assignments, cooldown=1
+            ) == manage_robot_tasks(
+                assignments, max_assignments, 1, context=contexts[team]
+            )
+            assert dispatcher.available(team, 0) == manage_robot_tasks(
+                [], {}, 0, context=dict(contexts[team])
+            )
+        assert all(node.managers for node in nodes.values())
+        if transport_type is SocketTransport:
+            transport.close()
+
+    @staticmethod
+    def test_propagating_errors(transport_type):
+        transport, _ = make_transport(transport_type, ["a"])
+        dispatcher = PartitionedDispatcher(transport, ["a"])
+        with pytest.raises(ValueError):
+            dispatcher.manage("team", list(range(100)))
+        if transport_type is SocketTransport:
+            transport.close()
+
+    @staticmethod
+    def test_surviving_bad_requests():
+        """A request that raises does not stop the node from serving the next ones."""
+        transport, _ = make_transport(SocketTransport, ["a"])
+        dispatcher = PartitionedDispatcher(transport, ["a"])
+        dispatcher.manage("x", [101], {101: 2}, 0)
+        with pytest.raises(TypeError):
+            dispatcher.manage("x", [[1]])
+        for message in [{"op": "unknown"}, {"team": "x"}, ["op"]]:
+            assert "error" in transport.request("a", message)
+        assert dispatcher.available("x", 0) == [101]
+        transport.close()
+
+    @staticmethod
+    def test_global_available(transport_type):
+        """Results of all nodes are ordered by first_assignment_index, with never-assigned robots last."""
+        transport, _ = make_transport(transport_type, ["a", "b"])
+        dispatcher = PartitionedDispatcher(transport, ["a", "b"])
+        dispatcher.manage("x", ["_", 101, 102], {101: 2, 102: 2, 103: 1}, 0)
+        dispatcher.manage("y", [201, "_", "_", 202], {201: 2, 202: 2}, 0)
+        assert dispatcher.global_available(cooldown=0) == [
+            ("y", 201),
+            ("x", 101),
+            ("x", 102),
+            ("y", 202),
+            ("x", 103),
+        ]
+        if transport_type is SocketTransport:
+            transport.close()
+
+    @staticmethod
+    def test_rebalancing(transport_type):
+        """Teams are migrated with their state when nodes are added or removed."""
+        transport, nodes = make_transport(transport_type, ["a", "b", "c"])
+        dispatcher = PartitionedDispatcher(transport, ["a", "b"])
+        for team in TEAMS:
+            dispatcher.manage(team, [101, 202], {101: 2, 202: 1, 303: 1}, 1)
+        expected = {team: dispatcher.available(team, 0) for team in TEAMS}
+
+        dispatcher.add_node("c")
+        assert nodes["c"].managers
+        for team in TEAMS:
+            assert team in nodes[dispatcher.ring.node_for(team)].managers
+        dispatcher.remove_node("a")
+        assert not nodes["a"].managers
+        assert sum(len(node.managers) for node in nodes.values()) == len(TEAMS)
+        assert {team: dispatcher.available(team, 0) for team in TEAMS} == expected
+        if transport_type is SocketTransport:
+            transport.close()
@@ -0,0 +1,21 @@
+# pylint: skip-file
+
+"""Contains tests for the ColdRecordStore class"""
+
+from manage_robot_tasks import RobotRecord
+from record_retention import ColdRecordStore
+
+
+class TestColdRecordStore:
+    @staticmethod
+    def test_storing_and_popping_records():
+        store = ColdRecordStore()
+        for robot_id in range(5):
+            store[robot_id] = RobotRecord(robot_id + 1, robot_id, 2 * robot_id)
+        store[2] = RobotRecord(9, 2, 20)
+        assert store.pop(1) == (2, 1, 2)
+        assert store.pop(1) is None
+        assert store.pop(4) == (5, 4, 8)
+        assert dict(store) == {0: (1, 0, 0), 2: (9, 2, 20), 3: (4, 3, 6)}
+        assert isinstance(store[3], RobotRecord)
+        assert 1 not in store and len(store) == 3
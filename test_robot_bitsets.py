@@ -0,0 +1,60 @@
+# pylint: skip-file
+
+"""Contains tests for the robot bitsets"""
+
+import random
+import pytest
+from robot_bitsets import RobotInterner, TeamBitsets
+from robot_task_manager import RobotTaskManager
+
+
+class TestRobotInterner:
+    @staticmethod
+    def test_round_trip():
+        """Tests that masks decode to their robots, in slot order."""
+        interner = RobotInterner()
+        mask = interner.mask([505, 101, 10**12])
+        assert interner.robot_ids(mask) == [505, 101, 10**12]
+        assert interner.slot(101) == 1
+        assert interner.robot_id(2) == 10**12
+        assert len(interner) == 3
+        assert interner.robot_ids(0) == []
+
+
+class TestTeamBitsets:
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matching_the_manager(seed):
+        """Tests that the available mask matches manager.available."""
+        rng = random.Random(seed)
+        manager = RobotTaskManager(cooldown=2)
+        bitsets = TeamBitsets(manager)
+        for _ in range(100):
+            assignments = [
+                rng.choice([*range(1, 12), "_"]) for _ in range(rng.randint(0, 3))
+            ]
+            limits = (
+                {rng.randint(1, 14): rng.choice([0, 1, 2, 4])}
+                if rng.random() < 0.3
+                else {}
+            )
+            manager.manage(assignments, limits)
+            assert sorted(bitsets.available_robot_ids()) == sorted(
+                manager.available()
+            )
+            assert bitsets.available & ~bitsets.known == 0
+
+    @staticmethod
+    def test_set_operations_across_teams():
+        """Tests that teams sharing an interner combine with bitwise operations."""
+        interner = RobotInterner()
+        welding = RobotTaskManager({1: 2, 2: 2, 3: 2}, cooldown=1)
+        painting = RobotTaskManager({2: 2, 3: 2, 4: 2}, cooldown=1)
+        welding_bitsets = TeamBitsets(welding, interner)
+        painting_bitsets = TeamBitsets(painting, interner)
+        welding.manage([2])
+        painting.manage([4])
+        both = welding_bitsets.available & painting_bitsets.available
+        either = welding_bitsets.available | painting_bitsets.available
+        assert interner.robot_ids(both) == [3]
+        assert sorted(interner.robot_ids(either)) == [1, 2, 3]
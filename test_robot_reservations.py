@@ -0,0 +1,103 @@
+# pylint: skip-file
+
+"""Contains tests for the robot reservations"""
+
+import threading
+import pytest
+from ordering_policies import LeastRecentlyUsedPolicy
+from robot_reservations import RobotReservations
+from robot_task_manager import RobotTaskManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRobotReservations:
+    @staticmethod
+    def test_reserved_robots_are_hidden():
+        """Tests that a reserved robot is not handed out twice."""
+        manager = RobotTaskManager({1: 2, 2: 2}, cooldown=1)
+        reservations = RobotReservations(manager)
+        first = reservations.reserve()
+        second = reservations.reserve()
+        assert (first.robot_id, second.robot_id) == (1, 2)
+        assert reservations.reserve() is None
+        assert reservations.available() == []
+        assert manager.available() == [1, 2]
+
+    @staticmethod
+    def test_commit_and_abort():
+        """Tests that only committed leases are recorded."""
+        manager = RobotTaskManager({1: 2, 2: 2}, cooldown=1)
+        reservations = RobotReservations(manager)
+        first = reservations.reserve()
+        second = reservations.reserve()
+        assert reservations.commit(first)
+        reservations.abort(second)
+        assert not reservations.commit(second)
+        assert not reservations.commit(first)
+        assert manager.total_assignment_count == 1
+        assert reservations.available() == [2]
+
+    @staticmethod
+    def test_expired_leases_are_reclaimed():
+        """Tests that expired leases free their robots and cannot be committed."""
+        clock = FakeClock()
+        manager = RobotTaskManager({1: 2}, cooldown=1)
+        reservations = RobotReservations(manager, lease_seconds=1.0, clock=clock)
+        lease = reservations.reserve()
+        assert reservations.reserved_robot_ids == {1}
+        clock.now = 1.0
+        assert reservations.reserved_robot_ids == set()
+        assert not reservations.commit(lease)
+        assert reservations.reserve().robot_id == 1
+
+    @staticmethod
+    def test_lease_of_removed_robot():
+        """Tests that a lease is reclaimed when its robot loses its limit."""
+        manager = RobotTaskManager({1: 2}, cooldown=1)
+        reservations = RobotReservations(manager)
+        lease = reservations.reserve()
+        manager.manage([], {1: 0})
+        assert not reservations.commit(lease)
+
+    @staticmethod
+    def test_policy():
+        """Tests that the policy picks the reserved robot."""
+        manager = RobotTaskManager({1: 5, 2: 5, 3: 5}, cooldown=0)
+        reservations = RobotReservations(manager, policy=LeastRecentlyUsedPolicy())
+        manager.manage([1, 2, 3, 1])
+        assert reservations.reserve().robot_id == 2
+
+    @staticmethod
+    def test_concurrent_dispatchers():
+        """Tests that concurrent dispatchers never exceed the limits."""
+        manager = RobotTaskManager({robot_id: 3 for robot_id in range(1, 9)}, cooldown=0)
+        reservations = RobotReservations(manager)
+        committed = []
+
+        def dispatch():
+            while True:
+                lease = reservations.reserve()
+                if lease is None:
+                    return
+                if reservations.commit(lease):
+                    committed.append(lease.robot_id)
+
+        threads = [threading.Thread(target=dispatch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(committed) == sorted(list(range(1, 9)) * 3)
+
+    @staticmethod
+    def test_invalid_lease_seconds():
+        """Tests that the lease duration must be positive."""
+        with pytest.raises(ValueError):
+            RobotReservations(RobotTaskManager(), lease_seconds=0)
@@ -0,0 +1,81 @@
+# pylint: skip-file
+
+"""Contains tests for the robot state events"""
+
+import queue
+import random
+import pytest
+from robot_state_events import RobotState, StateTransition, StateWatcher
+from robot_task_manager import RobotTaskManager
+
+
+class TestStateWatcher:
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matching_the_available_robots(seed):
+        """Tests that the AVAILABLE state matches manager.available after
+        every change, and that transitions are consistent."""
+        rng = random.Random(seed)
+        manager = RobotTaskManager(cooldown=2)
+        states = {}
+
+        def on_transition(transition):
+            assert transition.previous is states.get(
+                transition.robot_id, RobotState.UNKNOWN
+            )
+            assert transition.current is not transition.previous
+            states[transition.robot_id] = transition.current
+
+        watcher = StateWatcher(manager, on_transition)
+        for _ in range(100):
+            assignments = [
+                rng.choice([*range(1, 12), "_"]) for _ in range(rng.randint(0, 3))
+            ]
+            limits = (
+                {rng.randint(1, 14): rng.choice([0, 1, 2, 4])}
+                if rng.random() < 0.3
+                else {}
+            )
+            manager.manage(assignments, limits)
+            if rng.random() < 0.2 and assignments:
+                try:
+                    manager.retract(assignments[-1])
+                except ValueError:
+                    pass
+            available = set(manager.available())
+            for robot_id in range(1, 15):
+                state = states.get(robot_id, RobotState.UNKNOWN)
+                assert state is watcher.state(robot_id)
+                assert (state is RobotState.AVAILABLE) == (robot_id in available)
+
+    @staticmethod
+    def test_lifecycle():
+        """Tests the transitions of a robot through every state."""
+        manager = RobotTaskManager({1: 2}, cooldown=1)
+        transitions = queue.SimpleQueue()
+        StateWatcher(manager, transitions.put)
+        manager.manage([1])
+        manager.manage([None])
+        manager.manage([1])
+        manager.manage([None, None])
+        result = []
+        while not transitions.empty():
+            result.append(transitions.get())
+        assert result == [
+            StateTransition(1, RobotState.UNKNOWN, RobotState.AVAILABLE, 0),
+            StateTransition(1, RobotState.AVAILABLE, RobotState.COOLING, 1),
+            StateTransition(1, RobotState.COOLING, RobotState.AVAILABLE, 2),
+            StateTransition(1, RobotState.AVAILABLE, RobotState.EXHAUSTED, 3),
+        ]
+
+    @staticmethod
+    def test_idle_team():
+        """Tests that calls without changes fire no transitions."""
+        manager = RobotTaskManager({1: 5, 2: 5}, cooldown=1)
+        transitions = []
+        StateWatcher(manager, transitions.append)
+        manager.manage([1, 2])
+        transitions.clear()
+        manager.manage([])
+        manager.available()
+        assert transitions == []
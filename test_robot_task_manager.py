@@ -0,0 +1,262 @@
+# pylint: skip-file
+
+"""Contains tests for the RobotTaskManager class"""
+
+import random
+import pytest
+from manage_robot_tasks import manage_robot_tasks
+from record_retention import RetentionPolicy
+from robot_task_manager import RobotTaskManager
+
+MAX_UNIQUE_ROBOT_ID_MESSAGE = (
+    "The (assignments) list must have less than a 100 unique robot IDs"
+)
+
+
+def random_calls(seed, count=60):
+    rng = random.Random(seed)
+    population = list(range(90)) + ["_", -1, 1.5]
+    for _ in range(count):
+        yield (
+            [rng.choice(population) for _ in range(rng.randint(0, 8))],
+            {
+                rng.randrange(110): rng.randint(-1, 5)
+                for _ in range(rng.randint(0, 4))
+            },
+            rng.choice([None, -1, 0, 1, 2, 3, 5]),
+        )
+
+
+class TestManage:
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matching_manage_robot_tasks_with_a_context(seed):
+        """Every call returns the same result and leaves the same context as manage_robot_tasks."""
+        context = {}
+        manager = RobotTaskManager()
+        for assignments, max_assignments, cooldown in random_calls(seed):
+            expected_result = manage_robot_tasks(
+                assignments,
+                max_assignments,
+                cooldown=cooldown,
+                context=context,
+            )
+            assert (
+                manager.manage(assignments, max_assignments, cooldown)
+                == expected_result
+            )
+            assert manager.context == context
+
+    @staticmethod
+    def test_starting_from_a_context():
+        context = {
+            "max_assignments": {101: 2, 202: 2, 303: 1},
+            "robot_records": {101: (1, 0, 0)},
+            "total_assignment_count": 1,
+        }
+        manager = RobotTaskManager({404: 1}, cooldown=1, context=context)
+        assert manager.manage([202, 101]) == manage_robot_tasks(
+            [202, 101], {404: 1}, cooldown=1, context=context
+        )
+        assert manager.context == context
+
+    @staticmethod
+    def test_available_does_not_change_the_state():
+        manager = RobotTaskManager({101: 1, 202: 2}, cooldown=0)
+        manager.manage([101, 202])
+        version, context = manager.version, manager.context
+        assert manager.available() == [202]
+        assert manager.available(cooldown=1) == []
+        assert (manager.version, manager.context) == (version, context)
+
+    @staticmethod
+    def test_raising_an_error_for_a_100_or_more_unique_robot_ids():
+        manager = RobotTaskManager()
+        manager.manage(list(range(99)))
+        with pytest.raises(ValueError) as err:
+            manager.manage([99])
+        assert str(err.value) == MAX_UNIQUE_ROBOT_ID_MESSAGE
+        assert manager.total_assignment_count == 99
+
+    @staticmethod
+    def test_versions():
+        """The state version changes with assignments and the limits version with limits."""
+        manager = RobotTaskManager()
+        manager.manage([])
+        assert (manager.version, manager.limits_version) == (0, 0)
+        manager.manage([101], {101: 2})
+        assert (manager.version, manager.limits_version) == (1, 1)
+
+
+class TestRetract:
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matching_a_log_where_the_assignment_is_invalid(seed):
+        """Retracting an assignment leaves the same records and availability as if it had been an invalid entry."""
+        rng = random.Random(seed)
+        assignments = [rng.choice([101, 202, 303, 404]) for _ in range(30)]
+        max_assignments = {101: 12, 202: 5, 303: 8, 404: 3, 505: 1}
+        manager = RobotTaskManager(max_assignments, cooldown=2)
+        manager.manage(assignments)
+        for _ in range(10):
+            index = rng.choice(
+                [i for i, rid in enumerate(assignments) if rid is not None]
+            )
+            assert manager.retract(assignments[index], index) == index
+            assignments[index] = None
+            context = {}
+            expected_result = manage_robot_tasks(
+                assignments, max_assignments, 2, context=context
+            )
+            assert manager.available() == expected_result
+            assert (
+                manager.context["robot_records"] == context["robot_records"]
+            )
+            assert manager.total_assignment_count == len(assignments)
+
+    @staticmethod
+    def test_retracting_the_most_recent_assignment():
+        manager = RobotTaskManager({101: 2, 202: 1}, cooldown=0)
+        manager.manage([101, 202, 101])
+        assert manager.available() == []
+        assert manager.retract(101) == 2
+        assert manager.context["robot_records"][101] == (1, 0, 0)
+        assert manager.retract(202) == 1
+        assert 202 not in manager.context["robot_records"]
+        assert manager.available() == [101, 202]
+        assert manager.total_assignment_count == 3
+
+    @staticmethod
+    def test_restoring_the_limit_of_an_exhausted_robot():
+        """An exhausted robot is dropped from max_assignments, and a retraction brings it back."""
+        manager = RobotTaskManager({101: 2}, cooldown=0)
+        manager.manage([101, 101])
+        assert manager.context["max_assignments"] == {}
+        manager.retract(101)
+        assert manager.context["max_assignments"] == {101: 2}
+        assert manager.manage([]) == [101]
+
+    @staticmethod
+    def test_history_limit():
+        """Only the most recent (history_limit) assignments of a robot can be retracted."""
+        manager = RobotTaskManager({101: 10}, history_limit=2)
+        manager.manage([101, 101, 101, 101])
+        with pytest.raises(ValueError):
+            manager.retract(101, 1)
+        assert manager.retract(101) == 3
+        with pytest.raises(ValueError):
+            manager.retract(101)
+        assert manager.context["robot_records"][101] == (3, 0, 2)
+
+    @staticmethod
+    @pytest.mark.parametrize("history_limit", [0, -1, 1.5])
+    def test_raising_an_error_for_an_invalid_history_limit(history_limit):
+        with pytest.raises(ValueError):
+            RobotTaskManager(history_limit=history_limit)
+
+    @staticmethod
+    @pytest.mark.parametrize("robot_id, index", [(101, 0), (202, None)])
+    def test_raising_an_error_for_unknown_assignments(robot_id, index):
+        manager = RobotTaskManager(
+            context={"robot_records": {202: (1, 0, 0)}}
+        )
+        manager.manage([101])
+        with pytest.raises(ValueError):
+            manager.retract(robot_id, index)
+
+
+class TestRetention:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "retention",
+        [
+            RetentionPolicy(),
+            RetentionPolicy(idle_threshold=0),
+            RetentionPolicy(evict_exhausted=False, idle_threshold=4),
+        ],
+    )
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matching_manage_robot_tasks_with_a_context(retention, seed):
+        """Moving records to the cold tier never changes results or contexts."""
+        context = {}
+        manager = RobotTaskManager(retention=retention)
+        for assignments, max_assignments, cooldown in random_calls(seed):
+            expected_result = manage_robot_tasks(
+                assignments,
+                max_assignments,
+                cooldown=cooldown,
+                context=context,
+            )
+            assert (
+                manager.manage(assignments, max_assignments, cooldown)
+                == expected_result
+            )
+            assert manager.context == context
+            assert manager.available(0) == manage_robot_tasks(
+                [], {}, 0, context=dict(context)
+            )
+
+    @staticmethod
+    def test_evicting_exhausted_robots():
+        manager = RobotTaskManager(
+            {101: 1, 202: 2}, cooldown=0, retention=RetentionPolicy()
+        )
+        manager.manage([101, 202, 303])
+        assert manager.cold_robot_ids == {101, 303}
+        assert manager.record(101) == (1, 0, 0)
+        assert manager.available() == [202]
+
+    @staticmethod
+    def test_rehydrating_when_a_limit_is_raised():
+        manager = RobotTaskManager(
+            {101: 1}, cooldown=0, retention=RetentionPolicy()
+        )
+        manager.manage([101])
+        assert manager.cold_robot_ids == {101}
+        assert manager.manage([], {101: 2}) == [101]
+        assert manager.cold_robot_ids == set()
+
+    @staticmethod
+    def test_evicting_idle_robots():
+        """Idle robots are kept available from the cold tier, and move back when assigned."""
+        manager = RobotTaskManager(
+            {101: 5, 202: 5},
+            cooldown=0,
+            retention=RetentionPolicy(idle_threshold=2),
+        )
+        manager.manage([101, 202, "_", "_"])
+        assert manager.cold_robot_ids == {101, 202}
+        assert manager.available() == [101, 202]
+        manager.manage([202])
+        assert manager.cold_robot_ids == {101}
+        assert manager.context["robot_records"] == {
+            101: (1, 0, 0),
+            202: (2, 1, 4),
+        }
+
+    @staticmethod
+    def test_retracting_a_cold_assignment():
+        manager = RobotTaskManager(
+            {101: 1}, cooldown=0, retention=RetentionPolicy()
+        )
+        manager.manage([101, 101])
+        manager.retract(101)
+        assert manager.cold_robot_ids == {101}
+        manager.retract(101)
+        assert manager.cold_robot_ids == set()
+        assert manager.available() == [101]
+
+    @staticmethod
+    def test_counting_cold_robots_as_unique_robot_ids():
+        manager = RobotTaskManager(retention=RetentionPolicy())
+        manager.manage(list(range(99)))
+        assert len(manager.cold_robot_ids) == 99
+        with pytest.raises(ValueError):
+            manager.manage([99])
+        manager.manage([5])
+
+    @staticmethod
+    @pytest.mark.parametrize("idle_threshold", [-1, 2.5, "4"])
+    def test_raising_an_error_for_an_invalid_idle_threshold(idle_threshold):
+        with pytest.raises(ValueError):
+            RobotTaskManager(retention=RetentionPolicy(idle_threshold=idle_threshold))
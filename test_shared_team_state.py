@@ -0,0 +1,102 @@
+# pylint: skip-file
+
+"""Contains tests for the shared memory team state"""
+
+import multiprocessing
+import random
+import pytest
+from robot_task_manager import RobotTaskManager
+from shared_team_state import SharedTeamReader, SharedTeamWriter
+
+
+def read_available(name, cooldown, queue):
+    with SharedTeamReader(name) as reader:
+        queue.put(reader.available(cooldown))
+
+
+class TestSharedTeamState:
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matching_the_manager(seed):
+        """Tests that readers compute the same availability as the manager."""
+        rng = random.Random(seed)
+        with SharedTeamWriter(RobotTaskManager(cooldown=2)) as writer:
+            with SharedTeamReader(writer.name) as reader:
+                for _ in range(60):
+                    assignments = [
+                        rng.choice([*range(1, 15), "_", -1])
+                        for _ in range(rng.randint(0, 4))
+                    ]
+                    limits = (
+                        {rng.randint(1, 18): rng.choice([0, 1, 3, -1])}
+                        if rng.random() < 0.4
+                        else {}
+                    )
+                    writer.manage(assignments, limits)
+                    cooldown = rng.choice([None, 1, 4])
+                    assert reader.available(cooldown) == (
+                        writer.manager.available(cooldown)
+                    )
+
+    @staticmethod
+    def test_reading_from_another_process():
+        """Tests that a reader in another process sees the published state."""
+        manager = RobotTaskManager({1: 2, 2: 2, 3: 1}, cooldown=1)
+        with SharedTeamWriter(manager) as writer:
+            writer.manage([2, 1, 3])
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(
+                target=read_available, args=(writer.name, None, queue)
+            )
+            process.start()
+            result = queue.get(timeout=30)
+            process.join()
+        assert result == [2, 1] == manager.available()
+
+    @staticmethod
+    def test_version_and_retract():
+        """Tests that every change is published."""
+        with SharedTeamWriter(RobotTaskManager({1: 1}, cooldown=1)) as writer:
+            with SharedTeamReader(writer.name) as reader:
+                assert reader.version == 1
+                assert reader.available() == [1]
+                writer.manage([1])
+                assert reader.available() == []
+                writer.retract(1)
+                assert reader.available() == [1]
+                assert reader.version == 3
+
+    @staticmethod
+    def test_too_many_limits():
+        """Tests that a state that does not fit the layout is rejected."""
+        with pytest.raises(ValueError):
+            SharedTeamWriter(RobotTaskManager({1: 1, 2: 1}), max_limits=1)
+
+    @staticmethod
+    def test_rejecting_changes_that_cannot_be_published():
+        """Tests that a rejected change leaves the manager unchanged, so the writer recovers."""
+        with SharedTeamWriter(
+            RobotTaskManager({1: 10}, cooldown=0), max_limits=2
+        ) as writer:
+            with SharedTeamReader(writer.name) as reader:
+                writer.manage([1])
+                for assignments, limits in [
+                    ([], {2**63: 1}),
+                    ([2**63], {}),
+                    ([], {2: 2**63}),
+                    ([], {2: 1, 3: 1}),
+                ]:
+                    with pytest.raises(ValueError):
+                        writer.manage(assignments, limits)
+                    assert writer.manager.total_assignment_count == 1
+                    assert writer.manager.available() == [1]
+                for _ in range(3):
+                    writer.manage([1])
+                    assert reader.available() == writer.manager.available()
+                assert reader.version == 5
+                # Robot 3 is exhausted right away, so it does not count
+                writer.manage([3, 1], {2: 1, 3: 1})
+                assert reader.available() == writer.manager.available() == [1, 2]
+                with pytest.raises(ValueError):
+                    writer.retract(3)
+                assert reader.available() == writer.manager.available()
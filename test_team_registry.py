@@ -0,0 +1,76 @@
+# pylint: skip-file
+
+"""Contains tests for the team registry"""
+
+import random
+import pytest
+from manage_robot_tasks import manage_robot_tasks
+from team_registry import TeamRegistry
+
+
+class TestTeamRegistry:
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matching_manage_robot_tasks(seed, tmp_path):
+        """Tests that spilling and loading teams does not change any result."""
+        rng = random.Random(seed)
+        registry = TeamRegistry(tmp_path, max_resident=3)
+        contexts = {}
+        for _ in range(200):
+            team = rng.choice(["a", "b", "c", "d", "e/f", "g h"])
+            assignments = [rng.randint(1, 10) for _ in range(rng.randint(0, 3))]
+            limits = {rng.randint(1, 12): rng.randint(0, 4)} if rng.random() < 0.3 else {}
+            cooldown = rng.choice([1, 2, 3])
+            expected = manage_robot_tasks(
+                assignments, limits, cooldown, context=contexts.setdefault(team, {})
+            )
+            assert registry.manage(team, assignments, limits, cooldown) == expected
+            assert len(registry.resident_teams) <= 3
+        assert sorted(registry) == sorted(contexts)
+
+    @staticmethod
+    def test_stats(tmp_path):
+        """Tests the hit, miss, eviction and load counters."""
+        registry = TeamRegistry(tmp_path, max_resident=1)
+        registry.manage("a", [1], {1: 2})
+        registry.manage("a", [1])
+        registry.manage("b", [2], {2: 1})
+        assert "a" in registry and "a" not in registry.resident_teams
+        assert registry.manage("a", [None, None, None]) == []
+        stats = registry.stats
+        assert stats[:4] == (1, 3, 2, 1)
+        assert stats.load_seconds > 0
+
+    @staticmethod
+    def test_spill_all(tmp_path):
+        """Tests that teams survive in snapshots across registries."""
+        registry = TeamRegistry(tmp_path)
+        registry.manage("a", [1, 2], {1: 3, 2: 3})
+        registry.spill_all()
+        assert registry.resident_teams == []
+        other = TeamRegistry(tmp_path)
+        assert other.manager("a").context == {
+            "max_assignments": {1: 3, 2: 3},
+            "robot_records": {1: (1, 0, 0), 2: (1, 1, 1)},
+            "total_assignment_count": 2,
+        }
+
+    @staticmethod
+    def test_keeping_the_snapshot_when_the_factory_fails(tmp_path):
+        """Tests that a team is not lost if its manager cannot be created."""
+        registry = TeamRegistry(tmp_path)
+        registry.manage("a", [1], {1: 2})
+        registry.spill_all()
+        failing = TeamRegistry(tmp_path, manager_factory=lambda context: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            failing.manager("a")
+        assert registry.snapshot_size("a") > 0
+        assert registry.manager("a").context["robot_records"] == {1: (1, 0, 0)}
+        assert registry.snapshot_size("a") == 0
+        assert [path.name for path in tmp_path.iterdir()] == []
+
+    @staticmethod
+    def test_invalid_max_resident(tmp_path):
+        """Tests that (max_resident) must be positive."""
+        with pytest.raises(ValueError):
+            TeamRegistry(tmp_path, max_resident=0)
@@ -0,0 +1,67 @@
+# pylint: skip-file
+
+"""Contains tests for the what-if evaluation"""
+
+import copy
+import random
+import pytest
+from manage_robot_tasks import manage_robot_tasks
+from what_if import what_if_available
+
+
+COOLDOWNS = [0, 1, 2, 3, 5, None, "3", -1]
+
+
+class TestWhatIfAvailable:
+    @staticmethod
+    @pytest.mark.parametrize("seed", range(10))
+    def test_matching_manage_robot_tasks(seed):
+        """Tests every combination against manage_robot_tasks."""
+        rng = random.Random(seed)
+        context = {}
+        for _ in range(rng.randint(0, 5)):
+            manage_robot_tasks(
+                [rng.randint(1, 12) for _ in range(rng.randint(0, 6))],
+                {rng.randint(1, 12): rng.randint(0, 4)},
+                context=context,
+            )
+        assignments = [
+            rng.choice([*range(1, 12), "_", 1.5]) for _ in range(rng.randint(0, 8))
+        ]
+        max_assignments = {rng.randint(1, 14): rng.choice([0, 1, 3, -1])}
+        limit_sets = [
+            {rng.randint(1, 14): rng.randint(0, 4) for _ in range(3)}
+            for _ in range(3)
+        ]
+        saved_context = copy.deepcopy(context)
+        results = what_if_available(
+            assignments,
+            max_assignments,
+            COOLDOWNS,
+            limit_sets=limit_sets,
+            context=context,
+        )
+        assert context == saved_context
+        for limit_set, row in zip(limit_sets, results):
+            for cooldown, result in zip(COOLDOWNS, row):
+                assert result == manage_robot_tasks(
+                    assignments,
+                    max_assignments | limit_set,
+                    cooldown,
+                    context=copy.deepcopy(saved_context),
+                )
+
+    @staticmethod
+    def test_without_context_and_limit_sets():
+        """Tests the default single limit set."""
+        assignments = [1, 3, 1, 2, 4]
+        max_assignments = {1: 3, 2: 1, 3: 2, 4: 2, 5: 1}
+        assert what_if_available(assignments, max_assignments, [1, 2, 4]) == [
+            [manage_robot_tasks(assignments, max_assignments, cooldown) for cooldown in [1, 2, 4]]
+        ]
+
+    @staticmethod
+    def test_too_many_robots():
+        """Tests that the unique robot ID limit is enforced."""
+        with pytest.raises(ValueError):
+            what_if_available(list(range(100)), {}, [1])
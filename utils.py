@@ -1,6 +1,6 @@
 """Helper utilities"""
 
-from typing import Callable, Iterable, TypeVar
+from typing import Callable, Container, Iterable, TypeVar
 
 _T = TypeVar("_T")
 _U = TypeVar("_U")
@@ -25,7 +25,7 @@ def is_positive_int(value, nonzero=False) -> bool:
 def count_unique_elements(
     elements: Iterable,
     limit: float = float("inf"),
-    excluded: set | None = None,
+    excluded: Container | None = None,
 ) -> int:
     """Counts the number of unique elements in (elements).
 
@@ -33,7 +33,7 @@ def count_unique_elements(
         elements (Iterable): The iterable to be counted.
         limit (float, optional):
             If specified, counting stops at this number (inclusive). Defaults to float("inf").
-        excluded (set | None, optional):
+        excluded (Container | None, optional):
             If provided, elements found here are not counted. Defaults to None.
 
     Returns:
@@ -0,0 +1,108 @@
+"""What-if evaluation of manage_robot_tasks over many cooldowns and limit sets."""
+
+from typing import Sequence
+
+from manage_robot_tasks import (
+    DEFAULT_COOLDOWN,
+    MAX_UNIQUE_ROBOT_ID_COUNT,
+    Context,
+    count_unique_robot_ids,
+    manage_robot_tasks,
+)
+from utils import is_positive_int
+
+
+def what_if_available(  # pylint: disable=R0914
+    assignments: Sequence,
+    max_assignments: dict,
+    cooldowns: Sequence,
+    *,
+    limit_sets: Sequence[dict] | None = None,
+    context: Context | None = None,
+) -> list[list[list[int]]]:
+    """Computes the result of manage_robot_tasks for every combination of a
+    cooldown and a limit set, without changing (context).
+
+    The assignments are recorded once, and the candidate robots of each limit
+    set are found and sorted once, since only the min_cooldown_index
+    threshold depends on the cooldown.
+
+    Args:
+        assignments (Sequence): A list of robot IDs representing new tasks.
+        max_assignments (dict): Maximum allowable assignments per robot.
+        cooldowns (Sequence): The cooldowns to evaluate.
+        limit_sets (Sequence[dict] | None, optional):
+            Alternative limits, each one merged over (max_assignments).
+            Defaults to None, which means (max_assignments) alone.
+        context (Context | None, optional): The context to start from. Defaults to None.
+
+    Raises:
+        ValueError: If the number of unique robot IDs reaches MAX_UNIQUE_ROBOT_ID_COUNT.
+
+    Returns:
+        list[list[list[int]]]:
+            The available robots for limit_sets[i] and cooldowns[j], at [i][j].
+            It is the same as manage_robot_tasks(assignments,
+            max_assignments | limit_sets[i], cooldowns[j], context=a copy of context).
+    """
+    unique_robot_id_count = count_unique_robot_ids(assignments, context)
+
+    # Record the assignments once, on a copy of the context without limits.
+    # manage_robot_tasks replaces the items of its context, so a shallow
+    # copy leaves (context) unchanged.
+    recorded_context: Context = {}
+    if context and "robot_records" in context:
+        recorded_context["robot_records"] = context["robot_records"]
+    if context and "total_assignment_count" in context:
+        recorded_context["total_assignment_count"] = context[
+            "total_assignment_count"
+        ]
+    manage_robot_tasks(assignments, {}, context=recorded_context)
+    robot_records = recorded_context["robot_records"]
+    total_assignment_count = recorded_context["total_assignment_count"]
+
+    if context and "max_assignments" in context:
+        max_assignments = context["max_assignments"] | max_assignments
+    can_assign_extra_robots = (
+        unique_robot_id_count < MAX_UNIQUE_ROBOT_ID_COUNT - 1
+    )
+    min_cooldown_indices = [
+        total_assignment_count
+        - (cooldown if is_positive_int(cooldown) else DEFAULT_COOLDOWN)
+        for cooldown in cooldowns
+    ]
+
+    results: list[list[list[int]]] = []
+    for limit_set in [{}] if limit_sets is None else limit_sets:
+        # (first_assignment_index, last_assignment_index, robot_id)
+        candidates: list[tuple[int, int, int]] = []
+        extra_robot_ids: list[int] = []
+        for robot_id, limit in (max_assignments | limit_set).items():
+            if is_positive_int(robot_id) and is_positive_int(
+                limit, nonzero=True
+            ):
+                robot_record = robot_records.get(robot_id)
+                if robot_record is not None:
+                    if robot_record.assignment_count < limit:
+                        candidates.append(
+                            (
+                                robot_record.first_assignment_index,
+                                robot_record.last_assignment_index,
+                                robot_id,
+                            )
+                        )
+                elif can_assign_extra_robots:
+                    extra_robot_ids.append(robot_id)
+        candidates.sort()
+        results.append(
+            [
+                [
+                    robot_id
+                    for _, last_assignment_index, robot_id in candidates
+                    if last_assignment_index < min_cooldown_index
+                ]
+                + extra_robot_ids
+                for min_cooldown_index in min_cooldown_indices
+            ]
+        )
+    return results